@@ -2,14 +2,71 @@ from http import HTTPStatus
 
 from flask import Flask, Response, make_response, request
 
-from app.api.application.forward_request import route_and_forward
-from app.api.application.jwt import get_nhs_number_from_jwt_token
+from app.api.application.error_log import log_error
+from app.api.application.forward_request import (
+    bulkhead_stats,
+    circuit_breaker_stats,
+    idempotency_stats,
+    negative_cache_stats,
+    retry_stats,
+    route_and_forward,
+    routing_stats,
+    session_cache_stats,
+)
+from app.api.application.jwt import (
+    get_nhs_number_from_jwt_token,
+    jwks_stats,
+    jwt_cache_stats,
+)
+from app.api.application.slow_request_log import log_slow_request
+from app.api.domain.deadline import Deadline
 from app.api.domain.exception import ApiError, InternalServerError
 from app.api.domain.forward_request_model import ForwardRequest
+from app.api.domain.stage_timings import StageTimings
+from app.api.infrastructure.logs.pipeline import log_pipeline_stats
+from app.api.infrastructure.metrics.prometheus import record_request, render_metrics
+from app.api.infrastructure.metrics.server_timing import server_timing_headers
+from app.api.infrastructure.tracing.tracer import (
+    correlation_headers,
+    server_span,
+    set_status_code,
+    tracing_stats,
+)
+from app.api.infrastructure.transport.pool import pool_stats
 
 app = Flask(__name__)
 
 
+@app.route("/_status", methods=["GET"])
+@app.route("/_ping", methods=["GET"])
+@app.route("/health", methods=["GET"])
+def health() -> dict:
+    """Health check endpoint."""
+    return {
+        "status": "online",
+        "message": "IM1 PFS Auth API is running",
+        "pools": pool_stats(),
+        "routing": routing_stats(),
+        "circuitBreakers": circuit_breaker_stats(),
+        "bulkheads": bulkhead_stats(),
+        "retries": retry_stats(),
+        "jwtCache": jwt_cache_stats(),
+        "jwks": jwks_stats(),
+        "sessionCache": session_cache_stats(),
+        "negativeCache": negative_cache_stats(),
+        "idempotency": idempotency_stats(),
+        "logs": log_pipeline_stats(),
+        "tracing": tracing_stats(),
+    }
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    content, content_type = render_metrics()
+    return Response(content, HTTPStatus.OK, content_type=content_type)
+
+
 @app.route("/authenticate", methods=["POST"])
 def authenticate() -> Response:
     """Application API for POST /authenticate.
@@ -17,24 +74,63 @@ def authenticate() -> Response:
     Returns:
         Response: Response for POST /authenticate
     """
-    try:
-        (patient_nhs_number, proxy_nhs_number) = get_nhs_number_from_jwt_token(
-            request.headers.get("NHSE-ID-Token")
-        )
-        forward_request = ForwardRequest(
-            application_id=request.headers.get("NHSE-Application-ID"),
-            forward_to=request.headers.get("NHSE-Forward-To"),
-            patient_nhs_number=patient_nhs_number,
-            patient_ods_code=request.headers.get("NHSE-ODS-Code"),
-            proxy_nhs_number=proxy_nhs_number,
-            use_mock=request.headers.get("NHSE-Use-Mock") == "True",
-        )
-        response = route_and_forward(forward_request)
-        return make_response(
-            response.model_dump_json(by_alias=True),
-            HTTPStatus.CREATED,
-        )
-    except Exception as e:
-        app.logger.exception("Error in POST /authenticate")
-        error = e if isinstance(e, ApiError) else InternalServerError()
-        return make_response(error.body, error.status_code)
+    timings = StageTimings()
+    request_id = request.headers.get("NHSE-Request-ID")
+    correlation_id = request.headers.get("NHSE-Correlation-ID")
+    mirrored_headers = correlation_headers(request_id, correlation_id)
+    with server_span(
+        "POST /authenticate",
+        request.headers,
+        {"nhse.request_id": request_id, "nhse.correlation_id": correlation_id},
+    ) as span:
+        try:
+            deadline = Deadline.from_header(request.headers.get("NHSE-Request-Timeout"))
+            with timings.stage("jwt_decode"):
+                (patient_nhs_number, proxy_nhs_number) = get_nhs_number_from_jwt_token(
+                    request.headers.get("NHSE-ID-Token")
+                )
+            with timings.stage("validation"):
+                forward_request = ForwardRequest(
+                    application_id=request.headers.get("NHSE-Application-ID"),
+                    forward_to=request.headers.get("NHSE-Forward-To"),
+                    patient_nhs_number=patient_nhs_number,
+                    patient_ods_code=request.headers.get("NHSE-ODS-Code"),
+                    proxy_nhs_number=proxy_nhs_number,
+                    use_mock=request.headers.get("NHSE-Use-Mock") == "True",
+                    request_id=request_id,
+                    correlation_id=correlation_id,
+                    deadline=deadline,
+                    timings=timings,
+                )
+            response = route_and_forward(forward_request)
+            with timings.stage("serialise"):
+                content = response.to_json()
+        except Exception as e:  # noqa: BLE001 - logged by log_error
+            log_error(app.logger, "POST /authenticate", e)
+            error = e if isinstance(e, ApiError) else InternalServerError()
+            record_request(timings, error.status_code)
+            log_slow_request(
+                app.logger, "POST /authenticate", timings, error.status_code
+            )
+            set_status_code(span, error.status_code)
+            return Response(
+                error.content,
+                error.status_code,
+                {
+                    **error.content_headers,
+                    **error.headers,
+                    **mirrored_headers,
+                    **server_timing_headers(timings),
+                },
+            )
+        else:
+            record_request(timings, HTTPStatus.CREATED)
+            log_slow_request(
+                app.logger, "POST /authenticate", timings, HTTPStatus.CREATED
+            )
+            set_status_code(span, HTTPStatus.CREATED)
+            return make_response(
+                content,
+                HTTPStatus.CREATED,
+                {**mirrored_headers, **server_timing_headers(timings)},
+            )
@@ -0,0 +1,190 @@
+from asyncio import AbstractEventLoop, Future, get_running_loop, shield, wait_for
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from os import environ
+from threading import Condition, Lock
+
+from app.api.domain.exception import ServiceUnavailableError
+
+RETRY_AFTER_SECONDS = 1
+
+
+def _setting(supplier: str, name: str, default: str) -> str:
+    """Fetch a bulkhead setting for a supplier, falling back to the shared setting.
+
+    Args:
+        supplier (str): Supplier name
+        name (str): Setting name
+        default (str): Value used when neither setting is configured
+
+    Returns:
+        str: Setting value
+    """
+    return environ.get(
+        f"BULKHEAD_{supplier}_{name}", environ.get(f"BULKHEAD_{name}", default)
+    )
+
+
+class Bulkhead:
+    """Caps the number of concurrent requests to a supplier.
+
+    Up to `max_concurrent` requests run at once. Further requests wait in a queue
+    of at most `max_queue` for up to `queue_timeout` seconds, and are rejected with
+    a ServiceUnavailableError when the queue is full or the wait times out, so a
+    slow supplier cannot take every worker thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+    ) -> None:
+        """Initialises an empty bulkhead."""
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._lock = Lock()
+        self._slot_released = Condition(self._lock)
+        self._async_waiters: deque[tuple[AbstractEventLoop, Future]] = deque()
+
+    @classmethod
+    def for_supplier(cls, supplier: str) -> "Bulkhead":
+        """Creates a bulkhead configured from the environment.
+
+        BULKHEAD_<SUPPLIER>_<SETTING> takes precedence over BULKHEAD_<SETTING>.
+
+        Args:
+            supplier (str): Supplier name
+
+        Returns:
+            Bulkhead: Bulkhead for the supplier
+        """
+        return cls(
+            supplier,
+            max_concurrent=int(_setting(supplier, "MAX_CONCURRENT", "10")),
+            max_queue=int(_setting(supplier, "MAX_QUEUE", "10")),
+            queue_timeout=float(_setting(supplier, "QUEUE_TIMEOUT", "1")),
+        )
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Context manager holding one of the supplier's concurrent slots.
+
+        Raises:
+            ServiceUnavailableError: If no slot became free in time
+        """
+        self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """Async context manager holding one of the supplier's concurrent slots.
+
+        Raises:
+            ServiceUnavailableError: If no slot became free in time
+        """
+        await self._acquire_async()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        """Current limits and usage of the bulkhead.
+
+        Returns:
+            dict: Bulkhead statistics
+        """
+        with self._lock:
+            return {
+                "supplier": self.name,
+                "maxConcurrent": self.max_concurrent,
+                "maxQueue": self.max_queue,
+                "active": self.active,
+                "waiting": self.waiting,
+                "rejected": self.rejected,
+            }
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return
+            self._join_queue()
+            try:
+                acquired = self._slot_released.wait_for(
+                    lambda: self.active < self.max_concurrent, self.queue_timeout
+                )
+            finally:
+                self.waiting -= 1
+            if not acquired:
+                self._reject()
+            self.active += 1
+
+    async def _acquire_async(self) -> None:
+        loop = get_running_loop()
+        with self._lock:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return
+            self._join_queue()
+            waiter = loop.create_future()
+            self._async_waiters.append((loop, waiter))
+        try:
+            await wait_for(shield(waiter), self.queue_timeout)
+        except BaseException as exc:
+            timed_out = isinstance(exc, TimeoutError)
+            with self._lock:
+                # A slot handed over as the wait ended must still be given back
+                handed_over = (loop, waiter) not in self._async_waiters
+                if not handed_over:
+                    self._async_waiters.remove((loop, waiter))
+                if timed_out:
+                    self.rejected += 1
+            if handed_over:
+                self._release()
+            if timed_out:
+                raise self._rejection() from exc
+            raise
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def _release(self) -> None:
+        with self._lock:
+            if self._async_waiters:
+                # Hand the slot straight to the longest waiting coroutine
+                loop, waiter = self._async_waiters.popleft()
+                loop.call_soon_threadsafe(_wake, waiter)
+                return
+            self.active -= 1
+            self._slot_released.notify()
+
+    def _join_queue(self) -> None:
+        if self.waiting >= self.max_queue:
+            self._reject()
+        self.waiting += 1
+
+    def _reject(self) -> None:
+        # Called holding the lock, as are all updates to the counts
+        self.rejected += 1
+        raise self._rejection()
+
+    def _rejection(self) -> ServiceUnavailableError:
+        msg = f"Too many concurrent requests to {self.name}"
+        return ServiceUnavailableError(msg, retry_after=RETRY_AFTER_SECONDS)
+
+
+def _wake(waiter: Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,370 @@
+import asyncio
+import json
+import zlib
+from collections.abc import Awaitable, Callable
+from hashlib import sha256
+from logging import getLogger
+from os import environ
+from time import monotonic, sleep
+
+from app.api.domain.cache_backend import CacheBackend
+
+CACHE_KEY_PREFIX = environ.get("CACHE_KEY_PREFIX", "im1-pfs-auth")
+CACHE_LOCK_TIMEOUT = float(environ.get("CACHE_LOCK_TIMEOUT", "5"))
+CACHE_LOCK_POLL_INTERVAL = float(environ.get("CACHE_LOCK_POLL_INTERVAL", "0.02"))
+CACHE_COMPRESS_THRESHOLD = int(environ.get("CACHE_COMPRESS_THRESHOLD", "1024"))
+# Bumped whenever the encoding of entries changes, so nodes running different
+# releases against the same backend never read each other's entries
+KEY_VERSION = "1"
+
+logger = getLogger(__name__)
+
+
+def encode(value: str | list | dict) -> bytes:
+    """Serialise a value compactly, compressing large values.
+
+    Strings are stored as UTF-8 and anything else as compact JSON, each behind a
+    tag byte, and values of at least CACHE_COMPRESS_THRESHOLD bytes are
+    compressed behind a further tag byte.
+
+    Args:
+        value (str | list | dict): Value to store
+
+    Returns:
+        bytes: Serialised value
+    """
+    if isinstance(value, str):
+        data = b"s" + value.encode()
+    else:
+        data = b"j" + json.dumps(value, separators=(",", ":")).encode()
+    if len(data) >= CACHE_COMPRESS_THRESHOLD:
+        return b"z" + zlib.compress(data)
+    return data
+
+
+def decode(data: bytes) -> str | list | dict:
+    """Deserialise a value serialised by `encode`.
+
+    Args:
+        data (bytes): Serialised value
+
+    Returns:
+        str | list | dict: Value stored
+    """
+    if data[:1] == b"z":
+        data = zlib.decompress(data[1:])
+    if data[:1] == b"s":
+        return data[1:].decode()
+    return json.loads(data[1:])
+
+
+class Cache:
+    """Cache of values under a namespace, kept in a pluggable backend.
+
+    Keys are `<prefix>:<version>:<namespace>:<SHA-256 digest of the identity>`, so
+    caches sharing a backend never collide and identities are never stored in
+    the clear. A backend that cannot be reached, or an entry that cannot be
+    decoded, is treated as a miss, so the cache only ever costs time and never
+    fails a request. Entries that cannot be decoded are removed.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend) -> None:
+        """Initialises the cache."""
+        self.namespace = namespace
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def key(self, *identity: str) -> str:
+        """Digest an identity into a cache key.
+
+        Args:
+            *identity (str): Values identifying the entry, such as NHS numbers
+
+        Returns:
+            str: Cache key
+        """
+        digest = sha256("\0".join(identity).encode()).hexdigest()
+        return f"{CACHE_KEY_PREFIX}:{KEY_VERSION}:{self.namespace}:{digest}"
+
+    def get(self, key: str) -> str | list | dict | None:
+        """Fetch a value, if it has not expired.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str | list | dict | None: Value, or None on a miss
+        """
+        data = self._backend_call(self.backend.get, key)
+        value = self._decoded(data)
+        if value is None and data is not None:
+            self._backend_call(self.backend.delete, key)
+        return self._counted(value)
+
+    async def get_async(self, key: str) -> str | list | dict | None:
+        """Fetch a value, if it has not expired, without blocking the event loop.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str | list | dict | None: Value, or None on a miss
+        """
+        data = await self._backend_call_async(self.backend.get, key)
+        value = self._decoded(data)
+        if value is None and data is not None:
+            await self._backend_call_async(self.backend.delete, key)
+        return self._counted(value)
+
+    def set(self, key: str, value: str | list | dict, ttl: float) -> None:
+        """Store a value for `ttl` seconds.
+
+        Args:
+            key (str): Cache key
+            value (str | list | dict): Value
+            ttl (float): Seconds the value is kept for
+        """
+        if ttl > 0:
+            self._backend_call(self.backend.set, key, encode(value), ttl)
+
+    async def set_async(self, key: str, value: str | list | dict, ttl: float) -> None:
+        """Store a value for `ttl` seconds without blocking the event loop.
+
+        Args:
+            key (str): Cache key
+            value (str | list | dict): Value
+            ttl (float): Seconds the value is kept for
+        """
+        if ttl > 0:
+            await self._backend_call_async(self.backend.set, key, encode(value), ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a value.
+
+        Args:
+            key (str): Cache key
+        """
+        self._backend_call(self.backend.delete, key)
+
+    def get_or_set(
+        self,
+        key: str,
+        ttl: float,
+        compute: Callable[[], str | list | dict],
+        wait: float = CACHE_LOCK_TIMEOUT,
+        lock_ttl: float = CACHE_LOCK_TIMEOUT,
+    ) -> tuple[str | list | dict, bool]:
+        """Fetch a value, computing and storing it on a miss.
+
+        Only one caller at a time computes a missing value, whichever process or
+        node it is in. The others wait up to `wait` seconds for it to be stored
+        rather than all computing it at once, and compute it themselves if it
+        never is. The lock is held for at most `lock_ttl` seconds, so a caller
+        that dies while computing the value cannot hold the others up for longer,
+        and should cover the time computing the value can take.
+
+        Args:
+            key (str): Cache key
+            ttl (float): Seconds a computed value is kept for
+            compute (Callable[[], str | list | dict]): Computes the value
+            wait (float): Seconds to wait for another caller computing the value
+            lock_ttl (float): Seconds the lock on computing the value is held for
+
+        Returns:
+            tuple[str | list | dict, bool]: Value and whether it was cached
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        lock = f"{key}:lock"
+        waited_until = monotonic() + wait
+        while (
+            not (acquired := self._acquire(lock, lock_ttl))
+            and monotonic() < waited_until
+        ):
+            sleep(CACHE_LOCK_POLL_INTERVAL)
+            value = self._peek(key)
+            if value is not None:
+                self.coalesced += 1
+                return value, True
+        try:
+            value = compute()
+            self.set(key, value, ttl)
+        finally:
+            if acquired:
+                self.delete(lock)
+        return value, False
+
+    async def get_or_set_async(
+        self,
+        key: str,
+        ttl: float,
+        compute: Callable[[], Awaitable[str | list | dict]],
+        wait: float = CACHE_LOCK_TIMEOUT,
+        lock_ttl: float = CACHE_LOCK_TIMEOUT,
+    ) -> tuple[str | list | dict, bool]:
+        """Fetch a value, computing and storing it on a miss, without blocking.
+
+        Calls to a blocking backend are made in a thread, so a slow backend does
+        not hold up the other requests on the event loop.
+
+        Args:
+            key (str): Cache key
+            ttl (float): Seconds a computed value is kept for
+            compute (Callable[[], Awaitable[str | list | dict]]): Computes the value
+            wait (float): Seconds to wait for another caller computing the value
+            lock_ttl (float): Seconds the lock on computing the value is held for
+
+        Returns:
+            tuple[str | list | dict, bool]: Value and whether it was cached
+        """
+        value = await self.get_async(key)
+        if value is not None:
+            return value, True
+        lock = f"{key}:lock"
+        waited_until = monotonic() + wait
+        while (
+            not (acquired := await self._acquire_async(lock, lock_ttl))
+            and monotonic() < waited_until
+        ):
+            await asyncio.sleep(CACHE_LOCK_POLL_INTERVAL)
+            value = await self._peek_async(key)
+            if value is not None:
+                self.coalesced += 1
+                return value, True
+        try:
+            value = await compute()
+            await self.set_async(key, value, ttl)
+        finally:
+            if acquired:
+                await self._backend_call_async(self.backend.delete, lock)
+        return value, False
+
+    def _acquire(self, lock: str, ttl: float) -> bool:
+        """Take the lock on computing a value.
+
+        Args:
+            lock (str): Key of the lock
+            ttl (float): Seconds the lock is held for at most
+
+        Returns:
+            bool: Whether the lock was taken, or the backend could not be reached
+        """
+        acquired = self._backend_call(self.backend.add, lock, b"1", ttl)
+        return acquired is not False
+
+    async def _acquire_async(self, lock: str, ttl: float) -> bool:
+        """Take the lock on computing a value without blocking the event loop.
+
+        Args:
+            lock (str): Key of the lock
+            ttl (float): Seconds the lock is held for at most
+
+        Returns:
+            bool: Whether the lock was taken, or the backend could not be reached
+        """
+        acquired = await self._backend_call_async(self.backend.add, lock, b"1", ttl)
+        return acquired is not False
+
+    def _peek(self, key: str) -> str | list | dict | None:
+        """Fetch a value without counting a miss.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str | list | dict | None: Value, or None if it is not stored yet
+        """
+        return self._decoded(self._backend_call(self.backend.get, key))
+
+    async def _peek_async(self, key: str) -> str | list | dict | None:
+        """Fetch a value without counting a miss or blocking the event loop.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str | list | dict | None: Value, or None if it is not stored yet
+        """
+        return self._decoded(await self._backend_call_async(self.backend.get, key))
+
+    def _decoded(self, data: bytes | None) -> str | list | dict | None:
+        """Deserialise an entry, treating one that cannot be decoded as a miss.
+
+        Args:
+            data (bytes | None): Entry fetched from the backend, None on a miss
+
+        Returns:
+            str | list | dict | None: Value, or None on a miss or a corrupt entry
+        """
+        if data is None:
+            return None
+        try:
+            return decode(data)
+        except (zlib.error, UnicodeDecodeError, ValueError):
+            self.errors += 1
+            logger.warning("Cache entry could not be decoded", exc_info=True)
+            return None
+
+    def _counted(self, value: str | list | dict | None) -> str | list | dict | None:
+        """Count a lookup as a hit or a miss.
+
+        Args:
+            value (str | list | dict | None): Value found, None on a miss
+
+        Returns:
+            str | list | dict | None: Value, or None on a miss
+        """
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _backend_call(self, method: Callable, *args: object) -> object:
+        """Call the backend, treating a backend that cannot be reached as a miss.
+
+        Args:
+            method (Callable): Backend method
+            *args (object): Arguments to the method
+
+        Returns:
+            object: Return value of the method, or None if the backend failed
+        """
+        try:
+            return method(*args)
+        except OSError:
+            self.errors += 1
+            logger.debug("Cache backend call failed", exc_info=True)
+            return None
+
+    async def _backend_call_async(self, method: Callable, *args: object) -> object:
+        """Call the backend, in a thread if the call may block the event loop.
+
+        Args:
+            method (Callable): Backend method
+            *args (object): Arguments to the method
+
+        Returns:
+            object: Return value of the method, or None if the backend failed
+        """
+        if not self.backend.blocking:
+            return self._backend_call(method, *args)
+        return await asyncio.to_thread(self._backend_call, method, *args)
+
+    def stats(self) -> dict:
+        """Statistics about the cache and its backend.
+
+        Returns:
+            dict: Backend statistics and hit, miss, coalesced and error counts
+        """
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
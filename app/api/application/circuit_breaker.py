@@ -0,0 +1,203 @@
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum
+from math import ceil
+from os import environ
+from threading import Lock
+from time import monotonic
+
+from app.api.domain.exception import (
+    ApiError,
+    DownstreamError,
+    GatewayTimeoutError,
+    ServiceUnavailableError,
+)
+
+WINDOW_SECONDS = float(environ.get("CIRCUIT_BREAKER_WINDOW_SECONDS", "30"))
+MIN_REQUESTS = int(environ.get("CIRCUIT_BREAKER_MIN_REQUESTS", "10"))
+ERROR_RATE = float(environ.get("CIRCUIT_BREAKER_ERROR_RATE", "0.5"))
+OPEN_SECONDS = float(environ.get("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+HALF_OPEN_PROBES = int(environ.get("CIRCUIT_BREAKER_HALF_OPEN_PROBES", "1"))
+
+
+class CircuitState(Enum):
+    """Enum Class for Circuit Breaker State."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_supplier_failure(exc: Exception) -> bool:
+    """Whether an exception means the supplier is unhealthy.
+
+    Errors the supplier returns for the request itself, such as a user not being
+    found, show the supplier is healthy and are not counted as failures. A
+    supplier that did not answer within the request deadline is unhealthy.
+
+    Args:
+        exc (Exception): Exception raised while forwarding the request
+
+    Returns:
+        bool: True if the exception counts towards opening the circuit
+    """
+    return not isinstance(exc, ApiError) or isinstance(
+        exc, (DownstreamError, GatewayTimeoutError)
+    )
+
+
+class CircuitBreaker:
+    """Stops requests to a supplier while its error rate is too high.
+
+    The circuit opens when at least `min_requests` complete within the sliding
+    `window_seconds` and the proportion that failed reaches `error_rate`. While
+    open, requests fail fast with a ServiceUnavailableError. After `open_seconds`
+    the circuit is half open and lets `half_open_probes` requests through, closing
+    once they all succeed or opening again as soon as one fails.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        window_seconds: float = WINDOW_SECONDS,
+        min_requests: int = MIN_REQUESTS,
+        error_rate: float = ERROR_RATE,
+        open_seconds: float = OPEN_SECONDS,
+        half_open_probes: int = HALF_OPEN_PROBES,
+    ) -> None:
+        """Initialises a closed circuit breaker."""
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CircuitState.CLOSED
+        self.rejected = 0
+        self._lock = Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Context manager that records the outcome of a request to the supplier.
+
+        A request interrupted before it has an outcome, such as by the client
+        disconnecting, or whose deadline passed before the supplier was called,
+        records nothing and gives up its half open probe, so another request can
+        probe the supplier instead.
+
+        Raises:
+            ServiceUnavailableError: If the circuit is open
+        """
+        is_probe = self._acquire()
+        try:
+            yield
+        except GatewayTimeoutError as exc:
+            if exc.supplier_called:
+                self._record_failure(is_probe=is_probe)
+            else:
+                self._release_probe(is_probe=is_probe)
+            raise
+        except Exception as exc:
+            if is_supplier_failure(exc):
+                self._record_failure(is_probe=is_probe)
+            else:
+                self._record_success(is_probe=is_probe)
+            raise
+        except BaseException:
+            self._release_probe(is_probe=is_probe)
+            raise
+        self._record_success(is_probe=is_probe)
+
+    def stats(self) -> dict:
+        """Current state of the circuit breaker.
+
+        Returns:
+            dict: Circuit breaker statistics
+        """
+        with self._lock:
+            self._expire_outcomes(monotonic())
+            return {
+                "state": self.state.value,
+                "requests": len(self._outcomes),
+                "failures": self._failures,
+                "rejected": self.rejected,
+            }
+
+    def _acquire(self) -> bool:
+        """Checks whether a request may be sent to the supplier.
+
+        Returns:
+            bool: True if the request is a half open probe
+        """
+        with self._lock:
+            now = monotonic()
+            if self.state is CircuitState.OPEN:
+                if now - self._opened_at < self.open_seconds:
+                    self._reject(self._opened_at + self.open_seconds - now)
+                self.state = CircuitState.HALF_OPEN
+                self._probes_started = 0
+                self._probes_succeeded = 0
+            if self.state is CircuitState.HALF_OPEN:
+                if self._probes_started >= self.half_open_probes:
+                    self._reject(self.open_seconds)
+                self._probes_started += 1
+                return True
+            return False
+
+    def _reject(self, retry_after: float) -> None:
+        self.rejected += 1
+        msg = f"Circuit open for {self.name}"
+        raise ServiceUnavailableError(msg, retry_after=max(1, ceil(retry_after)))
+
+    def _release_probe(self, *, is_probe: bool) -> None:
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN and is_probe:
+                self._probes_started -= 1
+
+    def _record_success(self, *, is_probe: bool) -> None:
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN and is_probe:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._close()
+            elif self.state is CircuitState.CLOSED:
+                self._add_outcome(failed=False)
+
+    def _record_failure(self, *, is_probe: bool) -> None:
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN and is_probe:
+                self._open()
+            elif self.state is CircuitState.CLOSED:
+                self._add_outcome(failed=True)
+                requests = len(self._outcomes)
+                if (
+                    requests >= self.min_requests
+                    and self._failures / requests >= self.error_rate
+                ):
+                    self._open()
+
+    def _add_outcome(self, *, failed: bool) -> None:
+        now = monotonic()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        self._expire_outcomes(now)
+
+    def _expire_outcomes(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = monotonic()
+
+    def _close(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+from logging import ERROR, WARNING, Logger
+from os import environ
+from threading import Lock
+from time import monotonic
+
+from app.api.domain.exception import ApiError, InternalServerError
+
+ERROR_LOG_INTERVAL = float(environ.get("ERROR_LOG_INTERVAL", "60"))
+ERROR_LOG_BURST = int(environ.get("ERROR_LOG_BURST", "10"))
+
+
+class ErrorLogLimiter:
+    """Limits how often identical error events are logged.
+
+    Up to `burst` events with the same key are logged in each `interval` second
+    window, the rest are counted and reported with the first event logged in a
+    later window.
+    """
+
+    def __init__(self, burst: int, interval: float) -> None:
+        """Initialises the limiter with no events seen."""
+        self.burst = burst
+        self.interval = interval
+        self._lock = Lock()
+        self._windows: dict[tuple, list] = {}
+
+    def allow(self, key: tuple) -> int | None:
+        """Record an event, returning whether it should be logged.
+
+        Args:
+            key (tuple): Identifies identical events
+
+        Returns:
+            int | None: Number of identical events suppressed since the last one
+                logged, or None if this event should be suppressed
+        """
+        now = monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                return suppressed
+            if window[1] < self.burst:
+                window[1] += 1
+                suppressed, window[2] = window[2], 0
+                return suppressed
+            window[2] += 1
+            return None
+
+
+LIMITER = ErrorLogLimiter(ERROR_LOG_BURST, ERROR_LOG_INTERVAL)
+
+
+def log_error(logger: Logger, route: str, error: Exception) -> None:
+    """Log a failed request, rate-limiting identical events.
+
+    Expected client and supplier errors are logged as a single line with the
+    error type, status and cause. Only unexpected errors, which are answered
+    with an InternalServerError, are logged with their traceback.
+
+    Args:
+        logger (Logger): Logger to log the event to
+        route (str): Route of the failed request, such as "POST /authenticate"
+        error (Exception): Error the request failed with
+    """
+    expected = isinstance(error, ApiError) and not isinstance(
+        error, InternalServerError
+    )
+    status = error.status_code if expected else InternalServerError.status_code
+    suppressed = LIMITER.allow((route, type(error).__name__))
+    if suppressed is None:
+        return
+    cause = error.__cause__ or error.__context__
+    logger.log(
+        ERROR if status >= HTTPStatus.INTERNAL_SERVER_ERROR else WARNING,
+        "Error in %s error=%s status=%d cause=%s detail=%r suppressed=%d",
+        route,
+        type(error).__name__,
+        status,
+        type(cause).__name__ if cause is not None else None,
+        str(error),
+        suppressed,
+        exc_info=None if expected else error,
+        extra={
+            "event": "request_error",
+            "route": route,
+            "error": type(error).__name__,
+            "status": int(status),
+            "suppressed": suppressed,
+        },
+    )
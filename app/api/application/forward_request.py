@@ -1,33 +1,688 @@
+import asyncio
+import signal
+from logging import getLogger
 from os import environ
+from threading import Event, Thread
 
-from app.api.domain.exception import ApiError, DownstreamError, InvalidValueError
+from opentelemetry.trace import Span
+from pydantic import BaseModel
+
+from app.api.application.bulkhead import Bulkhead
+from app.api.application.cache import CACHE_LOCK_TIMEOUT
+from app.api.application.circuit_breaker import CircuitBreaker
+from app.api.application.idempotency import IdempotencyCache
+from app.api.application.negative_cache import NegativeCache
+from app.api.application.retry import RetryPolicy
+from app.api.application.routing import RoutingTable
+from app.api.application.session_cache import SessionCache
+from app.api.domain.base_client import BaseClient
+from app.api.domain.exception import (
+    ApiError,
+    DownstreamError,
+    ForbiddenError,
+    GatewayTimeoutError,
+    InvalidValueError,
+    NotFoundError,
+)
 from app.api.domain.forward_request_model import ForwardRequest
-from app.api.domain.forward_response_model import ForwardResponse
+from app.api.domain.forward_response_model import EncodedResponse, ForwardResponse
+from app.api.infrastructure.cache.backends import create_backend
 from app.api.infrastructure.emis.client import EmisClient
+from app.api.infrastructure.metrics.prometheus import record_cache_lookup
 from app.api.infrastructure.tpp.client import TPPClient
+from app.api.infrastructure.tracing.tracer import tracer
+from app.api.infrastructure.transport.pool import PREWARM_INTERVAL, prewarm
 
 EMIS_BASE_URL = environ.get("EMIS_BASE_URL")
 TPP_BASE_URL = environ.get("TPP_BASE_URL")
-CLIENT_MAP = {EMIS_BASE_URL: EmisClient, TPP_BASE_URL: TPPClient}
+ROUTING_TABLE_FILE = environ.get("ROUTING_TABLE_FILE")
+SESSION_CACHE_MAX_BYTES = int(environ.get("SESSION_CACHE_MAX_BYTES", str(8 << 20)))
+IDEMPOTENCY_TTL = float(environ.get("IDEMPOTENCY_TTL", "30"))
+IDEMPOTENCY_CACHE_MAX_BYTES = int(
+    environ.get("IDEMPOTENCY_CACHE_MAX_BYTES", str(8 << 20))
+)
+NEGATIVE_CACHE_SIZE = int(environ.get("NEGATIVE_CACHE_SIZE", "10000"))
+NEGATIVE_CACHE_NOT_FOUND_TTL = float(environ.get("NEGATIVE_CACHE_NOT_FOUND_TTL", "0"))
+NEGATIVE_CACHE_FORBIDDEN_TTL = float(environ.get("NEGATIVE_CACHE_FORBIDDEN_TTL", "0"))
+SUPPLIER_CLIENTS = {"EMIS": EmisClient, "TPP": TPPClient}
+CIRCUIT_BREAKERS: dict[str, CircuitBreaker] = {}
+# Keyed by supplier, as every base url of a supplier is served by one backend
+BULKHEADS: dict[str, Bulkhead] = {}
+RETRY_POLICIES: dict[str, RetryPolicy] = {}
+SESSION_CACHE = SessionCache.for_suppliers(
+    ("EMIS", "TPP"), create_backend(max_bytes=SESSION_CACHE_MAX_BYTES)
+)
+NEGATIVE_CACHE = NegativeCache(
+    {
+        NotFoundError: NEGATIVE_CACHE_NOT_FOUND_TTL,
+        ForbiddenError: NEGATIVE_CACHE_FORBIDDEN_TTL,
+    },
+    create_backend(max_entries=NEGATIVE_CACHE_SIZE),
+)
+IDEMPOTENCY_CACHE = IdempotencyCache(
+    IDEMPOTENCY_TTL,
+    (NotFoundError, ForbiddenError),
+    create_backend(max_bytes=IDEMPOTENCY_CACHE_MAX_BYTES),
+)
 
+logger = getLogger(__name__)
 
-def route_and_forward(forward_request: ForwardRequest) -> ForwardResponse:
-    """Responsible for routing incoming requests to the appropriate backend client.
+
+def _load_routing_table() -> RoutingTable:
+    """Loads the supplier base URLs from ROUTING_TABLE_FILE.
+
+    EMIS_BASE_URL and TPP_BASE_URL are used when no file is configured, other
+    than any that are not HTTPS, which no request could be forwarded to. Every
+    base URL is given a circuit breaker, bulkhead and retry policy before the
+    table is returned, and those of base URLs already routed to are kept, so
+    their state survives a reload. Bulkheads are per supplier rather than per
+    base URL, so a supplier's concurrency limit holds across all its base URLs.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the table is invalid or names an unknown supplier
+    Returns:
+        RoutingTable: Routing table
+    """
+    if ROUTING_TABLE_FILE:
+        routing_table = RoutingTable.from_file(ROUTING_TABLE_FILE)
+    else:
+        suppliers = {}
+        for supplier, base_url in (("EMIS", EMIS_BASE_URL), ("TPP", TPP_BASE_URL)):
+            if base_url and base_url.strip().lower().startswith("https://"):
+                suppliers[supplier] = [base_url]
+            elif base_url:
+                logger.warning("Not routing to %s base url %s", supplier, base_url)
+        routing_table = RoutingTable(suppliers, "environment")
+    unknown = sorted(set(routing_table.suppliers) - set(SUPPLIER_CLIENTS))
+    if unknown:
+        msg = f"Unknown suppliers in routing table: {', '.join(unknown)}"
+        raise ValueError(msg)
+    for route in routing_table.routes():
+        if route.supplier not in BULKHEADS:
+            BULKHEADS[route.supplier] = Bulkhead.for_supplier(route.supplier)
+        if route.base_url not in CIRCUIT_BREAKERS:
+            CIRCUIT_BREAKERS[route.base_url] = CircuitBreaker(route.base_url)
+            RETRY_POLICIES[route.base_url] = RetryPolicy(route.base_url)
+    return routing_table
+
+
+_routing_tables: list[RoutingTable] = [_load_routing_table()]
+_routing_reloads = {"reloads": 0, "failures": 0}
+
+
+def reload_routing_table() -> bool:
+    """Replaces the routing table with one loaded afresh.
+
+    The table is swapped in a single step, so each request is routed by either
+    the old table or the new one. A table that fails to load is logged and the
+    old table is kept.
+
+    Returns:
+        bool: Whether the table was replaced
+    """
+    try:
+        routing_table = _load_routing_table()
+    except (OSError, ValueError):
+        _routing_reloads["failures"] += 1
+        logger.exception("Failed to reload routing table, keeping the current one")
+        return False
+    _routing_tables[0] = routing_table
+    _routing_reloads["reloads"] += 1
+    logger.info("Reloaded routing table from %s", routing_table.source)
+    return True
+
+
+def install_routing_reload_handler() -> None:
+    """Reloads the routing table whenever the process receives SIGHUP.
+
+    The table is loaded on a background thread, so the signal handler returns
+    straight away.
+    """
+    signal.signal(
+        signal.SIGHUP,
+        lambda _signum, _frame: Thread(
+            target=reload_routing_table, name="reload-routing-table", daemon=True
+        ).start(),
+    )
+
+
+def routing_stats() -> dict:
+    """Supplier base URLs routed to and reloads of the routing table.
+
+    Returns:
+        dict: Routing table statistics
+    """
+    return {**_routing_tables[0].stats(), **_routing_reloads}
+
+
+def prewarm_suppliers() -> None:
+    """Opens warm connections to each supplier.
+
+    A supplier that cannot be reached is logged and skipped, its first requests
+    will open their own connections.
+    """
+    for base_url in _routing_tables[0].base_urls():
+        try:
+            connections = prewarm(base_url)
+        except Exception:
+            logger.exception("Failed to prewarm connections to %s", base_url)
+        else:
+            logger.info("Prewarmed %d connections to %s", connections, base_url)
+
+
+def keep_suppliers_warm(stop: Event | None = None) -> None:
+    """Prewarms connections to each supplier, then again every PREWARM_INTERVAL.
+
+    Connections idle for longer than the pool's idle timeout are evicted, so
+    without this a login arriving after a quiet period would open its own.
+
+    Args:
+        stop (Event | None): Stops prewarming once set
+    """
+    stop = stop or Event()
+    prewarm_suppliers()
+    while PREWARM_INTERVAL > 0 and not stop.wait(PREWARM_INTERVAL):
+        for base_url in _routing_tables[0].base_urls():
+            try:
+                prewarm(base_url)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to prewarm connections to %s: %s", base_url, exc)
+
+
+def circuit_breaker_stats() -> dict:
+    """Statistics for each supplier circuit breaker.
+
+    Returns:
+        dict: Circuit breaker statistics keyed by supplier base url
+    """
+    return {
+        base_url: circuit_breaker.stats()
+        for base_url, circuit_breaker in CIRCUIT_BREAKERS.items()
+    }
+
+
+def bulkhead_stats() -> dict:
+    """Concurrency limits and usage for each supplier bulkhead.
+
+    Returns:
+        dict: Bulkhead statistics keyed by supplier
+    """
+    return {supplier: bulkhead.stats() for supplier, bulkhead in BULKHEADS.items()}
+
+
+def retry_stats() -> dict:
+    """Retries made and the retry budget left for each supplier.
+
+    Returns:
+        dict: Retry statistics keyed by supplier base url
+    """
+    return {
+        base_url: retry_policy.stats()
+        for base_url, retry_policy in RETRY_POLICIES.items()
+    }
+
+
+def session_cache_stats() -> dict:
+    """Statistics about the cache of session responses.
+
+    Returns:
+        dict: Session cache statistics
+    """
+    return SESSION_CACHE.stats()
+
+
+def negative_cache_stats() -> dict:
+    """Statistics about the cache of logins suppliers turned away.
+
+    Returns:
+        dict: Negative cache statistics
+    """
+    return NEGATIVE_CACHE.stats()
+
+
+def idempotency_stats() -> dict:
+    """Statistics about the cache of request outcomes keyed by request ID.
+
+    Returns:
+        dict: Idempotency cache statistics
+    """
+    return IDEMPOTENCY_CACHE.stats()
+
+
+def _raise_negative_cached(
+    client: BaseClient, span: Span, error: ApiError | None
+) -> None:
+    """Answers a repeated login the supplier turned away from the negative cache.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        span (Span): Span for routing the login
+        error (ApiError | None): Error found in the negative cache, if any
+    Raises:
+        ApiError: If the supplier turned the login away moments ago
+    """
+    record_cache_lookup("negative", client.supplier, hit=error is not None)
+    if error is not None:
+        span.set_attribute("cache", "negative")
+        raise error
+
+
+def _session_cache_key(forward_request: ForwardRequest) -> str:
+    """Session cache key of a login.
+
+    Args:
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        str: Cache key
+    """
+    return SESSION_CACHE.key(
+        forward_request.patient_nhs_number,
+        forward_request.proxy_nhs_number,
+        forward_request.patient_ods_code,
+        forward_request.application_id,
+        forward_request.forward_to,
+    )
+
+
+def _idempotency_key(forward_request: ForwardRequest) -> str:
+    """Idempotency cache key of a request.
+
+    The login's identity is part of the key, so a request ID reused for another
+    login is never answered with the first login's session.
+
+    Args:
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        str: Cache key
+    """
+    return IDEMPOTENCY_CACHE.key(
+        forward_request.request_id,
+        forward_request.patient_nhs_number,
+        forward_request.proxy_nhs_number,
+        forward_request.patient_ods_code,
+        forward_request.application_id,
+        forward_request.forward_to,
+    )
+
+
+def _negative_cache_key(forward_request: ForwardRequest) -> str:
+    """Negative cache key of a login.
+
+    Args:
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        str: Cache key
+    """
+    return NEGATIVE_CACHE.key(
+        forward_request.patient_nhs_number,
+        forward_request.proxy_nhs_number,
+        forward_request.patient_ods_code,
+    )
+
+
+def _serialise(
+    forward_request: ForwardRequest, response: ForwardResponse | EncodedResponse
+) -> str:
+    """Serialises a login's response for the session cache.
 
     Args:
         forward_request: Class containing details of the forwarding request
+        response (ForwardResponse | EncodedResponse): Transformed response
     Returns:
-        ForwardResponse: Transformed response from client
+        str: Serialised response
     """
+    with forward_request.timings.stage("serialise"):
+        return response.to_json()
+
+
+def _coalesce_wait(forward_request: ForwardRequest) -> float:
+    """Seconds to wait for a concurrent identical login to be answered.
+
+    Args:
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        float: Seconds to wait, never beyond the request's deadline
+    """
+    return min(CACHE_LOCK_TIMEOUT, forward_request.deadline.remaining())
+
+
+def _record_cache_lookup(
+    cache: str, client: BaseClient, span: Span, *, hit: bool
+) -> None:
+    """Records whether a login was answered from a cache.
+
+    Args:
+        cache (str): Cache name
+        client (BaseClient): Client for the supplier
+        span (Span): Span for routing the login
+        hit (bool): Whether the response was cached
+    """
+    record_cache_lookup(cache, client.supplier, hit=hit)
+    if hit:
+        span.set_attribute("cache", cache)
+
+
+def _forward(client: BaseClient, forward_request: ForwardRequest) -> dict | BaseModel:
+    """Forwards the request via the supplier's bulkhead, circuit breaker and retries.
+
+    Requests rejected by the bulkhead never reach the circuit breaker, so a
+    saturated supplier is not mistaken for a failing one, and the circuit breaker
+    records a single outcome however many attempts were made.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        dict | BaseModel: Response body from forwarded request
+    """
+    base_url = forward_request.forward_to
+    with BULKHEADS[client.supplier].slot(), CIRCUIT_BREAKERS[base_url].guard():
+        return RETRY_POLICIES[base_url].call(
+            client.forward_request, forward_request.deadline
+        )
+
+
+async def _forward_async(
+    client: BaseClient, forward_request: ForwardRequest
+) -> dict | BaseModel:
+    """Asynchronously forwards the request without blocking the event loop.
+
+    Every attempt is cancelled once the request deadline passes, as httpx only
+    bounds each read of the response rather than the whole response.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        dict | BaseModel: Response body from forwarded request
+    """
+    base_url = forward_request.forward_to
+    async with BULKHEADS[client.supplier].async_slot():
+        with CIRCUIT_BREAKERS[base_url].guard():
+            async with asyncio.timeout(forward_request.deadline.remaining()):
+                return await RETRY_POLICIES[base_url].call_async(
+                    client.forward_request_async, forward_request.deadline
+                )
+
+
+def _forward_and_transform(
+    client: BaseClient, forward_request: ForwardRequest, span: Span
+) -> ForwardResponse | EncodedResponse:
+    """Forwards a login not answered from the session cache and transforms its response.
+
+    Not found and forbidden outcomes are remembered in the negative cache.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+        span (Span): Span for routing the login
+    Returns:
+        ForwardResponse | EncodedResponse: Transformed response from client
+    """
+    if NEGATIVE_CACHE.enabled:
+        _raise_negative_cached(
+            client,
+            span,
+            NEGATIVE_CACHE.get_error(_negative_cache_key(forward_request)),
+        )
     try:
-        client = CLIENT_MAP[forward_request.forward_to](forward_request)
-        response = client.forward_request()
+        response = _forward(client, forward_request)
+    except (NotFoundError, ForbiddenError) as error:
+        NEGATIVE_CACHE.put_error(_negative_cache_key(forward_request), error)
+        raise
+    with (
+        forward_request.timings.stage("transform"),
+        tracer.start_as_current_span("transform_response"),
+    ):
         return client.transform_response(response)
-    except KeyError as exc:
-        msg = "Invalid URL"
-        raise InvalidValueError(msg) from exc
-    except ApiError:
+
+
+async def _forward_and_transform_async(
+    client: BaseClient, forward_request: ForwardRequest, span: Span
+) -> ForwardResponse | EncodedResponse:
+    """Asynchronously forwards a login and transforms its response.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+        span (Span): Span for routing the login
+    Returns:
+        ForwardResponse | EncodedResponse: Transformed response from client
+    """
+    if NEGATIVE_CACHE.enabled:
+        _raise_negative_cached(
+            client,
+            span,
+            await NEGATIVE_CACHE.get_error_async(_negative_cache_key(forward_request)),
+        )
+    try:
+        response = await _forward_async(client, forward_request)
+    except (NotFoundError, ForbiddenError) as error:
+        await NEGATIVE_CACHE.put_error_async(
+            _negative_cache_key(forward_request), error
+        )
         raise
-    except Exception as exc:
-        msg = "Error occurred with downstream service"
-        raise DownstreamError(msg) from exc
+    with (
+        forward_request.timings.stage("transform"),
+        tracer.start_as_current_span("transform_response"),
+    ):
+        return await client.transform_response_async(response)
+
+
+def _answer(
+    client: BaseClient, forward_request: ForwardRequest, span: Span
+) -> ForwardResponse | EncodedResponse:
+    """Answers a login from the session cache or by forwarding it.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+        span (Span): Span for routing the login
+    Returns:
+        ForwardResponse | EncodedResponse: Transformed response
+    """
+    ttl = SESSION_CACHE.ttl(client.supplier)
+    if ttl <= 0:
+        return _forward_and_transform(client, forward_request, span)
+    body, hit = SESSION_CACHE.get_or_set(
+        _session_cache_key(forward_request),
+        ttl,
+        lambda: _serialise(
+            forward_request,
+            _forward_and_transform(client, forward_request, span),
+        ),
+        _coalesce_wait(forward_request),
+        forward_request.deadline.remaining(),
+    )
+    _record_cache_lookup("session", client, span, hit=hit)
+    return EncodedResponse(body=body)
+
+
+async def _answer_async(
+    client: BaseClient, forward_request: ForwardRequest, span: Span
+) -> ForwardResponse | EncodedResponse:
+    """Asynchronously answers a login from the session cache or by forwarding it.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+        span (Span): Span for routing the login
+    Returns:
+        ForwardResponse | EncodedResponse: Transformed response
+    """
+    ttl = SESSION_CACHE.ttl(client.supplier)
+    if ttl <= 0:
+        return await _forward_and_transform_async(client, forward_request, span)
+
+    async def compute() -> str:
+        return _serialise(
+            forward_request,
+            await _forward_and_transform_async(client, forward_request, span),
+        )
+
+    body, hit = await SESSION_CACHE.get_or_set_async(
+        _session_cache_key(forward_request),
+        ttl,
+        compute,
+        _coalesce_wait(forward_request),
+        forward_request.deadline.remaining(),
+    )
+    _record_cache_lookup("session", client, span, hit=hit)
+    return EncodedResponse(body=body)
+
+
+def _replay(
+    client: BaseClient, forward_request: ForwardRequest, span: Span
+) -> EncodedResponse:
+    """Answers a request with the outcome of the first attempt with its request ID.
+
+    A retry waits for the first attempt until its own deadline, and the first
+    attempt holds the lock until its deadline, so a slow supplier call is never
+    forwarded a second time while it is still in flight.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+        span (Span): Span for routing the login
+    Returns:
+        EncodedResponse: Response to the first attempt
+    """
+    attempts = []
+
+    def compute() -> str:
+        attempts.append(forward_request)
+        return _serialise(forward_request, _answer(client, forward_request, span))
+
+    try:
+        return EncodedResponse(
+            body=IDEMPOTENCY_CACHE.replay(
+                _idempotency_key(forward_request),
+                compute,
+                forward_request.deadline.remaining(),
+                forward_request.deadline.remaining(),
+            )
+        )
+    finally:
+        _record_cache_lookup("idempotency", client, span, hit=not attempts)
+
+
+async def _replay_async(
+    client: BaseClient, forward_request: ForwardRequest, span: Span
+) -> EncodedResponse:
+    """Asynchronously answers a request with the outcome of its first attempt.
+
+    Args:
+        client (BaseClient): Client for the supplier
+        forward_request: Class containing details of the forwarding request
+        span (Span): Span for routing the login
+    Returns:
+        EncodedResponse: Response to the first attempt
+    """
+    attempts = []
+
+    async def compute() -> str:
+        attempts.append(forward_request)
+        return _serialise(
+            forward_request, await _answer_async(client, forward_request, span)
+        )
+
+    try:
+        return EncodedResponse(
+            body=await IDEMPOTENCY_CACHE.replay_async(
+                _idempotency_key(forward_request),
+                compute,
+                forward_request.deadline.remaining(),
+                forward_request.deadline.remaining(),
+            )
+        )
+    finally:
+        _record_cache_lookup("idempotency", client, span, hit=not attempts)
+
+
+def route_and_forward(
+    forward_request: ForwardRequest,
+) -> ForwardResponse | EncodedResponse:
+    """Responsible for routing incoming requests to the appropriate backend client.
+
+    The forwarding URL is resolved to the supplier base URL it is equivalent to,
+    which the request is then sent to. Mocked requests never reach the supplier,
+    so the client's ready-made mocked response is returned directly. Repeats of
+    a login whose response, or whose not found or forbidden outcome, is cached
+    are answered from the cache, and concurrent repeats wait for the first to be
+    answered. Retries carrying the request ID of an earlier request are answered
+    with its outcome. A supplier still answering when the request deadline
+    passes is answered with a gateway timeout.
+
+    Args:
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        ForwardResponse | EncodedResponse: Transformed response from client
+    """
+    with tracer.start_as_current_span("route_and_forward") as span:
+        try:
+            route = _routing_tables[0].resolve(forward_request.forward_to)
+            forward_request.forward_to = route.base_url
+            client = SUPPLIER_CLIENTS[route.supplier](forward_request)
+            forward_request.timings.supplier = client.supplier
+            span.set_attribute("supplier", client.supplier)
+            if forward_request.use_mock:
+                return client.mock_response()
+            if IDEMPOTENCY_CACHE.enabled and forward_request.request_id:
+                return _replay(client, forward_request, span)
+            return _answer(client, forward_request, span)
+        except KeyError as exc:
+            msg = "Invalid URL"
+            raise InvalidValueError(msg) from exc
+        except ApiError:
+            raise
+        except TimeoutError as exc:
+            msg = "Request deadline exceeded waiting for downstream service"
+            raise GatewayTimeoutError(msg) from exc
+        except Exception as exc:
+            msg = "Error occurred with downstream service"
+            raise DownstreamError(msg) from exc
+
+
+async def route_and_forward_async(
+    forward_request: ForwardRequest,
+) -> ForwardResponse | EncodedResponse:
+    """Asynchronously routes incoming requests to the appropriate backend client.
+
+    The forwarding URL is resolved to the supplier base URL it is equivalent to,
+    which the request is then sent to. Mocked requests never reach the supplier,
+    so the client's ready-made mocked response is returned directly. Repeats of
+    a login whose response, or whose not found or forbidden outcome, is cached
+    are answered from the cache, and concurrent repeats wait for the first to be
+    answered. Retries carrying the request ID of an earlier request are answered
+    with its outcome. A supplier still answering when the request deadline
+    passes is answered with a gateway timeout.
+
+    Args:
+        forward_request: Class containing details of the forwarding request
+    Returns:
+        ForwardResponse | EncodedResponse: Transformed response from client
+    """
+    with tracer.start_as_current_span("route_and_forward") as span:
+        try:
+            route = _routing_tables[0].resolve(forward_request.forward_to)
+            forward_request.forward_to = route.base_url
+            client = SUPPLIER_CLIENTS[route.supplier](forward_request)
+            forward_request.timings.supplier = client.supplier
+            span.set_attribute("supplier", client.supplier)
+            if forward_request.use_mock:
+                return client.mock_response()
+            if IDEMPOTENCY_CACHE.enabled and forward_request.request_id:
+                return await _replay_async(client, forward_request, span)
+            return await _answer_async(client, forward_request, span)
+        except KeyError as exc:
+            msg = "Invalid URL"
+            raise InvalidValueError(msg) from exc
+        except ApiError:
+            raise
+        except TimeoutError as exc:
+            msg = "Request deadline exceeded waiting for downstream service"
+            raise GatewayTimeoutError(msg) from exc
+        except Exception as exc:
+            msg = "Error occurred with downstream service"
+            raise DownstreamError(msg) from exc
@@ -0,0 +1,138 @@
+from collections.abc import Awaitable, Callable
+
+from app.api.application.cache import CACHE_LOCK_TIMEOUT, Cache
+from app.api.domain.cache_backend import CacheBackend
+from app.api.domain.exception import ApiError, DownstreamError
+
+
+class IdempotencyCache(Cache):
+    """Short-lived cache of the outcomes of requests, keyed by their request ID.
+
+    A client retrying a request after a timeout sends the same NHSE-Request-ID.
+    While the first request is in flight the retry waits for it rather than
+    creating a second supplier session, and once it completes the retry is
+    answered with its response, or with its error if the error is listed in
+    `errors`. Transient errors are not listed, so a retry after one is
+    forwarded again.
+    """
+
+    def __init__(
+        self, ttl: float, errors: tuple[type[ApiError], ...], backend: CacheBackend
+    ) -> None:
+        """Initialises the cache."""
+        super().__init__("idempotency", backend)
+        self.ttl = ttl
+        self._errors = {error.__name__: error for error in errors}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether outcomes are cached."""
+        return self.ttl > 0
+
+    def replay(
+        self,
+        key: str,
+        compute: Callable[[], str],
+        wait: float,
+        lock_ttl: float = CACHE_LOCK_TIMEOUT,
+    ) -> str:
+        """Answer a request with the outcome of its first attempt.
+
+        The attempt in flight is only waited for while it holds the lock, so
+        `lock_ttl` should cover the time forwarding the request can take.
+
+        Args:
+            key (str): Cache key of the request
+            compute (Callable[[], str]): Forwards the request, returning the
+                serialised response
+            wait (float): Seconds to wait for an attempt in flight
+            lock_ttl (float): Seconds an attempt holds the lock on forwarding for
+
+        Raises:
+            ApiError: If the first attempt was answered with a cached error
+
+        Returns:
+            str: Serialised response
+        """
+        raised: list[ApiError] = []
+
+        def outcome() -> list:
+            try:
+                return ["response", compute()]
+            except ApiError as error:
+                return self._error_outcome(error, raised)
+
+        value, _ = self.get_or_set(key, self.ttl, outcome, wait, lock_ttl)
+        return self._result(value, raised)
+
+    async def replay_async(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        wait: float,
+        lock_ttl: float = CACHE_LOCK_TIMEOUT,
+    ) -> str:
+        """Asynchronously answer a request with the outcome of its first attempt.
+
+        Args:
+            key (str): Cache key of the request
+            compute (Callable[[], Awaitable[str]]): Forwards the request,
+                returning the serialised response
+            wait (float): Seconds to wait for an attempt in flight
+            lock_ttl (float): Seconds an attempt holds the lock on forwarding for
+
+        Raises:
+            ApiError: If the first attempt was answered with a cached error
+
+        Returns:
+            str: Serialised response
+        """
+        raised: list[ApiError] = []
+
+        async def outcome() -> list:
+            try:
+                return ["response", await compute()]
+            except ApiError as error:
+                return self._error_outcome(error, raised)
+
+        value, _ = await self.get_or_set_async(key, self.ttl, outcome, wait, lock_ttl)
+        return self._result(value, raised)
+
+    def _error_outcome(self, error: ApiError, raised: list[ApiError]) -> list:
+        """Outcome of an attempt that failed, if its error is cached.
+
+        Args:
+            error (ApiError): Error the attempt failed with
+            raised (list[ApiError]): Collects the error to raise again
+
+        Raises:
+            ApiError: If the error is not cached
+
+        Returns:
+            list: Outcome to cache
+        """
+        if self._errors.get(type(error).__name__) is not type(error):
+            raise error
+        raised.append(error)
+        return ["error", type(error).__name__, str(error)]
+
+    def _result(self, value: list, raised: list[ApiError]) -> str:
+        """Response or error of an outcome.
+
+        The attempt that failed raises its own error, and others raise a copy.
+
+        Args:
+            value (list): Outcome
+            raised (list[ApiError]): Error this attempt failed with, if any
+
+        Raises:
+            ApiError: If the outcome is an error
+
+        Returns:
+            str: Serialised response
+        """
+        if raised:
+            raise raised[0]
+        if value[0] == "error":
+            raise self._errors.get(value[1], DownstreamError)(value[2])
+        return value[1]
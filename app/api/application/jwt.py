@@ -1,6 +1,104 @@
-from jwt import decode
+from os import environ
 
-from app.api.domain.exception import AccessDeniedError
+from jwt import DecodeError, InvalidTokenError, decode, get_unverified_header
+
+from app.api.application.jwt_claims import extract_claims
+from app.api.application.token_cache import TokenCache
+from app.api.domain.exception import AccessDeniedError, ServiceUnavailableError
+from app.api.infrastructure.jwks.key_store import (
+    JWKSKeyStore,
+    KeySetUnavailableError,
+    file_source,
+    url_source,
+)
+
+JWT_CACHE_SIZE = int(environ.get("JWT_CACHE_SIZE", "1024"))
+JWT_CACHE_MAX_TTL = float(environ.get("JWT_CACHE_MAX_TTL", "300"))
+JWT_VERIFY_SIGNATURE = environ.get("JWT_VERIFY_SIGNATURE", "false").lower() == "true"
+JWT_AUDIENCE = environ.get("JWT_AUDIENCE")
+JWKS_URL = environ.get("JWKS_URL")
+JWKS_FILE = environ.get("JWKS_FILE")
+
+
+def __key_store() -> JWKSKeyStore | None:
+    """Create the key store to verify token signatures with, if enabled.
+
+    Returns:
+        JWKSKeyStore | None: Key store, or None if signatures are not verified
+    """
+    if not JWT_VERIFY_SIGNATURE:
+        return None
+    if JWKS_FILE:
+        return JWKSKeyStore(file_source(JWKS_FILE))
+    if JWKS_URL:
+        return JWKSKeyStore(url_source(JWKS_URL))
+    msg = "JWKS_URL or JWKS_FILE must be set when JWT_VERIFY_SIGNATURE is enabled"
+    raise ValueError(msg)
+
+
+# Tokens are only cached once verified, so the cache also memoises verification
+TOKEN_CACHE = TokenCache(JWT_CACHE_SIZE, JWT_CACHE_MAX_TTL)
+KEY_STORE = __key_store()
+
+
+def start_key_refresh() -> None:
+    """Loads the keys token signatures are verified with, if verifying them."""
+    if KEY_STORE is not None:
+        KEY_STORE.start()
+
+
+def jwt_cache_stats() -> dict:
+    """Statistics about the cache of NHS numbers extracted from JWT tokens.
+
+    Returns:
+        dict: Size and hit and miss counts of the cache
+    """
+    return TOKEN_CACHE.stats()
+
+
+def jwks_stats() -> dict:
+    """Statistics about the keys token signatures are verified with.
+
+    Returns:
+        dict: Key ids held and refresh counts, or nothing if not verifying
+    """
+    return KEY_STORE.stats() if KEY_STORE else {}
+
+
+def __decode(jwt_token: str) -> dict:
+    """Decodes JWT token, verifying its signature if JWT_VERIFY_SIGNATURE is enabled.
+
+    Args:
+        jwt_token (str): JWT token
+
+    Raises:
+        AccessDeniedError: If the token is malformed or cannot be verified
+        ServiceUnavailableError: If the signing keys could not be fetched
+
+    Returns:
+        dict: Decoded JWT token
+    """
+    if KEY_STORE is None:
+        try:
+            return extract_claims(jwt_token)
+        except DecodeError as exc:
+            msg = "Failed to decode token"
+            raise AccessDeniedError(msg) from exc
+    try:
+        key = KEY_STORE.get_key(get_unverified_header(jwt_token).get("kid"))
+        return decode(
+            jwt_token,
+            key=key,
+            algorithms=["RS512"],
+            audience=JWT_AUDIENCE,
+            options={"verify_aud": JWT_AUDIENCE is not None},
+        )
+    except KeySetUnavailableError as exc:
+        msg = "Token signing keys are unavailable"
+        raise ServiceUnavailableError(msg, retry_after=exc.retry_after) from exc
+    except (InvalidTokenError, KeyError) as exc:
+        msg = "Failed to verify token"
+        raise AccessDeniedError(msg) from exc
 
 
 def __fetch_nhs_number(decoded_token: dict) -> str:
@@ -39,27 +137,60 @@ def __fetch_proxy_nhs_number(decoded_token: dict) -> str:
     return __fetch_nhs_number(decoded_token)
 
 
-def get_nhs_number_from_jwt_token(jwt_token: str) -> tuple[str, str]:
+def __fetch_expiry(*decoded_tokens: dict) -> float | None:
+    """Fetch when the first of the decoded jwt tokens expires.
+
+    Args:
+        decoded_tokens (dict): Decoded JWT tokens
+
+    Returns:
+        float | None: Expiry as a Unix timestamp, or None if no token expires
+    """
+    expiries = [token.get("exp") for token in decoded_tokens if "exp" in token]
+    if not all(isinstance(exp, int | float) for exp in expiries):
+        return 0  # An unreadable expiry is never cached
+    return min(expiries, default=None)
+
+
+def __decode_nhs_numbers(jwt_token: str) -> tuple[tuple[str, str], float | None]:
     """Decodes JWT token and returns patient and proxy nhs numbers.
 
     Args:
         jwt_token (str): JWT composite token
 
     Returns:
-        tuple[str, str]: Patient and proxy NHS numbers
+        tuple[tuple[str, str], float | None]: Patient and proxy NHS numbers, and
+            when the first of the tokens expires
     """
-    decoded_token = decode(
-        jwt_token,
-        algorithms=["RS512"],
-        options={"verify_signature": False},
-    )
+    decoded_token = __decode(jwt_token)
     patient_nhs_number = __fetch_nhs_number(decoded_token)
 
-    proxy_decoded_token = decode(
-        decoded_token.get("act", {}).get("sub"),
-        algorithms=["RS512"],
-        options={"verify_signature": False},
-    )
+    proxy_decoded_token = __decode(decoded_token.get("act", {}).get("sub"))
     proxy_nhs_number = __fetch_proxy_nhs_number(proxy_decoded_token)
 
-    return (patient_nhs_number, proxy_nhs_number)
+    return (
+        (patient_nhs_number, proxy_nhs_number),
+        __fetch_expiry(decoded_token, proxy_decoded_token),
+    )
+
+
+def get_nhs_number_from_jwt_token(jwt_token: str) -> tuple[str, str]:
+    """Decodes JWT token and returns patient and proxy nhs numbers.
+
+    NHS numbers are cached by a digest of the token until it expires, so a
+    token that is reused is only decoded, verified and checked once.
+
+    Args:
+        jwt_token (str): JWT composite token
+
+    Returns:
+        tuple[str, str]: Patient and proxy NHS numbers
+    """
+    if not isinstance(jwt_token, str):
+        return __decode_nhs_numbers(jwt_token)[0]
+    key = TOKEN_CACHE.key(jwt_token)
+    nhs_numbers = TOKEN_CACHE.get(key)
+    if nhs_numbers is None:
+        nhs_numbers, expires_at = __decode_nhs_numbers(jwt_token)
+        TOKEN_CACHE.put(key, nhs_numbers, expires_at)
+    return nhs_numbers
@@ -0,0 +1,32 @@
+from base64 import urlsafe_b64decode
+from json import loads
+
+from jwt import DecodeError
+
+
+def extract_claims(jwt_token: str) -> dict:
+    """Extracts the claims of a JWT token without verifying it.
+
+    Only the payload segment is decoded. The header and signature are not
+    needed when the signature is not verified, so are skipped.
+
+    Args:
+        jwt_token (str): JWT token
+
+    Raises:
+        DecodeError: If the token is not made of three segments or its payload
+            is not a base64url encoded JSON object
+
+    Returns:
+        dict: Claims of the token
+    """
+    try:
+        _, payload, _ = jwt_token.split(".")
+        claims = loads(urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (AttributeError, ValueError) as exc:
+        msg = "Invalid token"
+        raise DecodeError(msg) from exc
+    if not isinstance(claims, dict):
+        msg = "Invalid payload string: must be a json object"
+        raise DecodeError(msg)
+    return claims
@@ -0,0 +1,80 @@
+from app.api.application.cache import Cache
+from app.api.domain.cache_backend import CacheBackend
+from app.api.domain.exception import ApiError
+
+
+class NegativeCache(Cache):
+    """Short-lived cache of logins a supplier turned away.
+
+    A supplier answering a login with an error listed in `ttls`, such as an
+    unknown patient, is likely to answer an immediate retry the same way, so
+    the error is remembered for its TTL and repeats are answered locally.
+    """
+
+    def __init__(
+        self, ttls: dict[type[ApiError], float], backend: CacheBackend
+    ) -> None:
+        """Initialises the cache."""
+        super().__init__("negative", backend)
+        self.ttls = ttls
+        self._errors = {error.__name__: error for error in ttls}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any error is cached."""
+        return any(ttl > 0 for ttl in self.ttls.values())
+
+    def get_error(self, key: str) -> ApiError | None:
+        """Fetch the error a login was last answered with, if it has not expired.
+
+        Args:
+            key (str): Cache key of the login
+
+        Returns:
+            ApiError | None: Error to answer the login with, or None on a miss
+        """
+        return self._error(self.get(key))
+
+    async def get_error_async(self, key: str) -> ApiError | None:
+        """Fetch the error a login was last answered with, without blocking.
+
+        Args:
+            key (str): Cache key of the login
+
+        Returns:
+            ApiError | None: Error to answer the login with, or None on a miss
+        """
+        return self._error(await self.get_async(key))
+
+    def put_error(self, key: str, error: ApiError) -> None:
+        """Remember the error a login was answered with, if its type is cached.
+
+        Args:
+            key (str): Cache key of the login
+            error (ApiError): Error the supplier answered the login with
+        """
+        ttl = self.ttls.get(type(error), 0.0)
+        self.set(key, [type(error).__name__, str(error)], ttl)
+
+    async def put_error_async(self, key: str, error: ApiError) -> None:
+        """Remember the error a login was answered with, without blocking.
+
+        Args:
+            key (str): Cache key of the login
+            error (ApiError): Error the supplier answered the login with
+        """
+        ttl = self.ttls.get(type(error), 0.0)
+        await self.set_async(key, [type(error).__name__, str(error)], ttl)
+
+    def _error(self, entry: list | None) -> ApiError | None:
+        """Error a cached entry records.
+
+        Args:
+            entry (list | None): Cached entry, None on a miss
+
+        Returns:
+            ApiError | None: Error to answer the login with, or None on a miss
+        """
+        if entry is None or entry[0] not in self._errors:
+            return None
+        return self._errors[entry[0]](entry[1])
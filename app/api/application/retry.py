@@ -0,0 +1,148 @@
+from asyncio import sleep as async_sleep
+from collections.abc import Awaitable, Callable
+from os import environ
+from random import uniform
+from threading import Lock
+from time import sleep
+from typing import TypeVar
+
+from app.api.domain.deadline import Deadline
+from app.api.domain.exception import DownstreamUnavailableError
+from app.api.infrastructure.metrics.prometheus import record_retry
+from app.api.infrastructure.transport.errors import is_connect_error
+
+MAX_ATTEMPTS = int(environ.get("RETRY_MAX_ATTEMPTS", "3"))
+BASE_DELAY_SECONDS = float(environ.get("RETRY_BASE_DELAY_SECONDS", "0.1"))
+MAX_DELAY_SECONDS = float(environ.get("RETRY_MAX_DELAY_SECONDS", "1"))
+BUDGET_RATIO = float(environ.get("RETRY_BUDGET_RATIO", "0.1"))
+BUDGET_CAPACITY = float(environ.get("RETRY_BUDGET_CAPACITY", "10"))
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """Retries supplier requests that are safe to send again.
+
+    Only requests that failed to connect, or that the supplier answered with a 503
+    and a Retry-After header, are retried. Connect failures wait for an
+    exponential backoff with full jitter. Retries are limited by a token bucket:
+    every request adds `budget_ratio` tokens up to `budget_capacity` and every
+    retry spends one, so retries can never add more than that proportion of load
+    to a supplier that is already struggling. Each retry, and each retry given
+    up on, is counted in the Prometheus metrics.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_delay: float = BASE_DELAY_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+        budget_ratio: float = BUDGET_RATIO,
+        budget_capacity: float = BUDGET_CAPACITY,
+    ) -> None:
+        """Initialises a retry policy with a full retry budget."""
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_capacity = budget_capacity
+        self.retries = 0
+        self.budget_exhausted = 0
+        self._tokens = budget_capacity
+        self._lock = Lock()
+
+    def call(self, forward: Callable[[], T], deadline: Deadline) -> T:
+        """Calls the supplier, retrying failures that are safe to retry.
+
+        Args:
+            forward (Callable[[], T]): Sends the request to the supplier
+            deadline (Deadline): Deadline retries must finish within
+
+        Returns:
+            T: Result of the first successful attempt
+        """
+        self._deposit()
+        attempt = 1
+        while True:
+            try:
+                return forward()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, deadline)
+                if delay is None:
+                    raise
+            sleep(delay)
+            attempt += 1
+
+    async def call_async(
+        self, forward: Callable[[], Awaitable[T]], deadline: Deadline
+    ) -> T:
+        """Asynchronously calls the supplier, retrying failures that are safe to retry.
+
+        Args:
+            forward (Callable[[], Awaitable[T]]): Sends the request to the supplier
+            deadline (Deadline): Deadline retries must finish within
+
+        Returns:
+            T: Result of the first successful attempt
+        """
+        self._deposit()
+        attempt = 1
+        while True:
+            try:
+                return await forward()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, deadline)
+                if delay is None:
+                    raise
+            await async_sleep(delay)
+            attempt += 1
+
+    def stats(self) -> dict:
+        """Retries made and the retry budget left.
+
+        Returns:
+            dict: Retry statistics
+        """
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "budgetExhausted": self.budget_exhausted,
+                "budgetTokens": round(self._tokens, 2),
+            }
+
+    def _retry_delay(
+        self, exc: Exception, attempt: int, deadline: Deadline
+    ) -> float | None:
+        """Decides whether a failed attempt is retried.
+
+        Returns:
+            float | None: Seconds to wait before retrying, or None not to retry
+        """
+        if isinstance(exc, DownstreamUnavailableError):
+            delay = exc.retry_after + uniform(0, self.base_delay)  # noqa: S311
+        elif is_connect_error(exc):
+            backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            delay = uniform(0, backoff)  # noqa: S311
+        else:
+            return None
+        if attempt >= self.max_attempts:
+            record_retry(self.name, "max_attempts")
+            return None
+        if delay >= deadline.remaining():
+            record_retry(self.name, "deadline")
+            return None
+        with self._lock:
+            if self._tokens < 1:
+                self.budget_exhausted += 1
+                record_retry(self.name, "budget")
+                return None
+            self._tokens -= 1
+            self.retries += 1
+        record_retry(self.name, "retried")
+        return delay
+
+    def _deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.budget_capacity, self._tokens + self.budget_ratio)
@@ -0,0 +1,139 @@
+import json
+from pathlib import Path
+from posixpath import normpath
+from urllib.parse import urlsplit
+
+DEFAULT_PORTS = {"https": 443, "http": 80}
+
+
+def normalise_url(url: str) -> str:
+    """Normalise a URL so equivalent spellings of it compare equal.
+
+    The scheme and host are lower cased, a default port is dropped, and repeated
+    slashes, dot segments and trailing slashes are removed from the path. The
+    path is otherwise kept as given, as paths may be case sensitive.
+
+    Args:
+        url (str): URL to normalise
+
+    Raises:
+        ValueError: If the URL has an invalid port
+
+    Returns:
+        str: Normalised URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    port = parts.port
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    path = normpath(parts.path).strip("/") if parts.path else ""
+    path = f"/{path}" if path not in ("", ".") else ""
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{scheme}://{netloc}{path}{query}"
+
+
+class Route:
+    """A supplier base URL requests can be forwarded to."""
+
+    __slots__ = ("base_url", "supplier")
+
+    def __init__(self, supplier: str, base_url: str) -> None:
+        """Initialises a route."""
+        self.supplier = supplier
+        self.base_url = base_url
+
+
+class RoutingTable:
+    """Supplier base URLs indexed by their normalised form.
+
+    Each supplier may have several base URLs, and `NHSE-Forward-To` values that
+    only differ in case, default port or slashes resolve to the same route with
+    a single dictionary lookup. A table is never changed once built, it is
+    replaced as a whole when the routes are reloaded.
+    """
+
+    def __init__(self, suppliers: dict[str, list[str]], source: str) -> None:
+        """Indexes the base URLs of each supplier.
+
+        Raises:
+            ValueError: If a base URL is not HTTPS or is listed more than once
+        """
+        self.suppliers = {supplier: list(urls) for supplier, urls in suppliers.items()}
+        self.source = source
+        self._routes: dict[str, Route] = {}
+        for supplier, base_urls in self.suppliers.items():
+            for base_url in base_urls:
+                key = normalise_url(base_url)
+                if not key.startswith("https://"):
+                    msg = f"Supplier base url must use https: {base_url}"
+                    raise ValueError(msg)
+                if key in self._routes:
+                    msg = f"Supplier base url listed more than once: {base_url}"
+                    raise ValueError(msg)
+                self._routes[key] = Route(supplier, base_url)
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoutingTable":
+        """Loads a table from a JSON file of base URLs keyed by supplier.
+
+        Args:
+            path (str): Path of the file, such as {"EMIS": ["https://emis.com"]}
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid routing table
+
+        Returns:
+            RoutingTable: Routing table
+        """
+        suppliers = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(suppliers, dict) or not all(
+            isinstance(urls, list) and all(isinstance(url, str) for url in urls)
+            for urls in suppliers.values()
+        ):
+            msg = f"Routing table must map suppliers to lists of base urls: {path}"
+            raise ValueError(msg)
+        return cls(suppliers, path)
+
+    def resolve(self, url: str) -> Route:
+        """Find the route for a forwarding URL.
+
+        Args:
+            url (str): Forwarding URL, such as the NHSE-Forward-To header
+
+        Raises:
+            KeyError: If the URL is not a supplier base URL
+
+        Returns:
+            Route: Route of the supplier base URL
+        """
+        try:
+            key = normalise_url(url)
+        except ValueError as exc:
+            raise KeyError(url) from exc
+        return self._routes[key]
+
+    def base_urls(self) -> list[str]:
+        """Every supplier base URL in the table.
+
+        Returns:
+            list[str]: Base URLs
+        """
+        return [route.base_url for route in self._routes.values()]
+
+    def routes(self) -> list[Route]:
+        """Every route in the table.
+
+        Returns:
+            list[Route]: Routes
+        """
+        return list(self._routes.values())
+
+    def stats(self) -> dict:
+        """Statistics about the table.
+
+        Returns:
+            dict: Where the table was loaded from and the base URLs of each supplier
+        """
+        return {"source": self.source, "suppliers": self.suppliers}
@@ -0,0 +1,80 @@
+from collections.abc import Iterable
+from os import environ
+
+from app.api.application.cache import Cache
+from app.api.domain.cache_backend import CacheBackend
+
+
+def _setting(supplier: str, name: str, default: str) -> str:
+    """Fetch a session cache setting for a supplier, falling back to the shared one.
+
+    Args:
+        supplier (str): Supplier name
+        name (str): Setting name
+        default (str): Value used when neither setting is configured
+
+    Returns:
+        str: Setting value
+    """
+    return environ.get(
+        f"SESSION_CACHE_{supplier}_{name}",
+        environ.get(f"SESSION_CACHE_{name}", default),
+    )
+
+
+class SessionCache(Cache):
+    """Short-lived cache of serialised session responses.
+
+    Identical logins repeated within a supplier's TTL, such as a double-tapped
+    log in button or an app retrying, are answered with the session already
+    created rather than creating another, and concurrent repeats wait for the
+    first rather than each creating a session.
+    """
+
+    def __init__(self, ttls: dict[str, float], backend: CacheBackend) -> None:
+        """Initialises the cache."""
+        super().__init__("session", backend)
+        self.ttls = ttls
+
+    @classmethod
+    def for_suppliers(
+        cls, suppliers: Iterable[str], backend: CacheBackend
+    ) -> "SessionCache":
+        """Creates a cache configured from the environment.
+
+        SESSION_CACHE_<SUPPLIER>_TTL takes precedence over SESSION_CACHE_TTL, and
+        responses are only cached for suppliers with a TTL above zero.
+
+        Args:
+            suppliers (Iterable[str]): Supplier names
+            backend (CacheBackend): Backend to keep responses in
+
+        Returns:
+            SessionCache: Cache for the suppliers' session responses
+        """
+        return cls(
+            ttls={
+                supplier: float(_setting(supplier, "TTL", "0"))
+                for supplier in suppliers
+            },
+            backend=backend,
+        )
+
+    def ttl(self, supplier: str) -> float:
+        """Seconds the supplier's session responses are cached for.
+
+        Args:
+            supplier (str): Supplier name
+
+        Returns:
+            float: TTL of the supplier's responses, zero if they are not cached
+        """
+        return self.ttls.get(supplier, 0.0)
+
+    def stats(self) -> dict:
+        """Statistics about the cache.
+
+        Returns:
+            dict: Backend statistics, TTLs and hit, miss and error counts
+        """
+        return {**super().stats(), "ttls": self.ttls}
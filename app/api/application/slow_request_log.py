@@ -0,0 +1,66 @@
+from logging import Logger
+from os import environ
+
+from app.api.application.error_log import (
+    ERROR_LOG_BURST,
+    ERROR_LOG_INTERVAL,
+    ErrorLogLimiter,
+)
+from app.api.domain.stage_timings import StageTimings
+
+SLOW_REQUEST_THRESHOLD = float(environ.get("SLOW_REQUEST_THRESHOLD", "1"))
+
+LIMITER = ErrorLogLimiter(ERROR_LOG_BURST, ERROR_LOG_INTERVAL)
+
+
+def _milliseconds(durations: dict) -> dict:
+    return {
+        name: value if isinstance(value, bool) else round(value * 1000, 1)
+        for name, value in durations.items()
+    }
+
+
+def log_slow_request(
+    logger: Logger, route: str, timings: StageTimings, status: int
+) -> None:
+    """Log a request slower than SLOW_REQUEST_THRESHOLD seconds.
+
+    The time spent in each stage and the network phases of each call made to
+    the supplier are logged, in milliseconds, so supplier slowness can be told
+    apart from our own network path. Slow requests to the same supplier are
+    rate-limited like errors.
+
+    Args:
+        logger (Logger): Logger to log the event to
+        route (str): Route of the request, such as "POST /authenticate"
+        timings (StageTimings): Time spent in each stage of the request
+        status (int): Status the request was answered with
+    """
+    elapsed = timings.elapsed()
+    if elapsed < SLOW_REQUEST_THRESHOLD:
+        return
+    suppressed = LIMITER.allow((route, timings.supplier))
+    if suppressed is None:
+        return
+    stages = _milliseconds(timings.durations)
+    supplier_calls = [_milliseconds(call) for call in timings.supplier_calls]
+    logger.warning(
+        "Slow request %s status=%d elapsed_ms=%.1f supplier=%s stages=%s "
+        "supplier_calls=%s suppressed=%d",
+        route,
+        status,
+        elapsed * 1000,
+        timings.supplier,
+        stages,
+        supplier_calls,
+        suppressed,
+        extra={
+            "event": "slow_request",
+            "route": route,
+            "status": int(status),
+            "supplier": timings.supplier,
+            "stages": stages,
+            "supplier_calls": supplier_calls,
+            "suppressed": suppressed,
+        },
+    )
@@ -0,0 +1,190 @@
+import asyncio
+from threading import Event, Thread
+from time import sleep
+from unittest.mock import patch
+
+import pytest
+
+from app.api.application.bulkhead import Bulkhead
+from app.api.domain.exception import ServiceUnavailableError
+
+
+@pytest.fixture(name="bulkhead")
+def setup_bulkhead() -> Bulkhead:
+    return Bulkhead("EMIS", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+
+
+def test_bulkhead_for_supplier() -> None:
+    """Test supplier settings take precedence over the shared settings."""
+    # Arrange
+    with patch.dict(
+        "os.environ",
+        {
+            "BULKHEAD_MAX_CONCURRENT": "5",
+            "BULKHEAD_EMIS_MAX_CONCURRENT": "20",
+            "BULKHEAD_MAX_QUEUE": "3",
+        },
+    ):
+        # Act
+        bulkhead = Bulkhead.for_supplier("EMIS")
+
+    # Assert
+    assert bulkhead.max_concurrent == 20
+    assert bulkhead.max_queue == 3
+    assert bulkhead.queue_timeout == 1
+
+
+def test_bulkhead_slot_released(bulkhead: Bulkhead) -> None:
+    """Test a slot is given back when the request fails."""
+
+    # Arrange
+    def failing_request() -> None:
+        with bulkhead.slot():
+            assert bulkhead.active == 1
+            msg = "Oops"
+            raise ValueError(msg)
+
+    # Act
+    with pytest.raises(ValueError, match="Oops"):
+        failing_request()
+
+    # Assert
+    assert bulkhead.stats() == {
+        "supplier": "EMIS",
+        "maxConcurrent": 1,
+        "maxQueue": 1,
+        "active": 0,
+        "waiting": 0,
+        "rejected": 0,
+    }
+
+
+def test_bulkhead_rejects_when_queue_full() -> None:
+    """Test requests are rejected straight away once the queue is full."""
+    # Arrange
+    bulkhead = Bulkhead("EMIS", max_concurrent=1, max_queue=0, queue_timeout=10)
+
+    # Act & Assert
+    with bulkhead.slot():
+        with pytest.raises(ServiceUnavailableError) as exc_info, bulkhead.slot():
+            pass
+        assert exc_info.value.headers == {"Retry-After": "1"}
+    assert bulkhead.stats()["rejected"] == 1
+
+
+def test_bulkhead_rejects_after_queue_timeout(bulkhead: Bulkhead) -> None:
+    """Test queued requests are rejected when no slot is freed in time."""
+    # Act & Assert
+    with bulkhead.slot():
+        with pytest.raises(ServiceUnavailableError), bulkhead.slot():
+            pass
+        assert bulkhead.waiting == 0
+    assert bulkhead.rejected == 1
+
+
+def test_bulkhead_queued_request_gets_released_slot() -> None:
+    """Test a queued request runs once a slot is freed."""
+    # Arrange
+    bulkhead = Bulkhead("EMIS", max_concurrent=1, max_queue=1, queue_timeout=10)
+    entered = Event()
+
+    def queued_request() -> None:
+        with bulkhead.slot():
+            entered.set()
+
+    # Act
+    with bulkhead.slot():
+        thread = Thread(target=queued_request)
+        thread.start()
+        while bulkhead.stats()["waiting"] == 0:
+            sleep(0.001)
+        assert not entered.is_set()
+    thread.join()
+
+    # Assert
+    assert entered.is_set()
+    assert bulkhead.stats()["active"] == 0
+    assert bulkhead.rejected == 0
+
+
+def test_bulkhead_async_queued_request_gets_released_slot() -> None:
+    """Test a queued coroutine runs once a slot is freed."""
+    # Arrange
+    bulkhead = Bulkhead("EMIS", max_concurrent=1, max_queue=1, queue_timeout=10)
+    order = []
+
+    async def request(name: str) -> None:
+        async with bulkhead.async_slot():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        await asyncio.gather(request("first"), request("second"))
+
+    # Act
+    asyncio.run(run())
+
+    # Assert
+    assert order == ["first", "second"]
+    assert bulkhead.stats()["active"] == 0
+    assert bulkhead.stats()["waiting"] == 0
+
+
+def test_bulkhead_async_rejects(bulkhead: Bulkhead) -> None:
+    """Test coroutines are rejected when the queue is full or the wait times out."""
+
+    # Arrange
+    async def request() -> None:
+        async with bulkhead.async_slot():
+            await asyncio.sleep(0.2)
+
+    async def run() -> list:
+        return await asyncio.gather(
+            request(), request(), request(), return_exceptions=True
+        )
+
+    # Act
+    results = asyncio.run(run())
+
+    # Assert
+    assert results[0] is None
+    assert isinstance(results[1], ServiceUnavailableError)
+    assert isinstance(results[2], ServiceUnavailableError)
+    assert bulkhead.stats() == {
+        "supplier": "EMIS",
+        "maxConcurrent": 1,
+        "maxQueue": 1,
+        "active": 0,
+        "waiting": 0,
+        "rejected": 2,
+    }
+
+
+def test_bulkhead_async_counts_rejections_under_lock() -> None:
+    """Test a coroutine timing out in the queue is counted holding the lock."""
+
+    # Arrange
+    class LockCheckingBulkhead(Bulkhead):
+        def __setattr__(self, name: str, value: object) -> None:
+            if name == "rejected" and hasattr(self, "_lock"):
+                assert self._lock.locked()
+            super().__setattr__(name, value)
+
+    bulkhead = LockCheckingBulkhead(
+        "EMIS", max_concurrent=1, max_queue=1, queue_timeout=0.01
+    )
+
+    async def request() -> None:
+        async with bulkhead.async_slot():
+            await asyncio.sleep(0.05)
+
+    async def run() -> list:
+        return await asyncio.gather(request(), request(), return_exceptions=True)
+
+    # Act
+    results = asyncio.run(run())
+
+    # Assert
+    assert results[0] is None
+    assert isinstance(results[1], ServiceUnavailableError)
+    assert bulkhead.rejected == 1
@@ -0,0 +1,237 @@
+import asyncio
+from collections.abc import Callable
+from threading import Event, Thread, get_ident
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.api.application.cache import Cache, decode, encode
+from app.api.infrastructure.cache.memory import MemoryBackend
+
+FILE_PATH = "app.api.application.cache"
+
+
+@pytest.fixture(name="cache")
+def setup_cache() -> Cache:
+    return Cache("test", MemoryBackend())
+
+
+@pytest.mark.parametrize(
+    ("value", "expected_prefix"),
+    [
+        ('{"sessionId": "1"}', b's{"sessionId": "1"}'),
+        (["NotFoundError", "Testing"], b'j["NotFoundError","Testing"]'),
+        ("x" * 2000, b"z"),
+    ],
+)
+def test_encode(value: str | list, expected_prefix: bytes) -> None:
+    """Test values are tagged, compactly serialised and large values compressed."""
+    # Act
+    actual_result = encode(value)
+
+    # Assert
+    assert actual_result.startswith(expected_prefix)
+    assert len(actual_result) < 100
+    assert decode(actual_result) == value
+
+
+def test_cache_key(cache: Cache) -> None:
+    """Test keys are namespaced digests that do not reveal the identity."""
+    # Act
+    actual_result = cache.key("1234567890", "A12345")
+
+    # Assert
+    assert actual_result.startswith("im1-pfs-auth:1:test:")
+    assert "1234567890" not in actual_result
+    assert actual_result != cache.key("1234567890A12345")
+
+
+@pytest.mark.parametrize("data", [b"zcorrupt", b"s\xff", b'j{"session'])
+def test_cache_corrupt_entry_is_a_miss(cache: Cache, data: bytes) -> None:
+    """Test an entry that cannot be decoded is a miss and is removed."""
+    # Arrange
+    key = cache.key("some identity")
+    cache.backend.set(key, data, 5)
+
+    # Act
+    actual_result = cache.get(key)
+
+    # Assert
+    assert actual_result is None
+    assert cache.backend.get(key) is None
+    assert (cache.stats()["misses"], cache.stats()["errors"]) == (1, 1)
+
+
+def test_cache_get_or_set(cache: Cache) -> None:
+    """Test a value is computed on a miss and fetched from the cache after."""
+    # Arrange
+    compute = MagicMock(return_value="value")
+    key = cache.key("some identity")
+
+    # Act
+    actual_result = [cache.get_or_set(key, 5, compute) for _ in range(2)]
+
+    # Assert
+    assert actual_result == [("value", False), ("value", True)]
+    compute.assert_called_once()
+    assert cache.backend.get(f"{key}:lock") is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_cache_get_or_set_coalesces_concurrent_misses(cache: Cache) -> None:
+    """Test concurrent misses wait for the first caller rather than computing."""
+    # Arrange
+    computing = Event()
+    release = Event()
+    key = cache.key("some identity")
+
+    def compute() -> str:
+        computing.set()
+        release.wait(1)
+        return "value"
+
+    results = []
+    leader = Thread(target=lambda: results.append(cache.get_or_set(key, 5, compute)))
+    leader.start()
+    computing.wait(1)
+    follower_compute = MagicMock(return_value="other value")
+
+    # Act
+    follower = Thread(
+        target=lambda: results.append(cache.get_or_set(key, 5, follower_compute))
+    )
+    follower.start()
+    release.set()
+    leader.join()
+    follower.join()
+
+    # Assert
+    assert sorted(results) == [("value", False), ("value", True)]
+    follower_compute.assert_not_called()
+    assert cache.stats()["coalesced"] == 1
+
+
+def test_cache_get_or_set_computes_after_waiting(cache: Cache) -> None:
+    """Test a caller computes the value itself once it has waited long enough."""
+    # Arrange
+    key = cache.key("some identity")
+    cache.backend.add(f"{key}:lock", b"1", 5)
+
+    # Act
+    actual_result = cache.get_or_set(key, 5, lambda: "value", wait=0.05)
+
+    # Assert
+    assert actual_result == ("value", False)
+    assert cache.backend.get(f"{key}:lock") == b"1"
+
+
+def test_cache_get_or_set_lock_ttl(cache: Cache) -> None:
+    """Test the lock on computing a value is held for the ttl it is given."""
+    # Arrange
+    key = cache.key("some identity")
+
+    # Act
+    with patch.object(cache.backend, "add", wraps=cache.backend.add) as mock_add:
+        actual_result = cache.get_or_set(key, 5, lambda: "value", lock_ttl=30)
+
+    # Assert
+    assert actual_result == ("value", False)
+    mock_add.assert_called_once_with(f"{key}:lock", b"1", 30)
+
+
+def test_cache_get_or_set_releases_lock_on_error(cache: Cache) -> None:
+    """Test the lock is released when computing the value fails."""
+    # Arrange
+    key = cache.key("some identity")
+
+    # Act
+    with pytest.raises(ValueError, match="Testing"):
+        cache.get_or_set(key, 5, MagicMock(side_effect=ValueError("Testing")))
+
+    # Assert
+    assert cache.backend.get(f"{key}:lock") is None
+    assert cache.get(key) is None
+
+
+def test_cache_get_or_set_async(cache: Cache) -> None:
+    """Test a value is computed asynchronously on a miss and cached after."""
+    # Arrange
+    key = cache.key("some identity")
+    calls = []
+
+    async def compute() -> str:
+        calls.append(key)
+        return "value"
+
+    async def get_twice() -> list:
+        return [await cache.get_or_set_async(key, 5, compute) for _ in range(2)]
+
+    # Act
+    actual_result = asyncio.run(get_twice())
+
+    # Assert
+    assert actual_result == [("value", False), ("value", True)]
+    assert len(calls) == 1
+
+
+def test_cache_get_or_set_async_blocking_backend() -> None:
+    """Test calls to a blocking backend are made off the event loop."""
+    # Arrange
+    backend = MemoryBackend()
+    backend.blocking = True
+    cache = Cache("test", backend)
+    key = cache.key("some identity")
+    threads = []
+
+    def record_thread(method: Callable) -> MagicMock:
+        return MagicMock(
+            side_effect=lambda *args: threads.append(get_ident()) or method(*args)
+        )
+
+    async def compute() -> str:
+        return "value"
+
+    async def get_or_set() -> tuple[int, tuple]:
+        return get_ident(), await cache.get_or_set_async(key, 5, compute)
+
+    # Act
+    with (
+        patch.object(backend, "get", record_thread(backend.get)),
+        patch.object(backend, "add", record_thread(backend.add)),
+        patch.object(backend, "set", record_thread(backend.set)),
+        patch.object(backend, "delete", record_thread(backend.delete)),
+    ):
+        loop_thread, actual_result = asyncio.run(get_or_set())
+
+    # Assert
+    assert actual_result == ("value", False)
+    assert len(threads) == 4
+    assert loop_thread not in threads
+    assert cache.get(key) == "value"
+
+
+def test_cache_backend_errors_are_misses() -> None:
+    """Test a backend that cannot be reached is treated as a miss."""
+    # Arrange
+    backend = MagicMock()
+    backend.get.side_effect = ConnectionRefusedError
+    backend.add.side_effect = ConnectionRefusedError
+    backend.set.side_effect = ConnectionRefusedError
+    backend.delete.side_effect = ConnectionRefusedError
+    backend.stats.return_value = {"backend": "redis"}
+    cache = Cache("test", backend)
+
+    # Act
+    with patch(f"{FILE_PATH}.sleep") as mock_sleep:
+        actual_result = cache.get_or_set(cache.key("some identity"), 5, lambda: "v")
+
+    # Assert
+    assert actual_result == ("v", False)
+    mock_sleep.assert_not_called()
+    assert cache.stats() == {
+        "backend": "redis",
+        "hits": 0,
+        "misses": 1,
+        "coalesced": 0,
+        "errors": 4,
+    }
@@ -0,0 +1,255 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.api.application.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    is_supplier_failure,
+)
+from app.api.domain.exception import (
+    DownstreamError,
+    GatewayTimeoutError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+
+FILE_PATH = "app.api.application.circuit_breaker"
+
+
+def fail(circuit_breaker: CircuitBreaker, exception: Exception) -> None:
+    with pytest.raises(type(exception)), circuit_breaker.guard():
+        raise exception
+
+
+def succeed(circuit_breaker: CircuitBreaker) -> None:
+    with circuit_breaker.guard():
+        pass
+
+
+@pytest.fixture(name="circuit_breaker")
+def setup_circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "https://emis.com",
+        window_seconds=10,
+        min_requests=4,
+        error_rate=0.5,
+        open_seconds=5,
+        half_open_probes=2,
+    )
+
+
+@pytest.mark.parametrize(
+    ("exception", "expected_result"),
+    [
+        (DownstreamError(), True),
+        (TimeoutError(), True),
+        (GatewayTimeoutError(), True),
+        (NotFoundError(), False),
+    ],
+)
+def test_is_supplier_failure(exception: Exception, *, expected_result: bool) -> None:
+    """Test only downstream and unexpected errors count as supplier failures."""
+    # Act
+    actual_result = is_supplier_failure(exception)
+
+    # Assert
+    assert actual_result is expected_result
+
+
+@patch(f"{FILE_PATH}.monotonic", return_value=100)
+def test_circuit_breaker_opens_at_error_rate(
+    _mock_monotonic: object, circuit_breaker: CircuitBreaker
+) -> None:
+    """Test the circuit opens once the error rate is reached."""
+    # Arrange
+    succeed(circuit_breaker)
+    succeed(circuit_breaker)
+    fail(circuit_breaker, DownstreamError())
+
+    # Act
+    fail(circuit_breaker, TimeoutError())
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.OPEN
+
+
+@patch(f"{FILE_PATH}.monotonic", return_value=100)
+def test_circuit_breaker_stays_closed_below_min_requests(
+    _mock_monotonic: object, circuit_breaker: CircuitBreaker
+) -> None:
+    """Test the circuit stays closed until enough requests have been made."""
+    # Act
+    for _ in range(3):
+        fail(circuit_breaker, DownstreamError())
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.CLOSED
+
+
+@patch(f"{FILE_PATH}.monotonic", return_value=100)
+def test_circuit_breaker_ignores_client_errors(
+    _mock_monotonic: object, circuit_breaker: CircuitBreaker
+) -> None:
+    """Test errors returned for the request itself do not open the circuit."""
+    # Act
+    for _ in range(4):
+        fail(circuit_breaker, NotFoundError())
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert circuit_breaker.stats()["failures"] == 0
+
+
+def test_circuit_breaker_forgets_outcomes_outside_window(
+    circuit_breaker: CircuitBreaker,
+) -> None:
+    """Test outcomes older than the window do not count towards the error rate."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(3):
+            fail(circuit_breaker, DownstreamError())
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=111):
+        fail(circuit_breaker, DownstreamError())
+        actual_result = circuit_breaker.stats()
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert actual_result["requests"] == 1
+
+
+def test_circuit_breaker_open_fails_fast(circuit_breaker: CircuitBreaker) -> None:
+    """Test requests are rejected with a Retry-After while the circuit is open."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(4):
+            fail(circuit_breaker, DownstreamError())
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=101.5):
+        with (
+            pytest.raises(ServiceUnavailableError) as exc_info,
+            circuit_breaker.guard(),
+        ):
+            pytest.fail("Request should not be forwarded")
+        actual_result = circuit_breaker.stats()
+
+    # Assert
+    assert exc_info.value.headers == {"Retry-After": "4"}
+    assert actual_result == {
+        "state": "open",
+        "requests": 4,
+        "failures": 4,
+        "rejected": 1,
+    }
+
+
+def test_circuit_breaker_half_open_closes_after_probes(
+    circuit_breaker: CircuitBreaker,
+) -> None:
+    """Test the circuit closes once every half open probe succeeds."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(4):
+            fail(circuit_breaker, DownstreamError())
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=106):
+        succeed(circuit_breaker)
+        assert circuit_breaker.state is CircuitState.HALF_OPEN
+        succeed(circuit_breaker)
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert circuit_breaker.stats()["requests"] == 0
+
+
+def test_circuit_breaker_half_open_limits_probes(
+    circuit_breaker: CircuitBreaker,
+) -> None:
+    """Test only the configured number of probes are let through while half open."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(4):
+            fail(circuit_breaker, DownstreamError())
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=106),
+        circuit_breaker.guard(),
+        circuit_breaker.guard(),
+        pytest.raises(ServiceUnavailableError),
+        circuit_breaker.guard(),
+    ):
+        pytest.fail("Request should not be forwarded")
+
+
+def test_circuit_breaker_half_open_reopens_on_failure(
+    circuit_breaker: CircuitBreaker,
+) -> None:
+    """Test a failed half open probe opens the circuit again."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(4):
+            fail(circuit_breaker, DownstreamError())
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=106):
+        fail(circuit_breaker, DownstreamError())
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.OPEN
+
+
+def test_circuit_breaker_half_open_releases_cancelled_probe(
+    circuit_breaker: CircuitBreaker,
+) -> None:
+    """Test a cancelled half open probe lets another request probe the supplier."""
+    # Arrange
+    circuit_breaker.half_open_probes = 1
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(4):
+            fail(circuit_breaker, DownstreamError())
+
+    async def probe() -> None:
+        with circuit_breaker.guard():
+            await asyncio.sleep(10)
+
+    async def cancel_probe() -> None:
+        task = asyncio.create_task(probe())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=106):
+        asyncio.run(cancel_probe())
+        assert circuit_breaker.state is CircuitState.HALF_OPEN
+        succeed(circuit_breaker)
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.CLOSED
+
+
+def test_circuit_breaker_half_open_releases_probe_out_of_deadline(
+    circuit_breaker: CircuitBreaker,
+) -> None:
+    """Test a probe out of deadline before calling the supplier records nothing."""
+    # Arrange
+    circuit_breaker.half_open_probes = 1
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(4):
+            fail(circuit_breaker, DownstreamError())
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=106):
+        fail(circuit_breaker, GatewayTimeoutError(supplier_called=False))
+        assert circuit_breaker.state is CircuitState.HALF_OPEN
+        fail(circuit_breaker, GatewayTimeoutError())
+
+    # Assert
+    assert circuit_breaker.state is CircuitState.OPEN
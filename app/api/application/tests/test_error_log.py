@@ -0,0 +1,153 @@
+from logging import ERROR, WARNING
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+
+from app.api.application.error_log import ErrorLogLimiter, log_error
+from app.api.domain.exception import (
+    AccessDeniedError,
+    DownstreamError,
+    InternalServerError,
+)
+
+FILE_PATH = "app.api.application.error_log"
+
+
+def test_error_log_limiter_allows_burst() -> None:
+    """Test identical events beyond the burst are suppressed within a window."""
+    # Arrange
+    limiter = ErrorLogLimiter(burst=2, interval=60)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        actual_result = [limiter.allow(("route", "error")) for _ in range(4)]
+
+    # Assert
+    assert actual_result == [0, 0, None, None]
+
+
+def test_error_log_limiter_reports_suppressed() -> None:
+    """Test the first event of a new window reports the events suppressed."""
+    # Arrange
+    limiter = ErrorLogLimiter(burst=1, interval=60)
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        for _ in range(3):
+            limiter.allow(("route", "error"))
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=160):
+        actual_result = limiter.allow(("route", "error"))
+
+    # Assert
+    assert actual_result == 2
+
+
+def test_error_log_limiter_keys_are_independent() -> None:
+    """Test a flood of one event does not suppress a different event."""
+    # Arrange
+    limiter = ErrorLogLimiter(burst=1, interval=60)
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        limiter.allow(("route", "error"))
+
+        # Act
+        actual_result = limiter.allow(("route", "other error"))
+
+    # Assert
+    assert actual_result == 0
+
+
+@pytest.mark.parametrize(
+    ("error", "expected_level", "expected_status"),
+    [
+        (AccessDeniedError("Failed to verify token"), WARNING, 401),
+        (DownstreamError("Supplier failed"), ERROR, 502),
+    ],
+)
+@patch(f"{FILE_PATH}.LIMITER")
+def test_log_error_expected_error(
+    mock_limiter: MagicMock,
+    error: Exception,
+    expected_level: int,
+    expected_status: int,
+) -> None:
+    """Test expected errors are logged on a single line without a traceback."""
+    # Arrange
+    mock_limiter.allow.return_value = 3
+    logger = MagicMock()
+
+    # Act
+    log_error(logger, "POST /authenticate", error)
+
+    # Assert
+    logger.log.assert_called_once_with(
+        expected_level,
+        "Error in %s error=%s status=%d cause=%s detail=%r suppressed=%d",
+        "POST /authenticate",
+        type(error).__name__,
+        expected_status,
+        None,
+        str(error),
+        3,
+        exc_info=None,
+        extra={
+            "event": "request_error",
+            "route": "POST /authenticate",
+            "error": type(error).__name__,
+            "status": expected_status,
+            "suppressed": 3,
+        },
+    )
+    mock_limiter.allow.assert_called_once_with(
+        ("POST /authenticate", type(error).__name__)
+    )
+
+
+@pytest.mark.parametrize(
+    "error", [ValueError("Unexpected"), InternalServerError("Unexpected")]
+)
+@patch(f"{FILE_PATH}.LIMITER")
+def test_log_error_unexpected_error(mock_limiter: MagicMock, error: Exception) -> None:
+    """Test unexpected errors are logged with their traceback."""
+    # Arrange
+    mock_limiter.allow.return_value = 0
+    logger = MagicMock()
+
+    # Act
+    log_error(logger, "POST /authenticate", error)
+
+    # Assert
+    args, kwargs = logger.log.call_args
+    assert args[0] == ERROR
+    assert args[4] == 500
+    assert kwargs["exc_info"] is error
+
+
+@patch(f"{FILE_PATH}.LIMITER")
+def test_log_error_includes_cause(mock_limiter: MagicMock) -> None:
+    """Test the type of the error a supplier error was raised from is logged."""
+    # Arrange
+    mock_limiter.allow.return_value = 0
+    logger = MagicMock()
+    error = DownstreamError("Supplier failed")
+    error.__cause__ = RequestsConnectionError()
+
+    # Act
+    log_error(logger, "POST /authenticate", error)
+
+    # Assert
+    assert logger.log.call_args.args[5] == "ConnectionError"
+
+
+@patch(f"{FILE_PATH}.LIMITER")
+def test_log_error_suppressed(mock_limiter: MagicMock) -> None:
+    """Test a suppressed event is not logged."""
+    # Arrange
+    mock_limiter.allow.return_value = None
+    logger = MagicMock()
+
+    # Act
+    log_error(logger, "POST /authenticate", AccessDeniedError("Testing"))
+
+    # Assert
+    logger.log.assert_not_called()
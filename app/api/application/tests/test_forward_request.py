@@ -1,9 +1,23 @@
+import asyncio
+import json
+import signal
 from importlib import reload
-from unittest.mock import patch
+from pathlib import Path
+from threading import Event, Thread
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-from app.api.domain.exception import DownstreamError, ForbiddenError, InvalidValueError
+from app.api.domain.deadline import Deadline
+from app.api.domain.exception import (
+    DownstreamError,
+    ForbiddenError,
+    GatewayTimeoutError,
+    InvalidValueError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
 from app.api.domain.forward_request_model import ForwardRequest
 
 FILE_PATH = "app.api.application.forward_request"
@@ -30,6 +44,8 @@ def test_route_and_forward_emis() -> None:
             forward_request as forward_request_module,
         )
 
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_tpp_client.return_value.supplier = "TPP"
         mock_emis_client.return_value.transform_response.return_value = (
             "mocked transformed response"
         )
@@ -44,6 +60,10 @@ def test_route_and_forward_emis() -> None:
         mock_emis_client.return_value.forward_request.assert_called_once()
         mock_emis_client.return_value.transform_response.assert_called_once()
         mock_tpp_client.assert_not_called()
+        assert forward_request.timings.supplier == (
+            mock_emis_client.return_value.supplier
+        )
+        assert set(forward_request.timings.durations) == {"transform"}
 
 
 def test_route_and_forward_tpp() -> None:
@@ -67,6 +87,8 @@ def test_route_and_forward_tpp() -> None:
             forward_request as forward_request_module,
         )
 
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_tpp_client.return_value.supplier = "TPP"
         mock_tpp_client.return_value.transform_response.return_value = (
             "mocked transformed response"
         )
@@ -136,6 +158,7 @@ def test_route_and_forward_raises_api_error() -> None:
     ):
         from app.api.application import forward_request as forward_request_module
 
+        mock_emis_client.return_value.supplier = "EMIS"
         mock_emis_client.return_value.forward_request.side_effect = ForbiddenError(
             "Oops"
         )
@@ -167,6 +190,7 @@ def test_route_and_forward_raises_downstream_error() -> None:
     ):
         from app.api.application import forward_request as forward_request_module
 
+        mock_emis_client.return_value.supplier = "EMIS"
         mock_emis_client.return_value.forward_request.side_effect = Exception("Oops")
 
         reload(forward_request_module)
@@ -176,3 +200,820 @@ def test_route_and_forward_raises_downstream_error() -> None:
             DownstreamError, match="Error occurred with downstream service"
         ):
             forward_request_module.route_and_forward(forward_request)
+
+
+def test_route_and_forward_async_emis() -> None:
+    """Tests the route_and_forward_async function."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+        patch("app.api.infrastructure.tpp.client.TPPClient") as mock_tpp_client,
+    ):
+        from app.api.application import (
+            forward_request as forward_request_module,
+        )
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_tpp_client.return_value.supplier = "TPP"
+        mock_emis_client.return_value.forward_request_async = AsyncMock()
+        mock_emis_client.return_value.transform_response_async = AsyncMock(
+            return_value="mocked transformed response"
+        )
+
+        reload(forward_request_module)
+
+        # Act
+        actual_result = asyncio.run(
+            forward_request_module.route_and_forward_async(forward_request)
+        )
+
+        # Assert
+        assert actual_result == "mocked transformed response"
+        mock_emis_client.return_value.forward_request_async.assert_awaited_once()
+        mock_emis_client.return_value.transform_response_async.assert_awaited_once()
+        mock_tpp_client.assert_not_called()
+
+
+def test_route_and_forward_async_invalid_url() -> None:
+    """Tests the route_and_forward_async function with an unknown url."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://example.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+
+    with patch.dict(
+        "os.environ",
+        {"EMIS_BASE_URL": "https://emis.com", "TPP_BASE_URL": "https://tpp.com"},
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+
+        # Act & Assert
+        with pytest.raises(InvalidValueError, match="Invalid URL"):
+            asyncio.run(forward_request_module.route_and_forward_async(forward_request))
+
+
+def test_route_and_forward_async_raises_downstream_error() -> None:
+    """Tests the route_and_forward_async function raises downstream error."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request_async = AsyncMock(
+            side_effect=Exception("Oops")
+        )
+
+        reload(forward_request_module)
+
+        # Act & Assert
+        with pytest.raises(
+            DownstreamError, match="Error occurred with downstream service"
+        ):
+            asyncio.run(forward_request_module.route_and_forward_async(forward_request))
+
+
+def test_route_and_forward_async_deadline_exceeded() -> None:
+    """Tests a supplier still answering at the deadline is a gateway timeout."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+        deadline=Deadline.after(0.05),
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+
+        async def slow_supplier() -> None:
+            await asyncio.sleep(1)
+
+        mock_emis_client.return_value.forward_request_async = slow_supplier
+
+        reload(forward_request_module)
+
+        # Act & Assert
+        with pytest.raises(GatewayTimeoutError, match="deadline exceeded"):
+            asyncio.run(forward_request_module.route_and_forward_async(forward_request))
+        assert (
+            forward_request_module.CIRCUIT_BREAKERS["https://emis.com"].stats()[
+                "failures"
+            ]
+            == 1
+        )
+
+
+def test_route_and_forward_circuit_open() -> None:
+    """Tests the route_and_forward function fails fast when the circuit is open."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict(
+            "os.environ",
+            {
+                "EMIS_BASE_URL": "https://emis.com",
+                "CIRCUIT_BREAKER_MIN_REQUESTS": "2",
+            },
+        ),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import circuit_breaker as circuit_breaker_module
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request.side_effect = DownstreamError(
+            "Oops"
+        )
+
+        reload(circuit_breaker_module)
+        reload(forward_request_module)
+        for _ in range(2):
+            with pytest.raises(DownstreamError):
+                forward_request_module.route_and_forward(forward_request)
+
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableError, match="Circuit open"):
+            forward_request_module.route_and_forward(forward_request)
+        assert mock_emis_client.return_value.forward_request.call_count == 2
+        stats = forward_request_module.circuit_breaker_stats()
+        assert stats["https://emis.com"]["state"] == "open"
+
+    reload(circuit_breaker_module)
+
+
+def test_route_and_forward_use_mock_bypasses_circuit_breaker() -> None:
+    """Tests mocked requests are not counted by the circuit breaker."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=True,
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient"),
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+
+        # Act
+        forward_request_module.route_and_forward(forward_request)
+
+        # Assert
+        stats = forward_request_module.circuit_breaker_stats()
+        assert stats["https://emis.com"]["requests"] == 0
+
+
+def test_route_and_forward_use_mock_returns_mock_response() -> None:
+    """Tests mocked requests return the client's ready-made mocked response."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://tpp.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=True,
+    )
+    with (
+        patch.dict("os.environ", {"TPP_BASE_URL": "https://tpp.com"}),
+        patch("app.api.infrastructure.tpp.client.TPPClient") as mock_tpp_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+
+        # Act
+        actual_result = forward_request_module.route_and_forward(forward_request)
+        actual_async_result = asyncio.run(
+            forward_request_module.route_and_forward_async(forward_request)
+        )
+
+        # Assert
+        assert actual_result == mock_tpp_client.return_value.mock_response.return_value
+        assert actual_async_result == actual_result
+        mock_tpp_client.return_value.forward_request.assert_not_called()
+        mock_tpp_client.return_value.forward_request_async.assert_not_called()
+        mock_tpp_client.return_value.transform_response.assert_not_called()
+
+
+def test_route_and_forward_bulkhead_full() -> None:
+    """Tests bulkhead rejections are not counted by the circuit breaker."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict(
+            "os.environ",
+            {
+                "EMIS_BASE_URL": "https://emis.com",
+                "BULKHEAD_EMIS_MAX_CONCURRENT": "0",
+                "BULKHEAD_EMIS_MAX_QUEUE": "0",
+            },
+        ),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+
+        reload(forward_request_module)
+
+        # Act
+        with pytest.raises(ServiceUnavailableError, match="Too many concurrent"):
+            forward_request_module.route_and_forward(forward_request)
+
+        # Assert
+        mock_emis_client.return_value.forward_request.assert_not_called()
+        assert forward_request_module.bulkhead_stats()["EMIS"] == {
+            "supplier": "EMIS",
+            "maxConcurrent": 0,
+            "maxQueue": 0,
+            "active": 0,
+            "waiting": 0,
+            "rejected": 1,
+        }
+        stats = forward_request_module.circuit_breaker_stats()
+        assert stats["https://emis.com"]["requests"] == 0
+
+
+def test_route_and_forward_bulkhead_shared_by_supplier_base_urls(
+    tmp_path: Path,
+) -> None:
+    """Tests every base URL of a supplier shares the supplier's bulkhead."""
+    # Arrange
+    path = tmp_path / "routes.json"
+    path.write_text(json.dumps({"TPP": ["https://tpp.com", "https://dr.tpp.com"]}))
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://tpp.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    forwarding = Event()
+    release = Event()
+
+    def slow_supplier() -> dict:
+        forwarding.set()
+        release.wait(1)
+        return {}
+
+    with (
+        patch.dict(
+            "os.environ",
+            {
+                "ROUTING_TABLE_FILE": str(path),
+                "BULKHEAD_TPP_MAX_CONCURRENT": "1",
+                "BULKHEAD_TPP_MAX_QUEUE": "0",
+            },
+        ),
+        patch("app.api.infrastructure.tpp.client.TPPClient") as mock_tpp_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_tpp_client.return_value.supplier = "TPP"
+        mock_tpp_client.return_value.forward_request.side_effect = slow_supplier
+        reload(forward_request_module)
+        first = Thread(
+            target=forward_request_module.route_and_forward, args=(forward_request,)
+        )
+        first.start()
+        forwarding.wait(1)
+
+        # Act
+        with pytest.raises(ServiceUnavailableError, match="Too many concurrent"):
+            forward_request_module.route_and_forward(
+                forward_request.model_copy(update={"forward_to": "https://dr.tpp.com"})
+            )
+        release.set()
+        first.join()
+
+        # Assert
+        assert mock_tpp_client.return_value.forward_request.call_count == 1
+        assert list(forward_request_module.bulkhead_stats()) == ["TPP"]
+        assert forward_request_module.bulkhead_stats()["TPP"]["rejected"] == 1
+
+
+def test_route_and_forward_retries_connect_error() -> None:
+    """Tests connect errors are retried and counted once by the circuit breaker."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+        patch("app.api.application.retry.sleep") as mock_sleep,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request.side_effect = [
+            httpx.ConnectError("refused"),
+            "some response",
+        ]
+        mock_emis_client.return_value.transform_response.return_value = (
+            "mocked transformed response"
+        )
+
+        reload(forward_request_module)
+
+        # Act
+        actual_result = forward_request_module.route_and_forward(forward_request)
+
+        # Assert
+        assert actual_result == "mocked transformed response"
+        mock_sleep.assert_called_once()
+        mock_emis_client.return_value.transform_response.assert_called_once_with(
+            "some response"
+        )
+        assert forward_request_module.retry_stats()["https://emis.com"]["retries"] == 1
+        stats = forward_request_module.circuit_breaker_stats()
+        assert stats["https://emis.com"] == {
+            "state": "closed",
+            "requests": 1,
+            "failures": 0,
+            "rejected": 0,
+        }
+
+
+def test_route_and_forward_session_cache() -> None:
+    """Tests repeats of a login are answered from the cache without the supplier."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    other_request = forward_request.model_copy(
+        update={"proxy_nhs_number": "1234567890"}
+    )
+    with (
+        patch.dict(
+            "os.environ",
+            {"EMIS_BASE_URL": "https://emis.com", "SESSION_CACHE_EMIS_TTL": "5"},
+        ),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        transform_response = mock_emis_client.return_value.transform_response
+        transform_response.return_value.to_json.return_value = '{"sessionId": "1"}'
+
+        reload(forward_request_module)
+
+        # Act
+        actual_results = [
+            forward_request_module.route_and_forward(request)
+            for request in (forward_request, forward_request, other_request)
+        ]
+
+        # Assert
+        assert [result.to_json() for result in actual_results] == [
+            '{"sessionId": "1"}'
+        ] * 3
+        assert mock_emis_client.return_value.forward_request.call_count == 2
+        stats = forward_request_module.session_cache_stats()
+        assert (stats["size"], stats["hits"], stats["misses"]) == (2, 1, 2)
+
+
+def test_route_and_forward_async_session_cache() -> None:
+    """Tests asynchronous repeats of a login are answered from the cache."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://tpp.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict(
+            "os.environ",
+            {"TPP_BASE_URL": "https://tpp.com", "SESSION_CACHE_TTL": "5"},
+        ),
+        patch("app.api.infrastructure.tpp.client.TPPClient") as mock_tpp_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_tpp_client.return_value.supplier = "TPP"
+        mock_tpp_client.return_value.forward_request_async = AsyncMock()
+        mock_tpp_client.return_value.transform_response_async = AsyncMock(
+            return_value=MagicMock(to_json=MagicMock(return_value='{"sessionId": "1"}'))
+        )
+
+        reload(forward_request_module)
+
+        async def login_twice() -> list:
+            return [
+                await forward_request_module.route_and_forward_async(forward_request)
+                for _ in range(2)
+            ]
+
+        # Act
+        actual_results = asyncio.run(login_twice())
+
+        # Assert
+        assert actual_results[1].to_json() == '{"sessionId": "1"}'
+        mock_tpp_client.return_value.forward_request_async.assert_awaited_once()
+
+
+def test_route_and_forward_negative_cache() -> None:
+    """Tests a login the supplier turned away is answered locally when repeated."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict(
+            "os.environ",
+            {"EMIS_BASE_URL": "https://emis.com", "NEGATIVE_CACHE_NOT_FOUND_TTL": "10"},
+        ),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request.side_effect = NotFoundError(
+            "Patient not found"
+        )
+
+        reload(forward_request_module)
+
+        # Act & Assert
+        for _ in range(2):
+            with pytest.raises(NotFoundError, match="Patient not found"):
+                forward_request_module.route_and_forward(forward_request)
+        mock_emis_client.return_value.forward_request.assert_called_once()
+        assert forward_request_module.negative_cache_stats()["hits"] == 1
+
+
+def test_route_and_forward_negative_cache_off_by_default() -> None:
+    """Tests a login the supplier turned away is retried unless a TTL is set."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request.side_effect = NotFoundError(
+            "Patient not found"
+        )
+
+        reload(forward_request_module)
+
+        # Act & Assert
+        for _ in range(2):
+            with pytest.raises(NotFoundError, match="Patient not found"):
+                forward_request_module.route_and_forward(forward_request)
+        assert mock_emis_client.return_value.forward_request.call_count == 2
+        assert not forward_request_module.NEGATIVE_CACHE.enabled
+
+
+def test_route_and_forward_idempotent_retry() -> None:
+    """Tests a retry with the same request ID is answered without the supplier."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+        request_id="some request id",
+    )
+    other_login = forward_request.model_copy(update={"proxy_nhs_number": "1234567890"})
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        transform_response = mock_emis_client.return_value.transform_response
+        transform_response.return_value.to_json.return_value = '{"sessionId": "1"}'
+
+        reload(forward_request_module)
+
+        # Act
+        actual_results = [
+            forward_request_module.route_and_forward(request)
+            for request in (forward_request, forward_request, other_login)
+        ]
+
+        # Assert
+        assert actual_results[1].to_json() == '{"sessionId": "1"}'
+        assert mock_emis_client.return_value.forward_request.call_count == 2
+        stats = forward_request_module.idempotency_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_route_and_forward_idempotent_retry_after_downstream_error() -> None:
+    """Tests a retry after a supplier error is forwarded to the supplier again."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+        request_id="some request id",
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request.side_effect = [
+            DownstreamError("Oops"),
+            {},
+        ]
+        transform_response = mock_emis_client.return_value.transform_response
+        transform_response.return_value.to_json.return_value = '{"sessionId": "1"}'
+        reload(forward_request_module)
+        with pytest.raises(DownstreamError):
+            forward_request_module.route_and_forward(
+                forward_request.model_copy(deep=True)
+            )
+
+        # Act
+        actual_result = forward_request_module.route_and_forward(
+            forward_request.model_copy(deep=True)
+        )
+
+        # Assert
+        assert actual_result.to_json() == '{"sessionId": "1"}'
+        assert mock_emis_client.return_value.forward_request.call_count == 2
+
+
+def test_route_and_forward_idempotent_retry_outlives_lock_timeout() -> None:
+    """Tests a retry waits for a first attempt slower than the cache lock timeout."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+        request_id="some request id",
+    )
+    forwarding = Event()
+
+    def slow_supplier() -> dict:
+        forwarding.set()
+        Event().wait(0.2)
+        return {}
+
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+        mock_emis_client.return_value.forward_request.side_effect = slow_supplier
+        transform_response = mock_emis_client.return_value.transform_response
+        transform_response.return_value.to_json.return_value = '{"sessionId": "1"}'
+
+        reload(forward_request_module)
+        results = []
+
+        def attempt() -> None:
+            results.append(
+                forward_request_module.route_and_forward(
+                    forward_request.model_copy(deep=True)
+                ).to_json()
+            )
+
+        first = Thread(target=attempt)
+        first.start()
+        forwarding.wait(1)
+
+        # Act
+        with patch(f"{FILE_PATH}.CACHE_LOCK_TIMEOUT", 0.05):
+            attempt()
+        first.join()
+
+        # Assert
+        assert results == ['{"sessionId": "1"}'] * 2
+        assert mock_emis_client.return_value.forward_request.call_count == 1
+
+
+def test_route_and_forward_normalises_forward_to() -> None:
+    """Tests an equivalent spelling of a base URL is routed to the base URL."""
+    # Arrange
+    forward_request = ForwardRequest(
+        application_id="some application",
+        forward_to="HTTPS://EMIS.com:443/",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch("app.api.infrastructure.emis.client.EmisClient") as mock_emis_client,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        mock_emis_client.return_value.supplier = "EMIS"
+
+        reload(forward_request_module)
+
+        # Act
+        forward_request_module.route_and_forward(forward_request)
+
+        # Assert
+        mock_emis_client.assert_called_once_with(forward_request)
+        assert forward_request.forward_to == "https://emis.com"
+        stats = forward_request_module.circuit_breaker_stats()
+        assert stats["https://emis.com"]["requests"] == 1
+
+
+def test_reload_routing_table(tmp_path: Path) -> None:
+    """Tests the routing table is replaced and resilience state is kept."""
+    # Arrange
+    path = tmp_path / "routes.json"
+    path.write_text(json.dumps({"TPP": ["https://tpp.com"]}))
+    with (
+        patch.dict("os.environ", {"ROUTING_TABLE_FILE": str(path)}),
+        patch("app.api.infrastructure.tpp.client.TPPClient"),
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+        circuit_breaker = forward_request_module.CIRCUIT_BREAKERS["https://tpp.com"]
+        path.write_text(json.dumps({"TPP": ["https://tpp.com", "https://dr.tpp.com"]}))
+
+        # Act
+        reloaded = forward_request_module.reload_routing_table()
+        path.write_text(json.dumps({"OTHER": ["https://other.com"]}))
+        failed_reload = forward_request_module.reload_routing_table()
+
+        # Assert
+        assert (reloaded, failed_reload) == (True, False)
+        assert forward_request_module.routing_stats() == {
+            "source": str(path),
+            "suppliers": {"TPP": ["https://tpp.com", "https://dr.tpp.com"]},
+            "reloads": 1,
+            "failures": 1,
+        }
+        assert forward_request_module.CIRCUIT_BREAKERS["https://tpp.com"] is (
+            circuit_breaker
+        )
+        assert list(forward_request_module.BULKHEADS) == ["TPP"]
+
+
+def test_install_routing_reload_handler() -> None:
+    """Tests SIGHUP reloads the routing table on a background thread."""
+    # Arrange
+    with (
+        patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}),
+        patch(f"{FILE_PATH}.signal.signal") as mock_signal,
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+        forward_request_module.install_routing_reload_handler()
+        handler = mock_signal.call_args.args[1]
+
+        with patch(f"{FILE_PATH}.Thread") as mock_thread:
+            # Act
+            handler(signal.SIGHUP, None)
+
+    # Assert
+    assert mock_signal.call_args.args[0] == signal.SIGHUP
+    mock_thread.assert_called_once_with(
+        target=forward_request_module.reload_routing_table,
+        name="reload-routing-table",
+        daemon=True,
+    )
+    mock_thread.return_value.start.assert_called_once_with()
+
+
+def test_prewarm_suppliers() -> None:
+    """Tests an unreachable supplier does not stop other suppliers being prewarmed."""
+    # Arrange
+    with patch.dict(
+        "os.environ",
+        {"EMIS_BASE_URL": "https://emis.com", "TPP_BASE_URL": "https://tpp.com"},
+    ):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+
+        with patch(
+            f"{FILE_PATH}.prewarm", side_effect=[ConnectionError("Oops"), 2]
+        ) as mock_prewarm:
+            # Act
+            forward_request_module.prewarm_suppliers()
+
+    # Assert
+    assert [call.args[0] for call in mock_prewarm.call_args_list] == [
+        "https://emis.com",
+        "https://tpp.com",
+    ]
+
+
+def test_keep_suppliers_warm() -> None:
+    """Tests suppliers are prewarmed again every interval until stopped."""
+    # Arrange
+    with patch.dict("os.environ", {"EMIS_BASE_URL": "https://emis.com"}):
+        from app.api.application import forward_request as forward_request_module
+
+        reload(forward_request_module)
+    stop = MagicMock()
+    stop.wait.side_effect = [False, False, True]
+
+    with patch(
+        f"{FILE_PATH}.prewarm", side_effect=[2, ConnectionError("Oops"), 2]
+    ) as mock_prewarm:
+        # Act
+        forward_request_module.keep_suppliers_warm(stop)
+
+    # Assert
+    assert mock_prewarm.call_count == 3
+    stop.wait.assert_called_with(forward_request_module.PREWARM_INTERVAL)
@@ -0,0 +1,125 @@
+import asyncio
+from threading import Event, Thread
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.api.application.idempotency import IdempotencyCache
+from app.api.domain.exception import (
+    GatewayTimeoutError,
+    NotFoundError,
+)
+from app.api.infrastructure.cache.memory import MemoryBackend
+
+
+@pytest.fixture(name="cache")
+def setup_cache() -> IdempotencyCache:
+    return IdempotencyCache(5, (NotFoundError,), MemoryBackend())
+
+
+def test_idempotency_cache_replays_response(cache: IdempotencyCache) -> None:
+    """Test a retry is answered with the response to the first attempt."""
+    # Arrange
+    compute = MagicMock(return_value='{"sessionId": "1"}')
+    key = cache.key("request id", "1234567890")
+
+    # Act
+    actual_result = [cache.replay(key, compute, 1) for _ in range(2)]
+
+    # Assert
+    assert actual_result == ['{"sessionId": "1"}'] * 2
+    compute.assert_called_once()
+
+
+def test_idempotency_cache_replays_error(cache: IdempotencyCache) -> None:
+    """Test a retry is answered with a copy of the error the first attempt raised."""
+    # Arrange
+    error = NotFoundError("Patient not found")
+    compute = MagicMock(side_effect=error)
+    key = cache.key("request id", "1234567890")
+
+    # Act
+    with pytest.raises(NotFoundError) as first:
+        cache.replay(key, compute, 1)
+    with pytest.raises(NotFoundError, match="Patient not found") as retry:
+        cache.replay(key, compute, 1)
+
+    # Assert
+    assert first.value is error
+    assert retry.value is not error
+    compute.assert_called_once()
+
+
+def test_idempotency_cache_forwards_again_after_transient_error(
+    cache: IdempotencyCache,
+) -> None:
+    """Test a retry after an error that is not cached is forwarded again."""
+    # Arrange
+    compute = MagicMock(side_effect=[GatewayTimeoutError("Testing"), "response"])
+    key = cache.key("request id", "1234567890")
+
+    # Act
+    with pytest.raises(GatewayTimeoutError):
+        cache.replay(key, compute, 1)
+    actual_result = cache.replay(key, compute, 1)
+
+    # Assert
+    assert actual_result == "response"
+    assert compute.call_count == 2
+
+
+def test_idempotency_cache_coalesces_attempts_in_flight(
+    cache: IdempotencyCache,
+) -> None:
+    """Test a retry made while the first attempt is in flight waits for it."""
+    # Arrange
+    forwarding = Event()
+    release = Event()
+    key = cache.key("request id", "1234567890")
+
+    def compute() -> str:
+        forwarding.set()
+        release.wait(1)
+        return "response"
+
+    results = []
+    first = Thread(target=lambda: results.append(cache.replay(key, compute, 1)))
+    first.start()
+    forwarding.wait(1)
+    retry_compute = MagicMock(return_value="second response")
+
+    # Act
+    retry = Thread(target=lambda: results.append(cache.replay(key, retry_compute, 1)))
+    retry.start()
+    release.set()
+    first.join()
+    retry.join()
+
+    # Assert
+    assert results == ["response", "response"]
+    retry_compute.assert_not_called()
+    assert cache.stats()["coalesced"] == 1
+
+
+def test_idempotency_cache_replay_async(cache: IdempotencyCache) -> None:
+    """Test concurrent asynchronous attempts are answered by a single call."""
+    # Arrange
+    key = cache.key("request id", "1234567890")
+    calls = []
+
+    async def compute() -> str:
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def attempt_twice() -> list:
+        return await asyncio.gather(
+            cache.replay_async(key, compute, 1), cache.replay_async(key, compute, 1)
+        )
+
+    # Act
+    actual_result = asyncio.run(attempt_twice())
+
+    # Assert
+    assert actual_result == ["response", "response"]
+    assert len(calls) == 1
@@ -1,9 +1,84 @@
+from collections.abc import Iterator
+from importlib import reload
+from json import dumps
+from pathlib import Path
+from time import time
+from types import ModuleType
+from unittest.mock import MagicMock, patch
+
 import pytest
-from jwt import encode
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import decode, encode
+from jwt.algorithms import RSAAlgorithm
 
-from app.api.application.jwt import get_nhs_number_from_jwt_token
+from app.api.application import jwt as jwt_module
+from app.api.application.jwt import get_nhs_number_from_jwt_token, jwt_cache_stats
+from app.api.application.jwt_claims import extract_claims
 from app.api.domain.exception import AccessDeniedError
 
+FILE_PATH = "app.api.application.jwt"
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache() -> None:
+    jwt_module.TOKEN_CACHE.clear()
+    yield
+    jwt_module.TOKEN_CACHE.clear()
+
+
+@pytest.fixture(name="private_key", scope="module")
+def setup_private_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(name="verifying_jwt_module")
+def setup_verifying_jwt_module(
+    tmp_path: Path, private_key: rsa.RSAPrivateKey
+) -> Iterator[ModuleType]:
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwks_file = tmp_path / "jwks.json"
+    jwks_file.write_text(dumps({"keys": [{**jwk, "kid": "some key"}]}))
+    with (
+        patch.dict(
+            "os.environ",
+            {"JWT_VERIFY_SIGNATURE": "true", "JWKS_FILE": str(jwks_file)},
+        ),
+        patch("app.api.infrastructure.jwks.key_store.Thread"),
+    ):
+        module = reload(jwt_module)
+        # Loaded by the background thread as each worker starts
+        module.KEY_STORE.refresh()
+        yield module
+    reload(jwt_module)
+
+
+def _token(
+    *,
+    exp: float | None = None,
+    proxy_exp: float | None = None,
+    vot: str = "P9.Cp.Cd",
+    key: rsa.RSAPrivateKey | None = None,
+    kid: str = "some key",
+) -> str:
+    algorithm = "RS512" if key else "none"
+    headers = {"kid": kid}
+    proxy_claims = {
+        "identity_proofing_level": "P9",
+        "vot": vot,
+        "nhs_number": "proxy nhs number",
+    }
+    if proxy_exp is not None:
+        proxy_claims["exp"] = proxy_exp
+    claims = {
+        "nhs_number": "patient nhs number",
+        "act": {
+            "sub": encode(proxy_claims, key=key, algorithm=algorithm, headers=headers)
+        },
+    }
+    if exp is not None:
+        claims["exp"] = exp
+    return encode(claims, key=key, algorithm=algorithm, headers=headers)
+
 
 @pytest.mark.parametrize("vot_level", ["P9.Cp.Cd", "P9.Cp.Ck", "P9.Cm"])
 def test_get_nhs_number_from_jwt_token(vot_level: str) -> None:
@@ -133,3 +208,129 @@ def test_get_nhs_number_from_jwt_token_invalid_proxy_vot_level(vot_level: str) -
         match="Logged in user has incorrect vot level",
     ):
         get_nhs_number_from_jwt_token(token)
+
+
+@patch(f"{FILE_PATH}.extract_claims", side_effect=extract_claims)
+def test_get_nhs_number_from_jwt_token_cached(mock_extract_claims: MagicMock) -> None:
+    """Test a reused token is only decoded once."""
+    # Arrange
+    token = _token(exp=time() + 60)
+    stats = jwt_cache_stats()
+
+    # Act
+    actual_result = [get_nhs_number_from_jwt_token(token) for _ in range(3)]
+
+    # Assert
+    assert actual_result == [("patient nhs number", "proxy nhs number")] * 3
+    assert mock_extract_claims.call_count == 2
+    assert jwt_cache_stats()["hits"] == stats["hits"] + 2
+    assert jwt_cache_stats()["misses"] == stats["misses"] + 1
+
+
+@pytest.mark.parametrize(
+    ("exp", "proxy_exp"), [(100, None), (None, 100), (300, 100), (100, 300)]
+)
+@patch(f"{FILE_PATH}.extract_claims", side_effect=extract_claims)
+def test_get_nhs_number_from_jwt_token_cache_evicted_at_exp(
+    mock_extract_claims: MagicMock, exp: float | None, proxy_exp: float | None
+) -> None:
+    """Test a cached token is decoded again once either token expires."""
+    # Arrange
+    token = _token(exp=exp, proxy_exp=proxy_exp)
+    with patch("app.api.application.token_cache.time", return_value=50):
+        get_nhs_number_from_jwt_token(token)
+
+    # Act
+    with patch("app.api.application.token_cache.time", return_value=100):
+        get_nhs_number_from_jwt_token(token)
+
+    # Assert
+    assert mock_extract_claims.call_count == 4
+
+
+def test_get_nhs_number_from_jwt_token_errors_not_cached() -> None:
+    """Test a token that fails the claim checks is checked again on reuse."""
+    # Arrange
+    token = _token(vot="P5.Cp.Cd")
+
+    # Act & Assert
+    for _ in range(2):
+        with pytest.raises(AccessDeniedError, match="incorrect vot level"):
+            get_nhs_number_from_jwt_token(token)
+    assert jwt_cache_stats()["size"] == 0
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a token",
+        "e30.bm90IGpzb24.",
+        encode({"nhs_number": "patient nhs number"}, key=None, algorithm="none"),
+    ],
+)
+def test_get_nhs_number_from_jwt_token_malformed(token: str) -> None:
+    """Test a malformed token or proxy token is denied rather than failing."""
+    # Act & Assert
+    with pytest.raises(AccessDeniedError, match="Failed to decode token"):
+        get_nhs_number_from_jwt_token(token)
+    assert jwt_cache_stats()["size"] == 0
+
+
+@patch(f"{FILE_PATH}.decode", side_effect=decode)
+def test_get_nhs_number_from_jwt_token_verified(
+    mock_decode: MagicMock,
+    verifying_jwt_module: ModuleType,
+    private_key: rsa.RSAPrivateKey,
+) -> None:
+    """Test signed tokens are verified once and then memoised until they expire."""
+    # Arrange
+    token = _token(exp=time() + 60, key=private_key)
+
+    # Act
+    actual_result = [
+        verifying_jwt_module.get_nhs_number_from_jwt_token(token) for _ in range(2)
+    ]
+
+    # Assert
+    assert actual_result == [("patient nhs number", "proxy nhs number")] * 2
+    assert mock_decode.call_count == 2
+    assert mock_decode.call_args.kwargs["key"] is not None
+    assert verifying_jwt_module.jwks_stats()["keyIds"] == ["some key"]
+
+
+@pytest.mark.parametrize(
+    ("signing_key", "token_options"),
+    [
+        ("other", {}),
+        ("same", {"kid": "unknown key"}),
+        ("same", {"exp": 0}),
+        (None, {}),
+    ],
+)
+def test_get_nhs_number_from_jwt_token_verification_failed(
+    verifying_jwt_module: ModuleType,
+    private_key: rsa.RSAPrivateKey,
+    signing_key: str | None,
+    token_options: dict,
+) -> None:
+    """Test tokens that are unsigned, expired or signed by another key are rejected."""
+    # Arrange
+    key = private_key if signing_key == "same" else None
+    if signing_key == "other":
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    token = _token(key=key, **token_options)
+
+    # Act & Assert
+    with pytest.raises(AccessDeniedError, match="Failed to verify token"):
+        verifying_jwt_module.get_nhs_number_from_jwt_token(token)
+
+
+def test_verify_signature_requires_key_set() -> None:
+    """Test verifying signatures without a key set source is a configuration error."""
+    # Act & Assert
+    with (
+        patch.dict("os.environ", {"JWT_VERIFY_SIGNATURE": "true"}),
+        pytest.raises(ValueError, match="JWKS_URL or JWKS_FILE"),
+    ):
+        reload(jwt_module)
+    reload(jwt_module)
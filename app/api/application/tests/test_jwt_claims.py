@@ -0,0 +1,68 @@
+import pytest
+from jwt import DecodeError, decode, encode
+
+from app.api.application.jwt_claims import extract_claims
+
+# The proxy and composite token claims used by test_jwt.py
+PROXY_CLAIMS = [
+    *(
+        {"identity_proofing_level": "P9", "vot": vot, "nhs_number": "proxy nhs number"}
+        for vot in ("P9.Cp.Cd", "P9.Cp.Ck", "P9.Cm", "P5.Cp.Cd", "", None)
+    ),
+    *(
+        {"identity_proofing_level": level, "vot": "P9.Cp.Cd", "nhs_number": "proxy"}
+        for level in ("P5", "P0", "something random", "", None)
+    ),
+    {"identity_proofing_level": "P9", "vot": "P9.Cp.Cd"},
+    {"identity_proofing_level": "P9", "vot": "P9.Cm", "exp": 1893456000.5},
+    {"nhs_number": 'Zoë ☃ \u2028 "quoted"'},
+]
+
+
+def _composite_token(proxy_claims: dict, **claims: object) -> str:
+    proxy_token = encode(proxy_claims, key=None, algorithm="none")
+    return encode({**claims, "act": {"sub": proxy_token}}, key=None, algorithm="none")
+
+
+@pytest.mark.parametrize("proxy_claims", PROXY_CLAIMS)
+@pytest.mark.parametrize(
+    "claims", [{"nhs_number": "patient nhs number"}, {}, {"exp": 1893456000}]
+)
+def test_extract_claims_matches_decode(proxy_claims: dict, claims: dict) -> None:
+    """Test the claims extracted from both tokens match decoding them with PyJWT."""
+    # Arrange
+    token = _composite_token(proxy_claims, **claims)
+    expected_result = decode(
+        token, algorithms=["RS512"], options={"verify_signature": False}
+    )
+
+    # Act
+    actual_result = extract_claims(token)
+
+    # Assert
+    assert actual_result == expected_result
+    proxy_token = actual_result["act"]["sub"]
+    assert extract_claims(proxy_token) == decode(
+        proxy_token, algorithms=["RS512"], options={"verify_signature": False}
+    )
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        None,
+        "",
+        "header.payload",
+        "e30.e30.e30.e30",
+        "e30.bm90IGpzb24.",  # not json
+        "e30.W10.",  # json but not an object
+        "e30.e30é.",
+    ],
+)
+def test_extract_claims_invalid_token(token: str | None) -> None:
+    """Test malformed tokens raise the same error as decoding them with PyJWT."""
+    # Act & Assert
+    with pytest.raises(DecodeError):
+        decode(token, algorithms=["RS512"], options={"verify_signature": False})
+    with pytest.raises(DecodeError):
+        extract_claims(token)
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.api.application.negative_cache import NegativeCache
+from app.api.domain.exception import DownstreamError, ForbiddenError, NotFoundError
+from app.api.infrastructure.cache.memory import MemoryBackend
+
+
+def test_negative_cache_hit() -> None:
+    """Test the error a login was answered with is returned."""
+    # Arrange
+    cache = NegativeCache({NotFoundError: 10, ForbiddenError: 5}, MemoryBackend())
+    key = cache.key("1234567890", "0987654321", "A12345")
+    cache.put_error(key, ForbiddenError("User not registered"))
+
+    # Act
+    actual_result = cache.get_error(key)
+
+    # Assert
+    assert isinstance(actual_result, ForbiddenError)
+    assert str(actual_result) == "User not registered"
+    assert key.startswith("im1-pfs-auth:1:negative:")
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 0)
+
+
+def test_negative_cache_hit_async() -> None:
+    """Test the error a login was answered with is returned without blocking."""
+    # Arrange
+    backend = MemoryBackend()
+    backend.blocking = True
+    cache = NegativeCache({NotFoundError: 10}, backend)
+    key = cache.key("1234567890", "0987654321", "A12345")
+    asyncio.run(cache.put_error_async(key, NotFoundError("Patient not found")))
+
+    # Act
+    actual_result = asyncio.run(cache.get_error_async(key))
+
+    # Assert
+    assert isinstance(actual_result, NotFoundError)
+    assert str(actual_result) == "Patient not found"
+
+
+@pytest.mark.parametrize(
+    ("ttls", "error"),
+    [
+        ({NotFoundError: 10}, DownstreamError("Testing")),
+        ({NotFoundError: 0}, NotFoundError("Testing")),
+    ],
+)
+def test_negative_cache_only_caches_errors_with_ttl(
+    ttls: dict, error: Exception
+) -> None:
+    """Test only errors with a TTL above zero are cached."""
+    # Arrange
+    cache = NegativeCache(ttls, MemoryBackend())
+    key = cache.key("some login")
+
+    # Act
+    cache.put_error(key, error)
+
+    # Assert
+    assert cache.get_error(key) is None
+
+
+@pytest.mark.parametrize(
+    ("ttls", "expected_enabled"),
+    [
+        ({NotFoundError: 10, ForbiddenError: 0}, True),
+        ({NotFoundError: 0, ForbiddenError: 0}, False),
+    ],
+)
+def test_negative_cache_enabled(ttls: dict, *, expected_enabled: bool) -> None:
+    """Test the cache is only enabled when an error can be cached."""
+    # Act
+    actual_result = NegativeCache(ttls, MemoryBackend()).enabled
+
+    # Assert
+    assert actual_result is expected_enabled
@@ -0,0 +1,185 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.api.application.retry import RetryPolicy
+from app.api.domain.deadline import Deadline
+from app.api.domain.exception import DownstreamError, DownstreamUnavailableError
+
+FILE_PATH = "app.api.application.retry"
+
+
+@pytest.fixture(name="retry_policy")
+def setup_retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        "https://emis.com",
+        max_attempts=3,
+        base_delay=0.1,
+        max_delay=1,
+        budget_ratio=0.5,
+        budget_capacity=2,
+    )
+
+
+@pytest.fixture(name="deadline")
+def setup_deadline() -> Deadline:
+    return Deadline.after(10)
+
+
+@patch(f"{FILE_PATH}.sleep")
+@patch(f"{FILE_PATH}.uniform", side_effect=lambda _low, high: high)
+def test_retry_policy_retries_connect_errors(
+    _mock_uniform: MagicMock,
+    mock_sleep: MagicMock,
+    retry_policy: RetryPolicy,
+    deadline: Deadline,
+) -> None:
+    """Test connect errors are retried with exponential backoff."""
+    # Arrange
+    forward = MagicMock(
+        side_effect=[httpx.ConnectError("refused"), httpx.ConnectError("refused"), 1]
+    )
+
+    # Act
+    actual_result = retry_policy.call(forward, deadline)
+
+    # Assert
+    assert actual_result == 1
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.1, 0.2]
+    assert retry_policy.stats() == {
+        "retries": 2,
+        "budgetExhausted": 0,
+        "budgetTokens": 0,
+    }
+
+
+@patch(f"{FILE_PATH}.sleep")
+@patch(f"{FILE_PATH}.uniform", return_value=0.05)
+def test_retry_policy_retries_retry_after(
+    _mock_uniform: MagicMock,
+    mock_sleep: MagicMock,
+    retry_policy: RetryPolicy,
+    deadline: Deadline,
+) -> None:
+    """Test a 503 with Retry-After is retried after the requested delay."""
+    # Arrange
+    forward = MagicMock(
+        side_effect=[DownstreamUnavailableError("Unavailable", retry_after=2), 1]
+    )
+
+    # Act
+    actual_result = retry_policy.call(forward, deadline)
+
+    # Assert
+    assert actual_result == 1
+    mock_sleep.assert_called_once_with(2.05)
+
+
+@pytest.mark.parametrize(
+    "exception",
+    [DownstreamError("Oops"), httpx.ReadTimeout("timed out"), ValueError("Oops")],
+)
+@patch(f"{FILE_PATH}.sleep")
+def test_retry_policy_does_not_retry_unsafe_errors(
+    mock_sleep: MagicMock,
+    exception: Exception,
+    retry_policy: RetryPolicy,
+    deadline: Deadline,
+) -> None:
+    """Test errors after the request may have reached the supplier are not retried."""
+    # Arrange
+    forward = MagicMock(side_effect=exception)
+
+    # Act & Assert
+    with pytest.raises(type(exception)):
+        retry_policy.call(forward, deadline)
+    forward.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+@patch(f"{FILE_PATH}.sleep")
+def test_retry_policy_stops_at_max_attempts(
+    mock_sleep: MagicMock, retry_policy: RetryPolicy, deadline: Deadline
+) -> None:
+    """Test no more than the maximum number of attempts are made."""
+    # Arrange
+    retry_policy.budget_capacity = 10
+    forward = MagicMock(side_effect=httpx.ConnectError("refused"))
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.record_retry") as mock_record_retry,
+        pytest.raises(httpx.ConnectError),
+    ):
+        retry_policy.call(forward, deadline)
+    assert forward.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert [call.args for call in mock_record_retry.call_args_list] == [
+        ("https://emis.com", "retried"),
+        ("https://emis.com", "retried"),
+        ("https://emis.com", "max_attempts"),
+    ]
+
+
+@patch(f"{FILE_PATH}.sleep")
+def test_retry_policy_budget_exhausted(
+    _mock_sleep: MagicMock, retry_policy: RetryPolicy, deadline: Deadline
+) -> None:
+    """Test retries stop once the retry budget is spent."""
+    # Arrange
+    forward = MagicMock(side_effect=httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        retry_policy.call(forward, deadline)
+    forward.reset_mock()
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.record_retry") as mock_record_retry,
+        pytest.raises(httpx.ConnectError),
+    ):
+        retry_policy.call(forward, deadline)
+    assert forward.call_count == 1
+    mock_record_retry.assert_called_once_with("https://emis.com", "budget")
+    assert retry_policy.stats() == {
+        "retries": 2,
+        "budgetExhausted": 1,
+        "budgetTokens": 0.5,
+    }
+
+
+@patch(f"{FILE_PATH}.sleep")
+def test_retry_policy_does_not_retry_past_deadline(
+    mock_sleep: MagicMock, retry_policy: RetryPolicy
+) -> None:
+    """Test no retry is made when the delay would pass the deadline."""
+    # Arrange
+    forward = MagicMock(
+        side_effect=DownstreamUnavailableError("Unavailable", retry_after=30)
+    )
+
+    # Act & Assert
+    with pytest.raises(DownstreamUnavailableError):
+        retry_policy.call(forward, Deadline.after(10))
+    forward.assert_called_once()
+    mock_sleep.assert_not_called()
+    assert retry_policy.stats()["retries"] == 0
+
+
+@patch(f"{FILE_PATH}.async_sleep", new_callable=AsyncMock)
+def test_retry_policy_call_async(
+    mock_async_sleep: AsyncMock, retry_policy: RetryPolicy, deadline: Deadline
+) -> None:
+    """Test connect errors are retried without blocking the event loop."""
+    # Arrange
+    forward = AsyncMock(side_effect=[httpx.ConnectTimeout("timed out"), 1])
+
+    # Act
+    actual_result = asyncio.run(retry_policy.call_async(forward, deadline))
+
+    # Assert
+    assert actual_result == 1
+    assert forward.await_count == 2
+    mock_async_sleep.assert_awaited_once()
+    assert retry_policy.stats()["retries"] == 1
@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.api.application.routing import RoutingTable, normalise_url
+
+
+@pytest.mark.parametrize(
+    ("url", "expected_result"),
+    [
+        ("https://emis.com", "https://emis.com"),
+        ("HTTPS://EMIS.com/", "https://emis.com"),
+        ("https://emis.com:443//", "https://emis.com"),
+        (" https://emis.com/api//v1/./ ", "https://emis.com/api/v1"),
+        ("https://emis.com:8443/Api/", "https://emis.com:8443/Api"),
+        ("https://emis.com/a/../b?x=1", "https://emis.com/b?x=1"),
+    ],
+)
+def test_normalise_url(url: str, expected_result: str) -> None:
+    """Test equivalent spellings of a URL are normalised to the same URL."""
+    # Act
+    actual_result = normalise_url(url)
+
+    # Assert
+    assert actual_result == expected_result
+
+
+def test_routing_table_resolve() -> None:
+    """Test forwarding URLs resolve to the base URL of the supplier they match."""
+    # Arrange
+    routing_table = RoutingTable(
+        {
+            "EMIS": ["https://emis.com/", "https://dr.emis.com"],
+            "TPP": ["https://tpp.com"],
+        },
+        "test",
+    )
+
+    # Act
+    actual_result = [
+        routing_table.resolve(url)
+        for url in ("https://EMIS.com", "https://dr.emis.com:443/", "https://tpp.com")
+    ]
+
+    # Assert
+    assert [(route.supplier, route.base_url) for route in actual_result] == [
+        ("EMIS", "https://emis.com/"),
+        ("EMIS", "https://dr.emis.com"),
+        ("TPP", "https://tpp.com"),
+    ]
+    assert routing_table.base_urls() == [
+        "https://emis.com/",
+        "https://dr.emis.com",
+        "https://tpp.com",
+    ]
+
+
+@pytest.mark.parametrize(
+    "url", ["https://emis.com/other", "https://evil.com", "https://emis.com:bad"]
+)
+def test_routing_table_resolve_unknown(url: str) -> None:
+    """Test a URL that is not a supplier base URL is not resolved."""
+    # Arrange
+    routing_table = RoutingTable({"EMIS": ["https://emis.com"]}, "test")
+
+    # Act & Assert
+    with pytest.raises(KeyError):
+        routing_table.resolve(url)
+
+
+@pytest.mark.parametrize(
+    ("suppliers", "expected_message"),
+    [
+        ({"EMIS": ["http://emis.com"]}, "must use https"),
+        (
+            {"EMIS": ["https://emis.com"], "TPP": ["https://EMIS.com/"]},
+            "more than once",
+        ),
+    ],
+)
+def test_routing_table_invalid(suppliers: dict, expected_message: str) -> None:
+    """Test a table with a base URL that is not HTTPS or is duplicated is rejected."""
+    # Act & Assert
+    with pytest.raises(ValueError, match=expected_message):
+        RoutingTable(suppliers, "test")
+
+
+def test_routing_table_from_file(tmp_path: Path) -> None:
+    """Test a table is loaded from a JSON file of base URLs keyed by supplier."""
+    # Arrange
+    path = tmp_path / "routes.json"
+    path.write_text(json.dumps({"TPP": ["https://tpp.com", "https://dr.tpp.com"]}))
+
+    # Act
+    actual_result = RoutingTable.from_file(str(path))
+
+    # Assert
+    assert actual_result.stats() == {
+        "source": str(path),
+        "suppliers": {"TPP": ["https://tpp.com", "https://dr.tpp.com"]},
+    }
+
+
+def test_routing_table_from_invalid_file(tmp_path: Path) -> None:
+    """Test a file that does not map suppliers to lists of base URLs is rejected."""
+    # Arrange
+    path = tmp_path / "routes.json"
+    path.write_text(json.dumps({"TPP": "https://tpp.com"}))
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="must map suppliers to lists"):
+        RoutingTable.from_file(str(path))
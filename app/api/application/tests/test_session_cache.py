@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+from app.api.application.session_cache import SessionCache
+from app.api.infrastructure.cache.memory import MemoryBackend
+
+
+def test_session_cache_ttl() -> None:
+    """Test responses are only cached for suppliers with a TTL."""
+    # Arrange
+    cache = SessionCache(ttls={"EMIS": 5, "TPP": 0}, backend=MemoryBackend())
+
+    # Act
+    actual_result = [cache.ttl(supplier) for supplier in ("EMIS", "TPP", "OTHER")]
+
+    # Assert
+    assert actual_result == [5, 0, 0]
+    assert cache.stats()["ttls"] == {"EMIS": 5, "TPP": 0}
+
+
+def test_session_cache_for_suppliers() -> None:
+    """Test a supplier's TTL takes precedence over the shared TTL."""
+    # Act
+    with patch.dict(
+        "os.environ", {"SESSION_CACHE_TTL": "2", "SESSION_CACHE_TPP_TTL": "10"}
+    ):
+        actual_result = SessionCache.for_suppliers(("EMIS", "TPP"), MemoryBackend())
+
+    # Assert
+    assert actual_result.ttls == {"EMIS": 2, "TPP": 10}
+    assert actual_result.namespace == "session"
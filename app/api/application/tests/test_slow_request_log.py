@@ -0,0 +1,69 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+
+from app.api.application.error_log import ErrorLogLimiter
+from app.api.application.slow_request_log import log_slow_request
+from app.api.domain.stage_timings import StageTimings
+
+FILE_PATH = "app.api.application.slow_request_log"
+
+
+@patch(f"{FILE_PATH}.SLOW_REQUEST_THRESHOLD", new=1)
+def test_log_slow_request() -> None:
+    """Test a slow request is logged with its stages and supplier call phases."""
+    # Arrange
+    logger = MagicMock()
+    timings = StageTimings(started_at=100, supplier="EMIS")
+    timings.add("supplier", 1.5)
+    timings.supplier_calls.append({"reused": False, "connect": 1.2, "ttfb": 0.3})
+
+    # Act
+    with (
+        patch(f"{FILE_PATH}.LIMITER", ErrorLogLimiter(burst=1, interval=60)),
+        patch("app.api.domain.stage_timings.perf_counter", return_value=101.6),
+    ):
+        log_slow_request(logger, "POST /authenticate", timings, HTTPStatus.CREATED)
+
+    # Assert
+    logger.warning.assert_called_once()
+    extra = logger.warning.call_args.kwargs["extra"]
+    assert extra["event"] == "slow_request"
+    assert extra["supplier"] == "EMIS"
+    assert extra["stages"] == {"supplier": 1500.0}
+    assert extra["supplier_calls"] == [
+        {"reused": False, "connect": 1200.0, "ttfb": 300.0}
+    ]
+
+
+@patch(f"{FILE_PATH}.SLOW_REQUEST_THRESHOLD", new=1)
+def test_log_slow_request_fast() -> None:
+    """Test a request faster than the threshold is not logged."""
+    # Arrange
+    logger = MagicMock()
+    timings = StageTimings(started_at=100)
+
+    # Act
+    with patch("app.api.domain.stage_timings.perf_counter", return_value=100.5):
+        log_slow_request(logger, "POST /authenticate", timings, HTTPStatus.CREATED)
+
+    # Assert
+    logger.warning.assert_not_called()
+
+
+@patch(f"{FILE_PATH}.SLOW_REQUEST_THRESHOLD", new=1)
+def test_log_slow_request_rate_limited() -> None:
+    """Test slow requests to the same supplier are rate-limited."""
+    # Arrange
+    logger = MagicMock()
+    timings = StageTimings(started_at=100, supplier="TPP")
+
+    # Act
+    with (
+        patch(f"{FILE_PATH}.LIMITER", ErrorLogLimiter(burst=1, interval=60)),
+        patch("app.api.domain.stage_timings.perf_counter", return_value=102),
+    ):
+        for _ in range(3):
+            log_slow_request(logger, "POST /authenticate", timings, 201)
+
+    # Assert
+    assert logger.warning.call_count == 1
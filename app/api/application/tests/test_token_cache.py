@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+from app.api.application.token_cache import TokenCache
+
+FILE_PATH = "app.api.application.token_cache"
+
+
+def test_token_cache_hit() -> None:
+    """Test a cached value is returned until the token expires."""
+    # Arrange
+    cache = TokenCache(max_size=2, max_ttl=300)
+    key = TokenCache.key("some token")
+    with patch(f"{FILE_PATH}.time", return_value=100):
+        cache.put(key, "some value", expires_at=200)
+
+    # Act
+    with patch(f"{FILE_PATH}.time", return_value=199):
+        actual_result = cache.get(key)
+
+    # Assert
+    assert actual_result == "some value"
+    assert cache.stats() == {"size": 1, "maxSize": 2, "hits": 1, "misses": 0}
+
+
+def test_token_cache_evicts_at_expiry() -> None:
+    """Test a value is evicted once the token expires."""
+    # Arrange
+    cache = TokenCache(max_size=2, max_ttl=300)
+    key = TokenCache.key("some token")
+    with patch(f"{FILE_PATH}.time", return_value=100):
+        cache.put(key, "some value", expires_at=200)
+
+    # Act
+    with patch(f"{FILE_PATH}.time", return_value=200):
+        actual_result = cache.get(key)
+
+    # Assert
+    assert actual_result is None
+    assert cache.stats() == {"size": 0, "maxSize": 2, "hits": 0, "misses": 1}
+
+
+def test_token_cache_evicts_after_max_ttl() -> None:
+    """Test a value for a token that does not expire is kept for at most max_ttl."""
+    # Arrange
+    cache = TokenCache(max_size=2, max_ttl=300)
+    key = TokenCache.key("some token")
+    with patch(f"{FILE_PATH}.time", return_value=100):
+        cache.put(key, "some value", expires_at=None)
+
+    # Act
+    with patch(f"{FILE_PATH}.time", return_value=400):
+        actual_result = cache.get(key)
+
+    # Assert
+    assert actual_result is None
+
+
+def test_token_cache_does_not_cache_expired_token() -> None:
+    """Test a value for a token that has already expired is not cached."""
+    # Arrange
+    cache = TokenCache(max_size=2, max_ttl=300)
+
+    # Act
+    cache.put(TokenCache.key("some token"), "some value", expires_at=0)
+
+    # Assert
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_evicts_least_recently_used() -> None:
+    """Test the least recently used value is evicted when the cache is full."""
+    # Arrange
+    cache = TokenCache(max_size=2, max_ttl=300)
+    first, second, third = (TokenCache.key(token) for token in ("1", "2", "3"))
+    cache.put(first, 1, expires_at=None)
+    cache.put(second, 2, expires_at=None)
+    cache.get(first)
+
+    # Act
+    cache.put(third, 3, expires_at=None)
+
+    # Assert
+    assert cache.get(first) == 1
+    assert cache.get(second) is None
+    assert cache.get(third) == 3
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import time
+
+
+class TokenCache:
+    """Bounded least recently used cache of values derived from tokens.
+
+    Entries are keyed by a SHA-256 digest so tokens are not held in memory, and
+    are evicted once the token expires or after `max_ttl` seconds, whichever is
+    sooner.
+    """
+
+    def __init__(self, max_size: int, max_ttl: float) -> None:
+        """Initialises an empty cache."""
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._entries: OrderedDict[bytes, tuple[float, object]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        """Digest a token into a cache key.
+
+        Args:
+            token (str): Token
+
+        Returns:
+            bytes: Cache key
+        """
+        return sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> object | None:
+        """Fetch the value cached for a token, if it has not expired.
+
+        Args:
+            key (bytes): Cache key of the token
+
+        Returns:
+            object | None: Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, value: object, expires_at: float | None) -> None:
+        """Cache the value derived from a token until the token expires.
+
+        Args:
+            key (bytes): Cache key of the token
+            value (object): Value derived from the token
+            expires_at (float | None): When the token expires as a Unix timestamp,
+                or None if it does not expire
+        """
+        now = time()
+        expires_at = min(
+            float("inf") if expires_at is None else expires_at, now + self.max_ttl
+        )
+        if expires_at <= now or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every cached value."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Statistics about the cache.
+
+        Returns:
+            dict: Size and hit and miss counts of the cache
+        """
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,215 @@
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from json import dumps
+from logging import getLogger
+
+from app.api.application.error_log import log_error
+from app.api.application.forward_request import (
+    bulkhead_stats,
+    circuit_breaker_stats,
+    idempotency_stats,
+    install_routing_reload_handler,
+    negative_cache_stats,
+    retry_stats,
+    route_and_forward_async,
+    routing_stats,
+    session_cache_stats,
+)
+from app.api.application.jwt import (
+    get_nhs_number_from_jwt_token,
+    jwks_stats,
+    jwt_cache_stats,
+    start_key_refresh,
+)
+from app.api.application.slow_request_log import log_slow_request
+from app.api.domain.deadline import Deadline
+from app.api.domain.exception import ApiError, InternalServerError
+from app.api.domain.forward_request_model import ForwardRequest
+from app.api.domain.stage_timings import StageTimings
+from app.api.infrastructure.logs.pipeline import (
+    log_pipeline_stats,
+    start_log_pipeline,
+    stop_log_pipeline,
+)
+from app.api.infrastructure.metrics.prometheus import record_request, render_metrics
+from app.api.infrastructure.metrics.server_timing import server_timing_headers
+from app.api.infrastructure.tracing.tracer import (
+    correlation_headers,
+    server_span,
+    set_status_code,
+    start_tracing,
+    stop_tracing,
+    tracing_stats,
+)
+from app.api.infrastructure.transport.async_pool import (
+    async_pool_stats,
+    close_async_clients,
+)
+
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+HEALTH_PATHS = ("/_status", "/_ping", "/health")
+
+logger = getLogger(__name__)
+
+
+def health() -> dict:
+    """Health check endpoint, reporting the async connection pools it forwards with."""
+    return {
+        "status": "online",
+        "message": "IM1 PFS Auth API is running",
+        "pools": async_pool_stats(),
+        "routing": routing_stats(),
+        "circuitBreakers": circuit_breaker_stats(),
+        "bulkheads": bulkhead_stats(),
+        "retries": retry_stats(),
+        "jwtCache": jwt_cache_stats(),
+        "jwks": jwks_stats(),
+        "sessionCache": session_cache_stats(),
+        "negativeCache": negative_cache_stats(),
+        "idempotency": idempotency_stats(),
+        "logs": log_pipeline_stats(),
+        "tracing": tracing_stats(),
+    }
+
+
+async def authenticate(
+    headers: dict[str, str],
+) -> tuple[HTTPStatus, bytes | str, dict]:
+    """Asynchronous application API for POST /authenticate.
+
+    Args:
+        headers (dict[str, str]): Request headers keyed by lower case name
+
+    Returns:
+        tuple[HTTPStatus, bytes | str, dict]: Status, body and extra headers for
+            POST /authenticate
+    """
+    timings = StageTimings()
+    request_id = headers.get("nhse-request-id")
+    correlation_id = headers.get("nhse-correlation-id")
+    mirrored_headers = correlation_headers(request_id, correlation_id)
+    with server_span(
+        "POST /authenticate",
+        headers,
+        {"nhse.request_id": request_id, "nhse.correlation_id": correlation_id},
+    ) as span:
+        try:
+            deadline = Deadline.from_header(headers.get("nhse-request-timeout"))
+            with timings.stage("jwt_decode"):
+                (patient_nhs_number, proxy_nhs_number) = get_nhs_number_from_jwt_token(
+                    headers.get("nhse-id-token")
+                )
+            with timings.stage("validation"):
+                forward_request = ForwardRequest(
+                    application_id=headers.get("nhse-application-id"),
+                    forward_to=headers.get("nhse-forward-to"),
+                    patient_nhs_number=patient_nhs_number,
+                    patient_ods_code=headers.get("nhse-ods-code"),
+                    proxy_nhs_number=proxy_nhs_number,
+                    use_mock=headers.get("nhse-use-mock") == "True",
+                    request_id=request_id,
+                    correlation_id=correlation_id,
+                    deadline=deadline,
+                    timings=timings,
+                )
+            response = await route_and_forward_async(forward_request)
+            with timings.stage("serialise"):
+                content = response.to_json()
+        except Exception as e:  # noqa: BLE001 - logged by log_error
+            log_error(logger, "POST /authenticate", e)
+            error = e if isinstance(e, ApiError) else InternalServerError()
+            record_request(timings, error.status_code)
+            log_slow_request(logger, "POST /authenticate", timings, error.status_code)
+            set_status_code(span, error.status_code)
+            return (
+                error.status_code,
+                error.content,
+                {
+                    **error.headers,
+                    **mirrored_headers,
+                    **server_timing_headers(timings),
+                },
+            )
+        else:
+            record_request(timings, HTTPStatus.CREATED)
+            log_slow_request(logger, "POST /authenticate", timings, HTTPStatus.CREATED)
+            set_status_code(span, HTTPStatus.CREATED)
+            return (
+                HTTPStatus.CREATED,
+                content,
+                {**mirrored_headers, **server_timing_headers(timings)},
+            )
+
+
+async def app(scope: dict, receive: Receive, send: Send) -> None:
+    """ASGI application exposing the same API as the Flask application.
+
+    Args:
+        scope (dict): Connection scope
+        receive (Receive): Receives events from the server
+        send (Send): Sends events to the server
+    """
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    headers = {}
+    for name, value in scope["headers"]:
+        headers.setdefault(name.decode("latin-1").lower(), value.decode("latin-1"))
+
+    if scope["method"] == "POST" and scope["path"] == "/authenticate":
+        status_code, body, extra_headers = await authenticate(headers)
+    elif scope["method"] == "GET" and scope["path"] in HEALTH_PATHS:
+        status_code, body, extra_headers = HTTPStatus.OK, health(), {}
+    elif scope["method"] == "GET" and scope["path"] == "/metrics":
+        body, content_type = render_metrics()
+        status_code, extra_headers = HTTPStatus.OK, {"content-type": content_type}
+    else:
+        # An unknown route has no OperationOutcome, so the empty body is not JSON
+        status_code, body = HTTPStatus.NOT_FOUND, ""
+        extra_headers = {"content-type": "text/plain; charset=utf-8"}
+
+    if isinstance(body, dict):
+        body = dumps(body)
+    content = body if isinstance(body, bytes) else body.encode()
+    content_type = extra_headers.pop("content-type", "application/json")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(content)).encode()),
+                *(
+                    (name.encode(), value.encode())
+                    for name, value in extra_headers.items()
+                ),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": content})
+
+
+async def _lifespan(receive: Receive, send: Send) -> None:
+    """Handles server startup and shutdown events.
+
+    Args:
+        receive (Receive): Receives events from the server
+        send (Send): Sends events to the server
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            start_log_pipeline()
+            start_tracing()
+            install_routing_reload_handler()
+            start_key_refresh()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_clients()
+            stop_tracing()
+            stop_log_pipeline()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 
+from pydantic import BaseModel
+
 from app.api.domain.forward_request_model import ForwardRequest
-from app.api.domain.forward_response_model import ForwardResponse
+from app.api.domain.forward_response_model import EncodedResponse, ForwardResponse
 
 
 class BaseClient(ABC):
@@ -25,9 +27,28 @@ class BaseClient(ABC):
         """Abstract method to retrieve headers to forward onto the external system."""
 
     @abstractmethod
-    def forward_request(self) -> dict:
+    def forward_request(self) -> dict | BaseModel:
         """Abstract method to forward request onto the external system."""
 
     @abstractmethod
-    def transform_response(self, response: dict) -> ForwardResponse:
+    async def forward_request_async(self) -> dict | BaseModel:
+        """Abstract method to forward request onto the external system asynchronously."""  # noqa: E501
+
+    @abstractmethod
+    def transform_response(
+        self, response: dict | BaseModel
+    ) -> ForwardResponse | EncodedResponse:
         """Abstract method to transform the response into a homogenised response."""
+
+    @abstractmethod
+    def mock_response(self) -> ForwardResponse | EncodedResponse:
+        """Abstract method to return the homogenised response without forwarding."""
+
+    async def transform_response_async(
+        self, response: dict | BaseModel
+    ) -> ForwardResponse | EncodedResponse:
+        """Asynchronously transform the response into a homogenised response.
+
+        Transforming does no I/O, so the synchronous transform is used directly.
+        """
+        return self.transform_response(response)
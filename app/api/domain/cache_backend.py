@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+
+
+class CacheBackend(ABC):
+    """An abstract base class for the stores caches keep their entries in.
+
+    Keys are strings and values are bytes, each entry expiring after its own TTL.
+    Backends whose calls can wait on a lock or the network set `blocking`, so
+    callers on an event loop run those calls in a thread.
+    """
+
+    blocking = True
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Abstract method to fetch an entry that has not expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Abstract method to store an entry for `ttl` seconds."""
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Abstract method to store an entry only if the key has no live entry."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Abstract method to remove an entry."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Abstract method to return statistics about the store."""
@@ -0,0 +1,106 @@
+from math import isfinite
+from os import environ
+from time import monotonic
+
+from pydantic import BaseModel, ConfigDict
+
+from app.api.domain.exception import GatewayTimeoutError, InvalidValueError
+
+# Kept below gunicorn's 30 second worker timeout so a slow supplier produces an
+# error response rather than a killed worker
+REQUEST_DEADLINE_SECONDS = float(environ.get("REQUEST_DEADLINE_SECONDS", "25"))
+SUPPLIER_CONNECT_TIMEOUT = float(environ.get("SUPPLIER_CONNECT_TIMEOUT", "5"))
+
+
+class Deadline(BaseModel):
+    """The point in time by which a request must have been answered."""
+
+    model_config = ConfigDict(frozen=True)
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Creates a deadline a number of seconds from now.
+
+        Args:
+            seconds (float): Seconds until the deadline
+
+        Returns:
+            Deadline: Deadline for the request
+        """
+        return cls(expires_at=monotonic() + seconds)
+
+    @classmethod
+    def default(cls) -> "Deadline":
+        """Creates a deadline using the configured request deadline.
+
+        Returns:
+            Deadline: Deadline for the request
+        """
+        return cls.after(REQUEST_DEADLINE_SECONDS)
+
+    @classmethod
+    def from_header(cls, value: str | None) -> "Deadline":
+        """Creates a deadline from the NHSE-Request-Timeout header.
+
+        The header can only shorten the configured request deadline.
+
+        Args:
+            value (str | None): Seconds the caller is prepared to wait, if given
+
+        Returns:
+            Deadline: Deadline for the request
+        """
+        if value is None:
+            return cls.default()
+        try:
+            seconds = float(value)
+        except ValueError as exc:
+            msg = "Invalid request timeout"
+            raise InvalidValueError(msg) from exc
+        if not isfinite(seconds) or seconds <= 0:
+            msg = "Invalid request timeout"
+            raise InvalidValueError(msg)
+        return cls.after(min(seconds, REQUEST_DEADLINE_SECONDS))
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline.
+
+        Returns:
+            float: Seconds left, or zero once the deadline has passed
+        """
+        return max(0.0, self.expires_at - monotonic())
+
+    def check(self) -> float:
+        """Seconds left while waiting on the supplier, raising once none are left.
+
+        Raises:
+            TimeoutError: If the deadline has passed
+
+        Returns:
+            float: Seconds left until the deadline
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            msg = "Request deadline exceeded waiting for the supplier"
+            raise TimeoutError(msg)
+        return remaining
+
+    def timeouts(self) -> tuple[float, float]:
+        """Connect and read timeouts for a supplier request made now.
+
+        The read timeout bounds each read rather than the whole response, so the
+        response body must also be read within the deadline, see `check`.
+
+        Raises:
+            GatewayTimeoutError: If the deadline has already passed
+
+        Returns:
+            tuple[float, float]: Connect and read timeouts in seconds
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            msg = "Request deadline exceeded before forwarding"
+            raise GatewayTimeoutError(msg, supplier_called=False)
+        return min(SUPPLIER_CONNECT_TIMEOUT, remaining), remaining
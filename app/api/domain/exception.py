@@ -1,11 +1,37 @@
 from http import HTTPStatus
+from json import dumps
+from types import MappingProxyType
 
 
 class ApiError(Exception):
-    """Base class for custom exceptions."""
+    """Base class for custom exceptions.
+
+    The OperationOutcome `body` of each subclass is serialised once, when the
+    subclass is defined, into `content` along with its `content_headers`, so
+    failures are answered without serialising it again.
+    """
 
     status_code: HTTPStatus
-    message: dict
+    body: dict
+    content: bytes
+    content_headers: MappingProxyType[str, str]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Serialises the body of a subclass that defines one."""
+        super().__init_subclass__(**kwargs)
+        if "body" in cls.__dict__:
+            cls.content = dumps(cls.body, separators=(",", ":")).encode()
+            cls.content_headers = MappingProxyType(
+                {
+                    "Content-Type": "application/json",
+                    "Content-Length": str(len(cls.content)),
+                }
+            )
+
+    @property
+    def headers(self) -> dict:
+        """Additional headers to return with the error response."""
+        return {}
 
 
 class AccessDeniedError(ApiError):
@@ -112,6 +138,82 @@ class DownstreamError(ApiError):
     }
 
 
+class DownstreamUnavailableError(DownstreamError):
+    """Exception for when a downstream service asks for the request to be retried later."""  # noqa: E501
+
+    def __init__(self, *args: object, retry_after: float) -> None:
+        """Initialises exception with the seconds the downstream service asked to wait."""  # noqa: E501
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+class ServiceUnavailableError(ApiError):
+    """Exception for when a downstream service is temporarily unavailable."""
+
+    status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    body = {  # noqa: RUF012
+        "issue": [
+            {
+                "code": "transient",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "SERVICE_UNAVAILABLE",
+                            "display": "Downstream service is unavailable",
+                            "system": "https://fhir.nhs.uk/R4/CodeSystem/IM1-PFS-Auth-ErrorOrWarningCode",
+                            "version": "1",
+                        }
+                    ]
+                },
+                "diagnostics": "Service Unavailable - Downstream service is temporarily unavailable, retry after the Retry-After header",  # noqa: E501
+                "severity": "error",
+            }
+        ],
+        "resourceType": "OperationOutcome",
+    }
+
+    def __init__(self, *args: object, retry_after: int) -> None:
+        """Initialises exception with the seconds to wait before retrying."""
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict:
+        """Retry-After header to return with the error response."""
+        return {"Retry-After": str(self.retry_after)}
+
+
+class GatewayTimeoutError(ApiError):
+    """Exception for when the request deadline passes before the supplier answers."""
+
+    status_code = HTTPStatus.GATEWAY_TIMEOUT
+    body = {  # noqa: RUF012
+        "issue": [
+            {
+                "code": "timeout",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "GATEWAY_TIMEOUT",
+                            "display": "Request deadline exceeded",
+                            "system": "https://fhir.nhs.uk/R4/CodeSystem/IM1-PFS-Auth-ErrorOrWarningCode",
+                            "version": "1",
+                        }
+                    ]
+                },
+                "diagnostics": "Gateway Timeout - The request deadline was exceeded before the downstream service answered",  # noqa: E501
+                "severity": "error",
+            }
+        ],
+        "resourceType": "OperationOutcome",
+    }
+
+    def __init__(self, *args: object, supplier_called: bool = True) -> None:
+        """Initialises exception with whether the supplier had been called."""
+        super().__init__(*args)
+        self.supplier_called = supplier_called
+
+
 class InvalidValueError(ApiError):
     """Exception for when request contains a value that is invalid."""
 
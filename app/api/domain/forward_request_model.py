@@ -1,10 +1,12 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
+from app.api.domain.deadline import Deadline
 from app.api.domain.exception import (
     AccessDeniedError,
     InvalidValueError,
     MissingValueError,
 )
+from app.api.domain.stage_timings import StageTimings
 
 
 class ForwardRequest(BaseModel):
@@ -16,6 +18,10 @@ class ForwardRequest(BaseModel):
     patient_ods_code: str
     proxy_nhs_number: str
     use_mock: bool
+    request_id: str | None = None
+    correlation_id: str | None = None
+    deadline: Deadline = Field(default_factory=Deadline.default)
+    timings: StageTimings = Field(default_factory=StageTimings)
 
     @model_validator(mode="before")
     @classmethod
@@ -75,7 +81,7 @@ class ForwardRequest(BaseModel):
 
         If unsuccessful will raise An InvalidValueError Exception
         """
-        if not value.startswith("https:"):
+        if not value.strip().lower().startswith("https:"):
             msg = "Invalid url"
             raise InvalidValueError(msg)
 
@@ -36,3 +36,17 @@ class ForwardResponse(BaseModel):
             error_msg = "patients cannot be empty"
             raise ValueError(error_msg)
         return v
+
+    def to_json(self) -> str:
+        """Serialises the response to the JSON returned to the client."""
+        return self.model_dump_json(by_alias=True)
+
+
+class EncodedResponse(BaseModel):
+    """A homogenised response a supplier client has already serialised to JSON."""
+
+    body: str
+
+    def to_json(self) -> str:
+        """Returns the already serialised JSON returned to the client."""
+        return self.body
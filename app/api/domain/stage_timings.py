@@ -0,0 +1,52 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+from pydantic import BaseModel, Field
+
+
+class StageTimings(BaseModel):
+    """Time spent in each stage of handling a request.
+
+    Stages that run more than once, such as a retried supplier round trip, have
+    their durations added together. The network phases of each call made to the
+    supplier are kept separately, one entry per attempt.
+    """
+
+    started_at: float = Field(default_factory=perf_counter)
+    supplier: str | None = None
+    durations: dict[str, float] = Field(default_factory=dict)
+    supplier_calls: list[dict] = Field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times a stage of handling the request.
+
+        Args:
+            name (str): Name of the stage, such as "supplier"
+
+        Yields:
+            None: While the stage runs
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Adds time spent in a stage that cannot be timed as a block.
+
+        Args:
+            name (str): Name of the stage
+            seconds (float): Seconds spent in the stage
+        """
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the request started being handled.
+
+        Returns:
+            float: Seconds elapsed
+        """
+        return perf_counter() - self.started_at
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.api.domain.deadline import Deadline
+from app.api.domain.exception import GatewayTimeoutError, InvalidValueError
+
+FILE_PATH = "app.api.domain.deadline"
+
+
+@patch(f"{FILE_PATH}.monotonic", return_value=100)
+def test_deadline_default(_mock_monotonic: object) -> None:
+    """Test the default deadline uses the configured request deadline."""
+    # Act
+    actual_result = Deadline.from_header(None)
+
+    # Assert
+    assert actual_result.expires_at == 125
+
+
+@pytest.mark.parametrize(
+    ("header", "expected_expires_at"),
+    [("10", 110), ("0.5", 100.5), ("60", 125)],
+)
+@patch(f"{FILE_PATH}.monotonic", return_value=100)
+def test_deadline_from_header(
+    _mock_monotonic: object, header: str, expected_expires_at: float
+) -> None:
+    """Test the request timeout header can only shorten the deadline."""
+    # Act
+    actual_result = Deadline.from_header(header)
+
+    # Assert
+    assert actual_result.expires_at == expected_expires_at
+
+
+@pytest.mark.parametrize("header", ["soon", "0", "-1", "nan", "inf"])
+def test_deadline_from_header_invalid(header: str) -> None:
+    """Test an invalid request timeout header is rejected."""
+    # Act & Assert
+    with pytest.raises(InvalidValueError, match="Invalid request timeout"):
+        Deadline.from_header(header)
+
+
+@pytest.mark.parametrize(
+    ("now", "expected_timeouts"),
+    [(100, (5, 25)), (122, (3, 3))],
+)
+def test_deadline_timeouts(now: float, expected_timeouts: tuple) -> None:
+    """Test the connect and read timeouts are limited by the time left."""
+    # Arrange
+    deadline = Deadline(expires_at=125)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=now):
+        actual_result = deadline.timeouts()
+
+    # Assert
+    assert actual_result == expected_timeouts
+
+
+@patch(f"{FILE_PATH}.monotonic", return_value=126)
+def test_deadline_timeouts_exceeded(_mock_monotonic: object) -> None:
+    """Test no timeouts are given once the deadline has passed."""
+    # Arrange
+    deadline = Deadline(expires_at=125)
+
+    # Act & Assert
+    assert deadline.remaining() == 0
+    with pytest.raises(GatewayTimeoutError, match="deadline exceeded") as exc_info:
+        deadline.timeouts()
+    assert exc_info.value.supplier_called is False
+
+
+@patch(f"{FILE_PATH}.monotonic", side_effect=[120, 126])
+def test_deadline_check(_mock_monotonic: object) -> None:
+    """Test the deadline is checked while waiting on the supplier."""
+    # Arrange
+    deadline = Deadline(expires_at=125)
+
+    # Act & Assert
+    assert deadline.check() == 5
+    with pytest.raises(TimeoutError, match="deadline exceeded"):
+        deadline.check()
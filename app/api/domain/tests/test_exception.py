@@ -0,0 +1,49 @@
+from json import loads
+
+import pytest
+
+from app.api.domain.exception import (
+    AccessDeniedError,
+    ApiError,
+    DownstreamError,
+    DownstreamUnavailableError,
+    ForbiddenError,
+    GatewayTimeoutError,
+    InternalServerError,
+    InvalidValueError,
+    MissingValueError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        AccessDeniedError,
+        DownstreamError,
+        DownstreamUnavailableError,
+        ForbiddenError,
+        GatewayTimeoutError,
+        InternalServerError,
+        InvalidValueError,
+        MissingValueError,
+        NotFoundError,
+        ServiceUnavailableError,
+    ],
+)
+def test_api_error_content(error: type[ApiError]) -> None:
+    """Test each error body is serialised once with its content headers."""
+    # Assert
+    assert loads(error.content) == error.body
+    assert error.content_headers == {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(error.content)),
+    }
+
+
+def test_api_error_content_headers_are_immutable() -> None:
+    """Test the precomputed content headers cannot be changed by a response."""
+    # Act & Assert
+    with pytest.raises(TypeError):
+        AccessDeniedError.content_headers["Content-Length"] = "0"
@@ -8,12 +8,13 @@ from app.api.domain.exception import (
 from app.api.domain.forward_request_model import ForwardRequest
 
 
-def test_forward_request() -> None:
+@pytest.mark.parametrize("forward_to", ["https://example.com", "HTTPS://Example.com/"])
+def test_forward_request(forward_to: str) -> None:
     """Tests the ForwardRequest model."""
     # Act & Assert
     ForwardRequest(
         application_id="some application",
-        forward_to="https://example.com",
+        forward_to=forward_to,
         patient_nhs_number="1234567890",
         patient_ods_code="some ods code",
         proxy_nhs_number="0987654321",
@@ -77,7 +78,7 @@ def test_forward_request_validates_nhs_numbers(
 
 @pytest.mark.parametrize(
     "forward_to",
-    ["some random value", "invalid.com", "www.example.com"],
+    ["some random value", "invalid.com", "www.example.com", "http://example.com"],
 )
 def test_forward_request_validates_forward_to(forward_to: str) -> None:
     """Tests the ForwardRequest model validates forward to is a url."""
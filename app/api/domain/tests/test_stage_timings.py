@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.api.domain.stage_timings import StageTimings
+
+FILE_PATH = "app.api.domain.stage_timings"
+
+
+def test_stage_timings_stage() -> None:
+    """Test the time spent in a stage is recorded, even when it fails."""
+    # Arrange
+    timings = StageTimings()
+
+    def fail() -> None:
+        with timings.stage("supplier"):
+            msg = "Testing"
+            raise ValueError(msg)
+
+    # Act
+    with (
+        patch(f"{FILE_PATH}.perf_counter", side_effect=[101, 103.5]),
+        pytest.raises(ValueError, match="Testing"),
+    ):
+        fail()
+
+    # Assert
+    assert timings.durations == {"supplier": 2.5}
+
+
+def test_stage_timings_stage_repeated() -> None:
+    """Test the durations of a stage that runs more than once are added together."""
+    # Arrange
+    timings = StageTimings()
+
+    # Act
+    with patch(f"{FILE_PATH}.perf_counter", side_effect=[1, 2, 5, 7]):
+        with timings.stage("supplier"):
+            pass
+        with timings.stage("supplier"):
+            pass
+    timings.add("supplier", 0.5)
+
+    # Assert
+    assert timings.durations == {"supplier": 3.5}
+
+
+def test_stage_timings_elapsed() -> None:
+    """Test the time elapsed since the request started being handled."""
+    # Arrange
+    timings = StageTimings(started_at=100)
+
+    # Act
+    with patch(f"{FILE_PATH}.perf_counter", return_value=100.25):
+        actual_result = timings.elapsed()
+
+    # Assert
+    assert actual_result == 0.25
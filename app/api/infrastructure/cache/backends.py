@@ -0,0 +1,43 @@
+from os import environ
+
+from app.api.domain.cache_backend import CacheBackend
+from app.api.infrastructure.cache.memory import MemoryBackend
+from app.api.infrastructure.cache.resp import RespBackend
+from app.api.infrastructure.cache.shared_memory import SharedMemoryBackend
+
+CACHE_BACKEND = environ.get("CACHE_BACKEND", "memory")
+
+_backends: dict[str, CacheBackend] = {}
+
+
+def create_backend(
+    max_bytes: int | None = None, max_entries: int | None = None
+) -> CacheBackend:
+    """Backend for a cache, chosen by CACHE_BACKEND.
+
+    "memory" gives each cache its own store in this process, bounded by
+    `max_bytes` and `max_entries`. "shared_memory" shares one store between every
+    worker on the host and "redis" one between every node, each sized by its own
+    settings and shared by every cache in this process.
+
+    Args:
+        max_bytes (int): Memory an in-process store may take
+        max_entries (int | None): Entries an in-process store may hold
+
+    Raises:
+        ValueError: If CACHE_BACKEND names an unknown backend
+
+    Returns:
+        CacheBackend: Backend to keep the cache's entries in
+    """
+    if CACHE_BACKEND == "memory":
+        return MemoryBackend(max_bytes, max_entries)
+    if CACHE_BACKEND not in _backends:
+        if CACHE_BACKEND == "shared_memory":
+            _backends[CACHE_BACKEND] = SharedMemoryBackend()
+        elif CACHE_BACKEND == "redis":
+            _backends[CACHE_BACKEND] = RespBackend()
+        else:
+            msg = f"Unknown cache backend: {CACHE_BACKEND}"
+            raise ValueError(msg)
+    return _backends[CACHE_BACKEND]
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from sys import getsizeof
+from threading import Lock
+from time import monotonic
+
+from app.api.domain.cache_backend import CacheBackend
+
+
+class MemoryBackend(CacheBackend):
+    """Least recently used store held in the memory of this process.
+
+    The least recently used entries are evicted once the entries held take more
+    than `max_bytes` of memory, or number more than `max_entries`, where set.
+    """
+
+    blocking = False
+
+    def __init__(
+        self, max_bytes: int | None = None, max_entries: int | None = None
+    ) -> None:
+        """Initialises an empty store."""
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size_bytes = 0
+        self.evictions = 0
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes, int]] = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        """Fetch an entry that has not expired.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bytes | None: Value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store an entry for `ttl` seconds, evicting others to make room.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value
+            ttl (float): Seconds the entry is kept for
+        """
+        size = getsizeof(key) + getsizeof(value)
+        if ttl <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        with self._lock:
+            self._store(key, value, ttl, size)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store an entry only if the key has no live entry.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value
+            ttl (float): Seconds the entry is kept for
+
+        Returns:
+            bool: Whether the entry was stored
+        """
+        size = getsizeof(key) + getsizeof(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > monotonic():
+                return False
+            self._store(key, value, ttl, size)
+            return True
+
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _store(self, key: str, value: bytes, ttl: float, size: int) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (monotonic() + ttl, value, size)
+        self.size_bytes += size
+        while (self.max_bytes is not None and self.size_bytes > self.max_bytes) or (
+            self.max_entries is not None and len(self._entries) > self.max_entries
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        self.size_bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> dict:
+        """Statistics about the store.
+
+        Returns:
+            dict: Entries held, memory used and evictions
+        """
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "bytes": self.size_bytes,
+            "maxBytes": self.max_bytes,
+            "maxEntries": self.max_entries,
+            "evictions": self.evictions,
+        }
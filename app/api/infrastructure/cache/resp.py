@@ -0,0 +1,223 @@
+import socket
+from os import environ, register_at_fork
+from threading import Lock
+from typing import BinaryIO
+from urllib.parse import urlsplit
+
+from app.api.domain.cache_backend import CacheBackend
+
+CACHE_REDIS_URL = environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_TIMEOUT = float(environ.get("CACHE_REDIS_TIMEOUT", "0.1"))
+CACHE_REDIS_POOL_SIZE = int(environ.get("CACHE_REDIS_POOL_SIZE", "8"))
+
+
+class RespError(OSError):
+    """The server answered a command with an error."""
+
+
+class RespBackend(CacheBackend):
+    """Store on a server speaking the Redis protocol, shared by every node.
+
+    Commands are sent over a small pool of connections kept open between calls.
+    Timeouts are short, a cache that is slow to answer is worse than no cache,
+    and errors are raised as OSError for the cache to treat as misses.
+    """
+
+    def __init__(
+        self,
+        url: str = CACHE_REDIS_URL,
+        timeout: float = CACHE_REDIS_TIMEOUT,
+        pool_size: int = CACHE_REDIS_POOL_SIZE,
+    ) -> None:
+        """Initialises the backend without connecting to the server."""
+        parts = urlsplit(url)
+        self.url = f"{parts.scheme}://{parts.hostname}:{parts.port or 6379}"
+        self.address = (parts.hostname or "localhost", parts.port or 6379)
+        self.password = parts.password
+        self.database = parts.path.strip("/") or "0"
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.errors = 0
+        self._lock = Lock()
+        self._idle: list[socket.socket] = []
+        # Connections opened before forking would be shared with the child
+        register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = Lock()
+        self._idle = []
+
+    def _connect(self) -> socket.socket:
+        connection = socket.create_connection(self.address, timeout=self.timeout)
+        try:
+            if self.password:
+                self._send(connection, b"AUTH", self.password.encode())
+            if self.database != "0":
+                self._send(connection, b"SELECT", self.database.encode())
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    def _send(
+        self, connection: socket.socket, *command: bytes
+    ) -> bytes | int | list | None:
+        request = [b"*%d\r\n" % len(command)]
+        request.extend(
+            b"$%d\r\n%s\r\n" % (len(argument), argument) for argument in command
+        )
+        connection.sendall(b"".join(request))
+        return _read_reply(connection.makefile("rb"))
+
+    def execute(self, *command: bytes) -> bytes | int | list | None:
+        """Send a command to the server and read its reply.
+
+        Args:
+            *command (bytes): Command name and arguments
+
+        Raises:
+            OSError: If the server could not be reached or answered with an error
+
+        Returns:
+            bytes | int | list | None: Reply from the server
+        """
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        try:
+            if connection is None:
+                connection = self._connect()
+            reply = self._send(connection, *command)
+        except RespError:
+            self.errors += 1
+            self._release(connection)
+            raise
+        except OSError:
+            self.errors += 1
+            if connection is not None:
+                connection.close()
+            raise
+        self._release(connection)
+        return reply
+
+    def _release(self, connection: socket.socket | None) -> None:
+        if connection is None:
+            return
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def get(self, key: str) -> bytes | None:
+        """Fetch an entry that has not expired.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bytes | None: Value, or None on a miss
+        """
+        return self.execute(b"GET", key.encode())
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store an entry for `ttl` seconds.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value
+            ttl (float): Seconds the entry is kept for
+        """
+        if ttl <= 0:
+            return
+        self.execute(b"SET", key.encode(), value, b"PX", _milliseconds(ttl))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store an entry only if the key has no live entry.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value
+            ttl (float): Seconds the entry is kept for
+
+        Returns:
+            bool: Whether the entry was stored
+        """
+        reply = self.execute(
+            b"SET", key.encode(), value, b"PX", _milliseconds(ttl), b"NX"
+        )
+        return reply is not None
+
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key (str): Cache key
+        """
+        self.execute(b"DEL", key.encode())
+
+    def stats(self) -> dict:
+        """Statistics about the store.
+
+        Returns:
+            dict: Server address, idle connections and commands that failed
+        """
+        return {
+            "backend": "redis",
+            "url": self.url,
+            "idleConnections": len(self._idle),
+            "failedCommands": self.errors,
+        }
+
+
+def _milliseconds(ttl: float) -> bytes:
+    """TTL in whole milliseconds, at least one.
+
+    Args:
+        ttl (float): Seconds
+
+    Returns:
+        bytes: Milliseconds as a command argument
+    """
+    return str(max(1, round(ttl * 1000))).encode()
+
+
+def _read_reply(stream: BinaryIO) -> bytes | int | list | None:
+    """Read one reply in the Redis serialisation protocol.
+
+    Args:
+        stream (BinaryIO): Buffered stream of the connection
+
+    Raises:
+        RespError: If the reply is an error
+        ConnectionError: If the connection was closed
+
+    Returns:
+        bytes | int | list | None: Reply, None for a null reply
+    """
+    line = stream.readline()
+    if not line.endswith(b"\r\n"):
+        msg = "Connection closed by cache server"
+        raise ConnectionError(msg)
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        raise RespError(payload.decode(errors="replace"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        if len(data) != length + 2:
+            msg = "Connection closed by cache server"
+            raise ConnectionError(msg)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [_read_reply(stream) for _ in range(length)]
+    msg = f"Unexpected reply from cache server: {line!r}"
+    raise RespError(msg)
@@ -0,0 +1,195 @@
+import fcntl
+import mmap
+import os
+from hashlib import sha256
+from os import environ, register_at_fork
+from pathlib import Path
+from struct import Struct
+from tempfile import gettempdir
+from threading import Lock
+from time import time
+
+from app.api.domain.cache_backend import CacheBackend
+
+SHM_DIR = "/dev/shm"  # noqa: S108 - shared memory filesystem
+CACHE_SHARED_MEMORY_PATH = environ.get(
+    "CACHE_SHARED_MEMORY_PATH",
+    str(
+        Path(SHM_DIR if Path(SHM_DIR).is_dir() else gettempdir()) / "im1-pfs-auth-cache"
+    ),
+)
+CACHE_SHARED_MEMORY_SLOTS = int(environ.get("CACHE_SHARED_MEMORY_SLOTS", "4096"))
+CACHE_SHARED_MEMORY_SLOT_SIZE = int(
+    environ.get("CACHE_SHARED_MEMORY_SLOT_SIZE", "8192")
+)
+
+# Digest of the key, wall clock expiry, as monotonic clocks are not shared
+# between processes, and value length
+SLOT_HEADER = Struct("<16sdI")
+
+
+class SharedMemoryBackend(CacheBackend):
+    """Store in a memory mapped file shared by every worker process on the host.
+
+    The file is a table of `slots` fixed size slots, each holding one entry of at
+    most `slot_size` bytes including its header. A key always maps to the same
+    slot, so a new entry replaces whichever entry held its slot. Slots are locked
+    with fcntl record locks between processes, and a lock between threads.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_SHARED_MEMORY_PATH,
+        slots: int = CACHE_SHARED_MEMORY_SLOTS,
+        slot_size: int = CACHE_SHARED_MEMORY_SLOT_SIZE,
+    ) -> None:
+        """Maps the file, creating it if this is the first process to use it."""
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.overwrites = 0
+        self._lock = Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size != slots * slot_size:
+            os.ftruncate(self._fd, slots * slot_size)
+        self._map = mmap.mmap(self._fd, slots * slot_size)
+        # The thread lock may have been held by another thread when forking
+        register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self) -> None:
+        self._lock = Lock()
+
+    def _slot(self, key: str) -> tuple[bytes, int]:
+        digest = sha256(key.encode()).digest()[:16]
+        slot = int.from_bytes(digest[:8], "little") % self.slots
+        return digest, slot * self.slot_size
+
+    def _read(self, digest: bytes, offset: int) -> bytes | None:
+        stored_digest, expires_at, length = SLOT_HEADER.unpack_from(self._map, offset)
+        if (
+            stored_digest != digest
+            or expires_at <= time()
+            or length > self.slot_size - SLOT_HEADER.size
+        ):
+            return None
+        start = offset + SLOT_HEADER.size
+        return self._map[start : start + length]
+
+    def _write(self, digest: bytes, offset: int, value: bytes, ttl: float) -> None:
+        stored_digest, expires_at, _ = SLOT_HEADER.unpack_from(self._map, offset)
+        if stored_digest not in (digest, bytes(16)) and expires_at > time():
+            self.overwrites += 1
+        # The slot is emptied and the value written before the header that makes
+        # it readable, so a write cut short, such as by the worker being killed,
+        # leaves an empty slot rather than a live entry with a partial value
+        SLOT_HEADER.pack_into(self._map, offset, bytes(16), 0, 0)
+        start = offset + SLOT_HEADER.size
+        self._map[start : start + len(value)] = value
+        SLOT_HEADER.pack_into(self._map, offset, digest, time() + ttl, len(value))
+
+    def _locked(self, offset: int, lock_type: int) -> "_SlotLock":
+        return _SlotLock(self, offset, lock_type)
+
+    def get(self, key: str) -> bytes | None:
+        """Fetch an entry that has not expired.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bytes | None: Value, or None on a miss
+        """
+        digest, offset = self._slot(key)
+        with self._locked(offset, fcntl.LOCK_SH):
+            return self._read(digest, offset)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store an entry for `ttl` seconds, if it fits in a slot.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value
+            ttl (float): Seconds the entry is kept for
+        """
+        if ttl <= 0 or len(value) > self.slot_size - SLOT_HEADER.size:
+            return
+        digest, offset = self._slot(key)
+        with self._locked(offset, fcntl.LOCK_EX):
+            self._write(digest, offset, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store an entry only if the key has no live entry.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value
+            ttl (float): Seconds the entry is kept for
+
+        Returns:
+            bool: Whether the entry was stored
+        """
+        digest, offset = self._slot(key)
+        with self._locked(offset, fcntl.LOCK_EX):
+            if self._read(digest, offset) is not None:
+                return False
+            self._write(digest, offset, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key (str): Cache key
+        """
+        digest, offset = self._slot(key)
+        with self._locked(offset, fcntl.LOCK_EX):
+            if SLOT_HEADER.unpack_from(self._map, offset)[0] == digest:
+                SLOT_HEADER.pack_into(self._map, offset, bytes(16), 0, 0)
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._map.close()
+        os.close(self._fd)
+
+    def stats(self) -> dict:
+        """Statistics about the store.
+
+        Returns:
+            dict: Slots in the table and live entries this process overwrote
+        """
+        return {
+            "backend": "shared_memory",
+            "path": self.path,
+            "slots": self.slots,
+            "slotSize": self.slot_size,
+            "overwrites": self.overwrites,
+        }
+
+
+class _SlotLock:
+    """Holds a slot locked between threads and between processes."""
+
+    def __init__(
+        self, backend: SharedMemoryBackend, offset: int, lock_type: int
+    ) -> None:
+        self.backend = backend
+        self.offset = offset
+        self.lock_type = lock_type
+
+    def __enter__(self) -> None:
+        self.backend._lock.acquire()  # noqa: SLF001
+        fcntl.lockf(
+            self.backend._fd,  # noqa: SLF001
+            self.lock_type,
+            self.backend.slot_size,
+            self.offset,
+        )
+
+    def __exit__(self, *_args: object) -> None:
+        fcntl.lockf(
+            self.backend._fd,  # noqa: SLF001
+            fcntl.LOCK_UN,
+            self.backend.slot_size,
+            self.offset,
+        )
+        self.backend._lock.release()  # noqa: SLF001
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.api.infrastructure.cache import backends
+from app.api.infrastructure.cache.memory import MemoryBackend
+from app.api.infrastructure.cache.resp import RespBackend
+
+FILE_PATH = "app.api.infrastructure.cache.backends"
+
+
+def test_create_backend_memory() -> None:
+    """Test each cache is given its own in-process store."""
+    # Act
+    with patch(f"{FILE_PATH}.CACHE_BACKEND", "memory"):
+        actual_result = [backends.create_backend(1024), backends.create_backend()]
+
+    # Assert
+    assert isinstance(actual_result[0], MemoryBackend)
+    assert actual_result[0] is not actual_result[1]
+    assert actual_result[0].max_bytes == 1024
+
+
+def test_create_backend_shared() -> None:
+    """Test caches in a process share a single store on the server."""
+    # Act
+    with (
+        patch(f"{FILE_PATH}.CACHE_BACKEND", "redis"),
+        patch.dict(f"{FILE_PATH}._backends", clear=True),
+    ):
+        actual_result = [backends.create_backend(1024), backends.create_backend()]
+
+    # Assert
+    assert isinstance(actual_result[0], RespBackend)
+    assert actual_result[0] is actual_result[1]
+
+
+def test_create_backend_unknown() -> None:
+    """Test an unknown backend is rejected."""
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.CACHE_BACKEND", "memcached"),
+        pytest.raises(ValueError, match="Unknown cache backend: memcached"),
+    ):
+        backends.create_backend()
@@ -0,0 +1,72 @@
+from sys import getsizeof
+from unittest.mock import patch
+
+from app.api.infrastructure.cache.memory import MemoryBackend
+
+FILE_PATH = "app.api.infrastructure.cache.memory"
+
+
+def test_memory_backend_expires_entries() -> None:
+    """Test an entry is returned until its TTL passes."""
+    # Arrange
+    backend = MemoryBackend()
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        backend.set("key", b"value", 5)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", side_effect=[104.9, 105]):
+        actual_result = [backend.get("key"), backend.get("key")]
+
+    # Assert
+    assert actual_result == [b"value", None]
+    assert backend.stats()["bytes"] == 0
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    """Test the least recently used entries are evicted to stay within memory."""
+    # Arrange
+    value = b"x" * 100
+    entry_size = getsizeof("key0") + getsizeof(value)
+    backend = MemoryBackend(max_bytes=entry_size * 2)
+    backend.set("key0", value, 5)
+    backend.set("key1", value, 5)
+    backend.get("key0")
+
+    # Act
+    backend.set("key2", value, 5)
+
+    # Assert
+    assert [backend.get(f"key{n}") is not None for n in range(3)] == [
+        True,
+        False,
+        True,
+    ]
+    assert backend.stats()["bytes"] == entry_size * 2
+    assert backend.stats()["evictions"] == 1
+
+
+def test_memory_backend_max_entries() -> None:
+    """Test the least recently used entry is evicted once the store is full."""
+    # Arrange
+    backend = MemoryBackend(max_entries=1)
+    backend.set("key0", b"value", 5)
+
+    # Act
+    backend.set("key1", b"value", 5)
+
+    # Assert
+    assert [backend.get("key0"), backend.get("key1")] == [None, b"value"]
+
+
+def test_memory_backend_add() -> None:
+    """Test an entry is only added when the key has no live entry."""
+    # Arrange
+    backend = MemoryBackend()
+
+    # Act
+    actual_result = [backend.add("lock", b"1", 5), backend.add("lock", b"2", 5)]
+    backend.delete("lock")
+
+    # Assert
+    assert actual_result == [True, False]
+    assert backend.add("lock", b"3", 5) is True
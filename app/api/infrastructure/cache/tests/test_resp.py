@@ -0,0 +1,105 @@
+from collections.abc import Iterator
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from threading import Thread
+from time import monotonic
+
+import pytest
+
+from app.api.infrastructure.cache.resp import RespBackend, RespError
+
+
+class _RespHandler(StreamRequestHandler):
+    """Answers GET, SET and DEL like a Redis server, for the backend under test."""
+
+    def handle(self) -> None:
+        while line := self.rfile.readline():
+            command = [
+                self.rfile.read(int(self.rfile.readline()[1:]) + 2)[:-2]
+                for _ in range(int(line[1:]))
+            ]
+            self.wfile.write(self.server.execute(command))
+
+
+class _RespServer(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.entries: dict[bytes, tuple[float, bytes]] = {}
+
+    def execute(self, command: list[bytes]) -> bytes:
+        name, key = command[0].upper(), command[1]
+        live = key in self.entries and self.entries[key][0] > monotonic()
+        if name == b"GET":
+            if not live:
+                return b"$-1\r\n"
+            value = self.entries[key][1]
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            if b"NX" in command[3:] and live:
+                return b"$-1\r\n"
+            ttl = int(command[command.index(b"PX") + 1]) / 1000
+            self.entries[key] = (monotonic() + ttl, command[2])
+            return b"+OK\r\n"
+        if name == b"DEL":
+            return b":%d\r\n" % int(self.entries.pop(key, None) is not None)
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture(name="server")
+def setup_server() -> Iterator[_RespServer]:
+    server = _RespServer()
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name="backend")
+def setup_backend(server: _RespServer) -> RespBackend:
+    host, port = server.server_address
+    return RespBackend(f"redis://{host}:{port}/0", timeout=1)
+
+
+def test_resp_backend_set_and_get(backend: RespBackend) -> None:
+    """Test entries are stored on the server over a reused connection."""
+    # Act
+    backend.set("key", b"value\r\nwith newline", 5)
+    actual_result = backend.get("key")
+
+    # Assert
+    assert actual_result == b"value\r\nwith newline"
+    assert backend.get("missing") is None
+    assert backend.stats()["idleConnections"] == 1
+
+
+def test_resp_backend_add_and_delete(backend: RespBackend) -> None:
+    """Test an entry is only added when the key has no live entry."""
+    # Act
+    actual_result = [backend.add("lock", b"1", 5), backend.add("lock", b"2", 5)]
+    backend.delete("lock")
+
+    # Assert
+    assert actual_result == [True, False]
+    assert backend.get("lock") is None
+
+
+def test_resp_backend_error_reply(backend: RespBackend) -> None:
+    """Test an error reply is raised and the connection is kept."""
+    # Act & Assert
+    with pytest.raises(RespError, match="unknown command"):
+        backend.execute(b"INCR", b"key")
+    assert backend.stats()["failedCommands"] == 1
+    assert backend.stats()["idleConnections"] == 1
+
+
+def test_resp_backend_unreachable() -> None:
+    """Test a server that cannot be reached raises an OSError."""
+    # Arrange
+    backend = RespBackend("redis://127.0.0.1:1/0", timeout=0.1)
+
+    # Act & Assert
+    with pytest.raises(OSError):  # noqa: PT011
+        backend.get("key")
+    assert backend.stats()["idleConnections"] == 0
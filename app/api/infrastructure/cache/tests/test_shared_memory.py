@@ -0,0 +1,111 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.api.infrastructure.cache.shared_memory import SharedMemoryBackend
+
+FILE_PATH = "app.api.infrastructure.cache.shared_memory"
+
+
+@pytest.fixture(name="path")
+def setup_path(tmp_path: Path) -> str:
+    return str(tmp_path / "cache")
+
+
+def test_shared_memory_backend_shared_between_instances(path: str) -> None:
+    """Test entries stored by one process are visible to another mapping the file."""
+    # Arrange
+    writer = SharedMemoryBackend(path, slots=16, slot_size=256)
+    reader = SharedMemoryBackend(path, slots=16, slot_size=256)
+
+    # Act
+    writer.set("key", b"value", 5)
+
+    # Assert
+    assert reader.get("key") == b"value"
+    reader.delete("key")
+    assert writer.get("key") is None
+    writer.close()
+    reader.close()
+
+
+def test_shared_memory_backend_expires_entries(path: str) -> None:
+    """Test an entry is returned until its TTL passes."""
+    # Arrange
+    backend = SharedMemoryBackend(path, slots=16, slot_size=256)
+    with patch(f"{FILE_PATH}.time", return_value=100):
+        backend.set("key", b"value", 5)
+
+    # Act
+    with patch(f"{FILE_PATH}.time", side_effect=[104.9, 105]):
+        actual_result = [backend.get("key"), backend.get("key")]
+
+    # Assert
+    assert actual_result == [b"value", None]
+
+
+def test_shared_memory_backend_add(path: str) -> None:
+    """Test an entry is only added when the key has no live entry."""
+    # Arrange
+    backend = SharedMemoryBackend(path, slots=16, slot_size=256)
+
+    # Act
+    actual_result = [backend.add("lock", b"1", 5), backend.add("lock", b"2", 5)]
+
+    # Assert
+    assert actual_result == [True, False]
+    assert backend.get("lock") == b"1"
+
+
+def test_shared_memory_backend_skips_large_values(path: str) -> None:
+    """Test a value too large for a slot is not stored."""
+    # Arrange
+    backend = SharedMemoryBackend(path, slots=16, slot_size=256)
+
+    # Act
+    backend.set("key", b"x" * 256, 5)
+
+    # Assert
+    assert backend.get("key") is None
+
+
+def test_shared_memory_backend_overwrites_slot(path: str) -> None:
+    """Test a key replaces a live entry held in its slot."""
+    # Arrange
+    backend = SharedMemoryBackend(path, slots=1, slot_size=256)
+    backend.set("key0", b"value", 5)
+
+    # Act
+    backend.set("key1", b"value", 5)
+
+    # Assert
+    assert [backend.get("key0"), backend.get("key1")] == [None, b"value"]
+    assert backend.stats()["overwrites"] == 1
+
+
+class _TornMap(bytearray):
+    """Mapping whose writes of a value are cut short."""
+
+    def __setitem__(self, index: int | slice, value: bytes) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(slice(index.start, index.start + 2), value[:2])
+            raise OSError
+
+
+def test_shared_memory_backend_torn_write_is_a_miss(path: str) -> None:
+    """Test a write cut short leaves an empty slot rather than a partial value."""
+    # Arrange
+    backend = SharedMemoryBackend(path, slots=1, slot_size=256)
+    backend.set("key", b"old value", 5)
+    mapped = backend._map
+    backend._map = _TornMap(mapped)
+
+    # Act
+    with pytest.raises(OSError):  # noqa: PT011
+        backend.set("key", b"new value", 5)
+
+    # Assert
+    assert backend.get("key") is None
+    backend._map = mapped
+    backend.close()
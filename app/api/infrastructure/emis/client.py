@@ -1,7 +1,9 @@
-from json import load
+from contextlib import suppress
+from json import loads
+from os import environ
 from pathlib import Path
 
-import requests
+from httpx import Timeout
 
 from app.api.domain.base_client import BaseClient
 from app.api.domain.exception import (
@@ -10,6 +12,11 @@ from app.api.domain.exception import (
     InvalidValueError,
     NotFoundError,
 )
+from app.api.domain.forward_response_model import EncodedResponse
+from app.api.infrastructure.emis.fast_path import (
+    NeedsValidationError,
+    encode_session_response,
+)
 from app.api.infrastructure.emis.models import (
     EffectiveServices,
     Identifier,
@@ -19,8 +26,22 @@ from app.api.infrastructure.emis.models import (
     SessionRequestHeaders,
     SessionResponse,
 )
+from app.api.infrastructure.mock.fixture import MockFixture
+from app.api.infrastructure.tracing.tracer import set_status_code, supplier_span
+from app.api.infrastructure.transport.async_pool import (
+    FORM_CONTENT_TYPE,
+    form_encode,
+    get_async_client,
+)
+from app.api.infrastructure.transport.body import read_body
+from app.api.infrastructure.transport.errors import raise_for_unavailable
+from app.api.infrastructure.transport.phases import measure_phases
+from app.api.infrastructure.transport.pool import get_session
 
 BASE_DIR = Path(__file__).parent
+RESPONSE_CHUNK_SIZE = 8192
+FAST_PATH = environ.get("EMIS_FAST_PATH", "true").lower() == "true"
+MOCK_FIXTURE = MockFixture(BASE_DIR / "data" / "mocked_response.json", loads)
 
 
 class EmisClient(BaseClient):
@@ -62,39 +83,93 @@ class EmisClient(BaseClient):
     def forward_request(self) -> dict:
         """Function to forward requests to Emis client.
 
+        The response body is read within the request deadline.
+
         Returns:
             dict: Response body from forwarded request
         """
         if self.request.use_mock:
             return self._mock_response()
-        response = requests.post(
-            url=self.request.forward_to,
-            headers=self.get_headers(),
-            data=self.get_data(),
-            timeout=30,
-        )
-        response_json = response.json()
-        match response.status_code:
-            case 201:
-                return response_json
-            case 400:
-                raise InvalidValueError(response_json.get("message"))
-            case 401:
-                raise ForbiddenError(response_json.get("message"))
-            case 404:
-                raise NotFoundError(response_json.get("message"))
-            case _:
-                raise DownstreamError
+        timeout = self.request.deadline.timeouts()
+        headers = self.get_headers()
+        with (
+            self.request.timings.stage("supplier"),
+            supplier_span(
+                self.supplier,
+                self.request.forward_to,
+                headers,
+                self.request.request_id,
+                self.request.correlation_id,
+            ) as span,
+            measure_phases(self.request.timings),
+            get_session(self.request.forward_to).post(
+                url=self.request.forward_to,
+                headers=headers,
+                data=self.get_data(),
+                timeout=timeout,
+                stream=True,
+            ) as response,
+        ):
+            set_status_code(span, response.status_code)
+            raise_for_unavailable(response)
+            body = read_body(response, self.request.deadline, RESPONSE_CHUNK_SIZE)
+        with self.request.timings.stage("parse"):
+            response_json = loads(body)
+        return self._handle_response(response.status_code, response_json)
+
+    async def forward_request_async(self) -> dict:
+        """Function to asynchronously forward requests to Emis client.
 
-    def transform_response(self, response: dict) -> SessionResponse:
+        Returns:
+            dict: Response body from forwarded request
+        """
+        if self.request.use_mock:
+            return self._mock_response()
+        connect_timeout, read_timeout = self.request.deadline.timeouts()
+        headers = {**self.get_headers(), "Content-Type": FORM_CONTENT_TYPE}
+        with (
+            self.request.timings.stage("supplier"),
+            supplier_span(
+                self.supplier,
+                self.request.forward_to,
+                headers,
+                self.request.request_id,
+                self.request.correlation_id,
+            ) as span,
+            measure_phases(self.request.timings) as phases,
+        ):
+            response = await get_async_client(self.request.forward_to).post(
+                url=self.request.forward_to,
+                headers=headers,
+                content=form_encode(self.get_data()),
+                timeout=Timeout(read_timeout, connect=connect_timeout),
+                extensions={"trace": phases.trace},
+            )
+            set_status_code(span, response.status_code)
+        raise_for_unavailable(response)
+        with self.request.timings.stage("parse"):
+            response_json = response.json()
+        return self._handle_response(response.status_code, response_json)
+
+    def transform_response(self, response: dict) -> SessionResponse | EncodedResponse:
         """Function transform Emis client response.
 
+        Unless EMIS_FAST_PATH is disabled, the response is encoded straight into
+        JSON without building the models, unless a value needs validating by them.
+
         Args:
             response (dict): Response body from forwarded request
 
         Returns:
-            SessionResponse: Homogenised response with other clients
+            SessionResponse | EncodedResponse: Homogenised response with other clients
         """
+        if FAST_PATH:
+            with suppress(NeedsValidationError):
+                return EncodedResponse(
+                    body=encode_session_response(
+                        response, self.request.patient_ods_code
+                    )
+                )
         # UserPatientLinks relating the user to their patient details
         user_self_links = [
             patient_link
@@ -136,14 +211,46 @@ class EmisClient(BaseClient):
             patients=self._parse_patients(user_patient_links),
         )
 
+    def _handle_response(self, status_code: int, response_json: dict) -> dict:
+        """Function to handle the status of the Emis client response.
+
+        Args:
+            status_code (int): Status code of the forwarded request
+            response_json (dict): Response body from forwarded request
+
+        Returns:
+            dict: Response body from forwarded request when successful
+        """
+        match status_code:
+            case 201:
+                return response_json
+            case 400:
+                raise InvalidValueError(response_json.get("message"))
+            case 401:
+                raise ForbiddenError(response_json.get("message"))
+            case 404:
+                raise NotFoundError(response_json.get("message"))
+            case _:
+                raise DownstreamError
+
+    def mock_response(self) -> EncodedResponse:
+        """Function to return the homogenised hard coded response.
+
+        Returns:
+            EncodedResponse: Ready-made response, kept until the mocked response changes
+        """
+        return MOCK_FIXTURE.response(
+            self.request.patient_ods_code,
+            lambda response: self.transform_response(response).to_json(),
+        )
+
     def _mock_response(self) -> dict:
         """Function to return hard coded response.
 
         Returns:
             dict: Hard coded response rather than forwarding request to Emis client
         """
-        with Path((BASE_DIR) / "data" / "mocked_response.json").open("r") as f:
-            return load(f)
+        return MOCK_FIXTURE.load()
 
     def _parse_patients(self, patient_links: list) -> list[Person]:
         """Parsing raw data from Client into structural model.
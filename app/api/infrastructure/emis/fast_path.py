@@ -0,0 +1,142 @@
+from pydantic_core import to_json
+
+MEDICAL_RECORD_FLAGS = (
+    ("AllergiesEnabled", "allergiesEnabled"),
+    ("ConsultationsEnabled", "consultationsEnabled"),
+    ("ImmunisationsEnabled", "immunisationsEnabled"),
+    ("DocumentsEnabled", "documentsEnabled"),
+    ("MedicationEnabled", "medicationEnabled"),
+    ("ProblemsEnabled", "problemsEnabled"),
+    ("TestResultsEnabled", "testResultsEnabled"),
+)
+SERVICE_FLAGS = (
+    ("AppointmentsEnabled", "appointmentsEnabled"),
+    ("DemographicsUpdateEnabled", "demographicsUpdateEnabled"),
+    ("EpsEnabled", "epsEnabled"),
+    ("MedicalRecordEnabled", "medicalRecordEnabled"),
+    ("OnlineTriageEnabled", "onlineTriageEnabled"),
+    (
+        "PracticePatientCommunicationEnabled",
+        "practicePatientCommunicationEnabled",
+    ),
+    ("PrescribingEnabled", "prescribingEnabled"),
+    ("RecordSharingEnabled", "recordSharingEnabled"),
+    ("RecordViewAuditEnabled", "recordViewAuditEnabled"),
+)
+
+
+class NeedsValidationError(ValueError):
+    """Exception for a value the fast path cannot copy to the output unchanged."""
+
+
+def _str(value: object) -> str:
+    if type(value) is not str:
+        raise NeedsValidationError
+    return value
+
+
+def _bool(value: object) -> bool:
+    if type(value) is not bool:
+        raise NeedsValidationError
+    return value
+
+
+def _dict(value: object) -> dict:
+    if type(value) is not dict:
+        raise NeedsValidationError
+    return value
+
+
+def _list(value: object) -> list:
+    if type(value) is not list:
+        raise NeedsValidationError
+    return value
+
+
+def _identifiers(raw_identifiers: object) -> list[dict]:
+    identifiers = []
+    for identifier in _list(raw_identifiers):
+        identifier = _dict(identifier)  # noqa: PLW2901
+        identifiers.append(
+            {
+                "value": _str(identifier.get("IdentifierValue")),
+                "type": _str(identifier.get("IdentifierType")),
+            }
+        )
+    return identifiers
+
+
+def _permissions(raw_permissions: object) -> dict:
+    raw_permissions = _dict(raw_permissions)
+    medical_record = _dict(raw_permissions.get("MedicalRecord", {}))
+    permissions = {
+        camel: _bool(raw_permissions.get(pascal)) for pascal, camel in SERVICE_FLAGS
+    }
+    permissions["medicalRecord"] = {
+        "recordAccessScheme": _str(medical_record.get("RecordAccessScheme")),
+        **{
+            camel: _bool(medical_record.get(pascal))
+            for pascal, camel in MEDICAL_RECORD_FLAGS
+        },
+    }
+    return permissions
+
+
+def _person(names: dict, link: dict, identifiers: object) -> dict:
+    return {
+        "firstName": _str(names.get("FirstName")),
+        "surname": _str(names.get("Surname")),
+        "title": _str(names.get("Title")),
+        "dateOfBirth": _str(link.get("DateOfBirth")),
+        "permissions": _permissions(link.get("EffectiveServices", {})),
+        "userPatientLinkToken": _str(link.get("UserPatientLinkToken")),
+        "patientIdentifiers": _identifiers(identifiers),
+    }
+
+
+def encode_session_response(response: object, ods_code: str) -> str:
+    """Encodes an Emis session response as the homogenised JSON without validating it.
+
+    This is a fast path around the SessionResponse models, not a streaming
+    parser: it takes the already decoded body, renames and reshapes its keys
+    into the camelCase output in a single pass, and serialises the result once.
+    Values are only type checked, so anything the models would coerce or reject
+    is left to them. The output is serialised by
+    pydantic-core, so it is byte for byte the same as
+    `EmisClient.transform_response(response).model_dump_json(by_alias=True)`.
+
+    Args:
+        response (object): Decoded response body from forwarded request
+        ods_code (str): ODS code of the patient's practice
+
+    Raises:
+        NeedsValidationError: If a value is missing or not already of the output
+            type, so must be validated by the SessionResponse models instead
+
+    Returns:
+        str: Homogenised response serialised to JSON
+    """
+    response = _dict(response)
+    self_link = None
+    patients = []
+    for link in _list(response.get("UserPatientLinks", [])):
+        link = _dict(link)  # noqa: PLW2901
+        match link.get("AssociationType"):
+            case "Self" if self_link is None:
+                self_link = link
+            case "Proxy":
+                patients.append(_person(link, link, link.get("PatientIdentifiers", [])))
+    if self_link is None or not patients:
+        raise NeedsValidationError
+    return to_json(
+        {
+            "sessionId": _str(response.get("SessionId")),
+            "supplier": "EMIS",
+            "odsCode": ods_code,
+            "user": _person(
+                response, self_link, response.get("UserPatientIdentifiers", [])
+            ),
+            "patients": patients,
+            "endUserSessionId": _str(response.get("EndUserSessionId")),
+        }
+    ).decode()
@@ -1,19 +1,25 @@
-from json import load
+import asyncio
+from json import dumps, load
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
+from httpx import Timeout
 from pydantic import ValidationError
 
+from app.api.domain.deadline import Deadline
 from app.api.domain.exception import (
     ApiError,
     DownstreamError,
     ForbiddenError,
+    GatewayTimeoutError,
     InvalidValueError,
     NotFoundError,
 )
 from app.api.domain.forward_request_model import ForwardRequest
+from app.api.domain.forward_response_model import EncodedResponse
 from app.api.infrastructure.emis.client import EmisClient
+from app.api.infrastructure.emis.fast_path import encode_session_response
 from app.api.infrastructure.emis.models import (
     EffectiveServices,
     Identifier,
@@ -80,22 +86,106 @@ def test_emis_forward_request_use_mock_on(client: EmisClient) -> None:
     assert actual_result == expected_response
 
 
-@patch("app.api.infrastructure.emis.client.requests")
+@patch("app.api.infrastructure.emis.client.get_session")
 def test_emis_forward_request_use_mock_off(
-    mock_request: MagicMock, client: EmisClient
+    mock_get_session: MagicMock, client: EmisClient
 ) -> None:
     """Test the EmisClient forward_request function when mock is turned off."""
     # Arrange
     expected_response = {"Message": "Happy Days!"}
     mock_instance = MagicMock()
     mock_instance.status_code = 201
-    mock_instance.json.return_value = expected_response
-    mock_request.post.return_value = mock_instance
+    mock_instance.iter_content.return_value = [b'{"Message": ', b'"Happy Days!"}']
+    mock_get_session.return_value.post.return_value.__enter__.return_value = (
+        mock_instance
+    )
+    client.request.deadline = MagicMock(timeouts=MagicMock(return_value=(5, 20)))
     # Act
     actual_result = client.forward_request()
 
     # Assert
     assert actual_result == expected_response
+    mock_get_session.assert_called_once_with("https://emis.com")
+    assert mock_get_session.return_value.post.call_args.kwargs["timeout"] == (5, 20)
+    assert mock_get_session.return_value.post.call_args.kwargs["stream"] is True
+    assert set(client.request.timings.durations) == {"supplier", "parse"}
+
+
+@patch("app.api.infrastructure.emis.client.get_session")
+def test_emis_forward_request_deadline_exceeded(
+    mock_get_session: MagicMock, client: EmisClient
+) -> None:
+    """Test the EmisClient forward_request function when the deadline has passed."""
+    # Arrange
+    client.request.deadline = Deadline(expires_at=0)
+    # Act & Assert
+    with pytest.raises(GatewayTimeoutError, match="deadline exceeded"):
+        client.forward_request()
+    mock_get_session.return_value.post.assert_not_called()
+
+
+def test_emis_forward_request_async_use_mock_on(client: EmisClient) -> None:
+    """Test the EmisClient forward_request_async function when mock is turned on."""
+    # Arrange
+    with Path("app/api/infrastructure/emis/data/mocked_response.json").open("r") as f:
+        expected_response = load(f)
+    client.request.use_mock = True
+    # Act
+    actual_result = asyncio.run(client.forward_request_async())
+
+    # Assert
+    assert actual_result == expected_response
+
+
+@patch("app.api.infrastructure.emis.client.get_async_client")
+def test_emis_forward_request_async_use_mock_off(
+    mock_get_async_client: MagicMock, client: EmisClient
+) -> None:
+    """Test the EmisClient forward_request_async function when mock is turned off."""
+    # Arrange
+    expected_response = {"Message": "Happy Days!"}
+    mock_instance = MagicMock()
+    mock_instance.status_code = 201
+    mock_instance.json.return_value = expected_response
+    mock_get_async_client.return_value.post = AsyncMock(return_value=mock_instance)
+    client.request.deadline = MagicMock(timeouts=MagicMock(return_value=(5, 20)))
+    # Act
+    actual_result = asyncio.run(client.forward_request_async())
+
+    # Assert
+    assert actual_result == expected_response
+    mock_get_async_client.assert_called_once_with("https://emis.com")
+    mock_get_async_client.return_value.post.assert_awaited_once_with(
+        url="https://emis.com",
+        headers={
+            "X-API-ApplicationId": "some application id",
+            "X-API-Version": "1",
+            "Content-Type": "application/x-www-form-urlencoded",
+        },
+        content=(
+            "PatientIdentifier=IdentifierValue&PatientIdentifier=IdentifierType"
+            "&PatientNationalPracticeCode=some+patient+ods+code"
+            "&UserIdentifier=IdentifierValue&UserIdentifier=IdentifierType"
+        ),
+        timeout=Timeout(20, connect=5),
+        extensions={"trace": ANY},
+    )
+    assert client.request.timings.supplier_calls == [{"reused": True}]
+
+
+@patch("app.api.infrastructure.emis.client.get_async_client")
+def test_emis_forward_request_async_exception(
+    mock_get_async_client: MagicMock, client: EmisClient
+) -> None:
+    """Test the EmisClient forward_request_async function when there is an error."""
+    # Arrange
+    mock_instance = MagicMock()
+    mock_instance.status_code = 404
+    mock_instance.json.return_value = {"message": "Not Found."}
+    mock_get_async_client.return_value.post = AsyncMock(return_value=mock_instance)
+    # Act & Assert
+    with pytest.raises(NotFoundError, match="Not Found"):
+        asyncio.run(client.forward_request_async())
 
 
 @pytest.mark.parametrize(
@@ -107,9 +197,9 @@ def test_emis_forward_request_use_mock_off(
         (500, "", DownstreamError),
     ],
 )
-@patch("app.api.infrastructure.emis.client.requests")
+@patch("app.api.infrastructure.emis.client.get_session")
 def test_tpp_forward_request_use_mock_off_exception(
-    mock_request: MagicMock,
+    mock_get_session: MagicMock,
     client: EmisClient,
     status_code: int,
     error_msg: str,
@@ -119,15 +209,18 @@ def test_tpp_forward_request_use_mock_off_exception(
     # Arrange
     mock_instance = MagicMock()
     mock_instance.status_code = status_code
-    mock_instance.json.return_value = {"message": error_msg}
-    mock_request.post.return_value = mock_instance
+    mock_instance.iter_content.return_value = [dumps({"message": error_msg}).encode()]
+    mock_get_session.return_value.post.return_value.__enter__.return_value = (
+        mock_instance
+    )
     # Act & Assert
     with pytest.raises(api_error, match=error_msg):
         client.forward_request()
 
 
+@patch("app.api.infrastructure.emis.client.FAST_PATH", new=False)
 def test_emis_client_transform_response(client: EmisClient) -> None:
-    """Test the EmisClient transform_response function."""
+    """Test the EmisClient transform_response function builds the models."""
     # Assert
     with Path("app/api/infrastructure/emis/data/mocked_response.json").open("r") as f:
         response = load(f)
@@ -290,3 +383,51 @@ def test_emis_client_transform_response_raise_error(
     # Act & Assert
     with pytest.raises(expected_error):
         client.transform_response(response)
+
+
+@patch("app.api.infrastructure.emis.client.FAST_PATH", new=True)
+def test_emis_client_transform_response_fast_path(client: EmisClient) -> None:
+    """Test the EmisClient transform_response function takes the fast path."""
+    # Arrange
+    with Path("app/api/infrastructure/emis/data/mocked_response.json").open("r") as f:
+        response = load(f)
+
+    # Act
+    actual_result = client.transform_response(response)
+
+    # Assert
+    assert actual_result == EncodedResponse(
+        body=encode_session_response(response, "some patient ods code")
+    )
+
+
+@patch("app.api.infrastructure.emis.client.FAST_PATH", new=True)
+def test_emis_client_transform_response_fast_path_needs_validation(
+    client: EmisClient,
+) -> None:
+    """Test the EmisClient transform_response function validates values the fast path cannot copy."""  # noqa: E501
+    # Arrange
+    with Path("app/api/infrastructure/emis/data/mocked_response.json").open("r") as f:
+        response = load(f)
+    response["UserPatientLinks"][0]["EffectiveServices"]["EpsEnabled"] = "true"
+
+    # Act
+    actual_result = client.transform_response(response)
+
+    # Assert
+    assert isinstance(actual_result, SessionResponse)
+    assert actual_result.user.permissions.eps_enabled is True
+
+
+def test_emis_client_mock_response(client: EmisClient) -> None:
+    """Test the EmisClient mock_response function returns the encoded mocked response."""  # noqa: E501
+    # Arrange
+    with Path("app/api/infrastructure/emis/data/mocked_response.json").open("r") as f:
+        expected_body = client.transform_response(load(f)).to_json()
+
+    # Act
+    actual_result = client.mock_response()
+
+    # Assert
+    assert actual_result == EncodedResponse(body=expected_body)
+    assert client.mock_response() is actual_result
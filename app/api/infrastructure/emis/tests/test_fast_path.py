@@ -0,0 +1,141 @@
+from collections.abc import Callable
+from copy import deepcopy
+from json import load
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.api.domain.forward_request_model import ForwardRequest
+from app.api.infrastructure.emis.client import EmisClient
+from app.api.infrastructure.emis.fast_path import (
+    NeedsValidationError,
+    encode_session_response,
+)
+
+with Path("app/api/infrastructure/emis/data/mocked_response.json").open("r") as f:
+    MOCKED_RESPONSE = load(f)
+
+
+@pytest.fixture(name="client")
+def setup_client() -> EmisClient:
+    request = ForwardRequest(
+        application_id="some application id",
+        forward_to="https://emis.com",
+        patient_nhs_number="1234567890",
+        patient_ods_code="some patient ods code",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+    return EmisClient(request)
+
+
+def _with_many_patients(response: dict) -> dict:
+    proxy = next(
+        link
+        for link in response["UserPatientLinks"]
+        if link["AssociationType"] == "Proxy"
+    )
+    response["UserPatientLinks"].extend(deepcopy(proxy) for _ in range(50))
+    return response
+
+
+def _with_self_link_last(response: dict) -> dict:
+    response["UserPatientLinks"].reverse()
+    return response
+
+
+def _with_escaped_names(response: dict) -> dict:
+    response["FirstName"] = 'Zoë "Jo" \\ / \u2028 \x01'
+    response["Surname"] = "O'Brien-Łukasz 🙂"
+    return response
+
+
+def _with_extra_identifiers(response: dict) -> dict:
+    response["UserPatientIdentifiers"].append(
+        {"IdentifierValue": "1234", "IdentifierType": "Other"}
+    )
+    return response
+
+
+@pytest.mark.parametrize(
+    "reshape",
+    [
+        lambda response: response,
+        _with_many_patients,
+        _with_self_link_last,
+        _with_escaped_names,
+        _with_extra_identifiers,
+    ],
+)
+@patch("app.api.infrastructure.emis.client.FAST_PATH", new=False)
+def test_encode_session_response_matches_models(
+    reshape: Callable[[dict], dict], client: EmisClient
+) -> None:
+    """Test the fast path is byte for byte the same as serialising the models."""
+    # Arrange
+    response = reshape(deepcopy(MOCKED_RESPONSE))
+    expected_result = client.transform_response(response).to_json()
+
+    # Act
+    actual_result = encode_session_response(response, "some patient ods code")
+
+    # Assert
+    assert actual_result.encode() == expected_result.encode()
+
+
+def _without_session_id(response: dict) -> dict:
+    del response["SessionId"]
+    return response
+
+
+def _with_string_flag(response: dict) -> dict:
+    response["UserPatientLinks"][0]["EffectiveServices"]["EpsEnabled"] = "true"
+    return response
+
+
+def _with_integer_flag(response: dict) -> dict:
+    medical_record = response["UserPatientLinks"][1]["EffectiveServices"]
+    medical_record["MedicalRecord"]["AllergiesEnabled"] = 1
+    return response
+
+
+def _without_proxy_links(response: dict) -> dict:
+    response["UserPatientLinks"] = [
+        link
+        for link in response["UserPatientLinks"]
+        if link["AssociationType"] == "Self"
+    ]
+    return response
+
+
+def _without_self_link(response: dict) -> dict:
+    response["UserPatientLinks"] = [
+        link
+        for link in response["UserPatientLinks"]
+        if link["AssociationType"] == "Proxy"
+    ]
+    return response
+
+
+@pytest.mark.parametrize(
+    "reshape",
+    [
+        lambda _response: [],
+        _without_session_id,
+        _with_string_flag,
+        _with_integer_flag,
+        _without_proxy_links,
+        _without_self_link,
+    ],
+)
+def test_encode_session_response_needs_validation(
+    reshape: Callable[[dict], dict],
+) -> None:
+    """Test responses the models would coerce or reject are left to the models."""
+    # Arrange
+    response = reshape(deepcopy(MOCKED_RESPONSE))
+
+    # Act & Assert
+    with pytest.raises(NeedsValidationError):
+        encode_session_response(response, "some patient ods code")
@@ -0,0 +1,193 @@
+from collections.abc import Callable
+from json import loads
+from logging import getLogger
+from math import ceil
+from os import environ, getpid
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import monotonic
+
+import requests
+from jwt import PyJWKSet
+
+JWKS_REFRESH_INTERVAL = float(environ.get("JWKS_REFRESH_INTERVAL", "3600"))
+JWKS_MIN_REFRESH_INTERVAL = float(environ.get("JWKS_MIN_REFRESH_INTERVAL", "60"))
+JWKS_FETCH_TIMEOUT = float(environ.get("JWKS_FETCH_TIMEOUT", "5"))
+
+logger = getLogger(__name__)
+
+JWKSSource = Callable[[], dict]
+
+
+class KeySetUnavailableError(Exception):
+    """The key set could not be fetched, so a token's key cannot be found."""
+
+    def __init__(self, *args: object, retry_after: int) -> None:
+        """Initialises exception with the seconds until the next fetch is allowed."""
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+def url_source(url: str) -> JWKSSource:
+    """Source of a JSON Web Key Set published at a url.
+
+    Args:
+        url (str): Url of the key set, such as the issuer's jwks_uri
+
+    Returns:
+        JWKSSource: Function fetching the key set
+    """
+
+    def fetch() -> dict:
+        response = requests.get(url, timeout=JWKS_FETCH_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    return fetch
+
+
+def file_source(path: str | Path) -> JWKSSource:
+    """Source of a JSON Web Key Set stored in a local file, used for testing.
+
+    Args:
+        path (str | Path): Path to the key set
+
+    Returns:
+        JWKSSource: Function reading the key set
+    """
+    return lambda: loads(Path(path).read_bytes())
+
+
+class JWKSKeyStore:
+    """Signing keys from a JSON Web Key Set, parsed into public keys once.
+
+    Keys are loaded as each worker process starts and refreshed every
+    `refresh_interval` seconds, on a background thread. The key set is never
+    fetched on the request path: a token signed with an unknown key id wakes the
+    background thread to refresh straight away, at most once every
+    `min_refresh_interval` seconds, and is answered as unavailable until the
+    refreshed keys arrive, so rotated keys are picked up without waiting for the
+    next refresh. A key set that cannot be fetched leaves the keys already held
+    in place.
+    """
+
+    def __init__(
+        self,
+        source: JWKSSource,
+        refresh_interval: float = JWKS_REFRESH_INTERVAL,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL,
+    ) -> None:
+        """Initialises the key store without fetching any keys."""
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._keys: dict[str, object] = {}
+        self._fetched_at = float("-inf")
+        self._attempted_at = float("-inf")
+        self._lock = Lock()
+        self._stop = Event()
+        self._wake = Event()
+        self._thread_pid: int | None = None
+
+    def _unavailable(self, msg: str) -> KeySetUnavailableError:
+        retry_after = self._attempted_at + self.min_refresh_interval - monotonic()
+        return KeySetUnavailableError(msg, retry_after=max(1, ceil(retry_after)))
+
+    def refresh(self) -> None:
+        """Fetches the key set and replaces the keys, dropping any rotated out.
+
+        Raises:
+            Exception: If the key set cannot be fetched or parsed
+        """
+        self._attempted_at = monotonic()
+        try:
+            key_set = PyJWKSet.from_dict(self.source())
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        # Replaced whole, so lookups never see a partly built set of keys
+        self._keys = {jwk.key_id: jwk.key for jwk in key_set.keys}
+        self._fetched_at = self._attempted_at
+        self.refreshes += 1
+
+    def get_key(self, kid: str | None) -> object:
+        """Fetch the public key a token was signed with, without fetching keys.
+
+        Args:
+            kid (str | None): Key id from the token header
+
+        Raises:
+            KeyError: If the key set, fetched moments ago, has no key with the
+                key id
+            KeySetUnavailableError: If the key set has not been fetched, could
+                not be fetched, or is being refreshed to look for the key id
+
+        Returns:
+            object: Public key to verify the token with
+        """
+        self.start()
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        if not self.refreshes:
+            msg = "JSON Web Key Set has not been fetched"
+            raise self._unavailable(msg)
+        if monotonic() - self._attempted_at >= self.min_refresh_interval:
+            self._wake.set()
+            msg = "JSON Web Key Set is being refreshed"
+            raise self._unavailable(msg)
+        if self._fetched_at < self._attempted_at:
+            msg = "JSON Web Key Set could not be fetched"
+            raise self._unavailable(msg)
+        raise KeyError(kid)
+
+    def start(self) -> None:
+        """Loads the keys and refreshes them on a background thread.
+
+        Called as each worker process starts, so the first requests do not find
+        the key set missing, and otherwise by the first request.
+        """
+        # Threads do not survive a fork, so each worker process starts its own
+        pid = getpid()
+        if self._thread_pid == pid:
+            return
+        with self._lock:
+            if self._thread_pid == pid:
+                return
+            self._thread_pid = pid
+            Thread(target=self._refresh_periodically, daemon=True).start()
+
+    def _refresh_periodically(self) -> None:
+        # Failed refreshes are retried every min_refresh_interval seconds, and a
+        # request for a key id not held wakes the thread to refresh early
+        requested = False
+        while not self._stop.is_set():
+            now = monotonic()
+            if now - self._fetched_at >= self.refresh_interval or (
+                requested and now - self._attempted_at >= self.min_refresh_interval
+            ):
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.exception("Failed to refresh JSON Web Key Set")
+            requested = self._wake.wait(self.min_refresh_interval)
+            self._wake.clear()
+
+    def stop(self) -> None:
+        """Stops refreshing the keys in the background."""
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self) -> dict:
+        """Statistics about the key store.
+
+        Returns:
+            dict: Key ids held and refresh counts
+        """
+        return {
+            "keyIds": sorted(str(kid) for kid in self._keys),
+            "refreshes": self.refreshes,
+            "refreshFailures": self.refresh_failures,
+        }
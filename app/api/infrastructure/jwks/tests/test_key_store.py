@@ -0,0 +1,248 @@
+from json import dumps
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.api.infrastructure.jwks.key_store import (
+    JWKSKeyStore,
+    KeySetUnavailableError,
+    file_source,
+    url_source,
+)
+
+FILE_PATH = "app.api.infrastructure.jwks.key_store"
+
+
+@pytest.fixture(name="private_keys", scope="module")
+def setup_private_keys() -> list[rsa.RSAPrivateKey]:
+    return [
+        rsa.generate_private_key(public_exponent=65537, key_size=2048) for _ in range(2)
+    ]
+
+
+def _key_set(*keys: tuple[str, rsa.RSAPrivateKey]) -> dict:
+    return {
+        "keys": [
+            {
+                **RSAAlgorithm.to_jwk(key.public_key(), as_dict=True),
+                "kid": kid,
+                "alg": "RS512",
+            }
+            for kid, key in keys
+        ]
+    }
+
+
+@pytest.fixture(name="key_store")
+def setup_key_store() -> JWKSKeyStore:
+    # Refreshing in the background is tested separately
+    with patch(f"{FILE_PATH}.Thread"):
+        yield JWKSKeyStore(MagicMock(), refresh_interval=60, min_refresh_interval=1)
+
+
+def test_key_store_parses_keys_once(
+    key_store: JWKSKeyStore, private_keys: list[rsa.RSAPrivateKey]
+) -> None:
+    """Test the key set is fetched and parsed once for every key id."""
+    # Arrange
+    key_store.source.return_value = _key_set(("first", private_keys[0]))
+    key_store.refresh()
+
+    # Act
+    actual_result = [key_store.get_key("first"), key_store.get_key("first")]
+
+    # Assert
+    assert actual_result[0] is actual_result[1]
+    assert (
+        actual_result[0].public_numbers()
+        == private_keys[0].public_key().public_numbers()
+    )
+    key_store.source.assert_called_once()
+    assert key_store.stats() == {
+        "keyIds": ["first"],
+        "refreshes": 1,
+        "refreshFailures": 0,
+    }
+
+
+def test_key_store_refreshes_on_rotation(
+    key_store: JWKSKeyStore, private_keys: list[rsa.RSAPrivateKey]
+) -> None:
+    """Test an unknown key id wakes the background refresh rather than fetching."""
+    # Arrange
+    key_store.source.side_effect = [
+        _key_set(("first", private_keys[0])),
+        _key_set(("second", private_keys[1])),
+    ]
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        key_store.refresh()
+
+    # Act
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=101),
+        pytest.raises(KeySetUnavailableError) as exc_info,
+    ):
+        key_store.get_key("second")
+    refresh_requested = key_store._wake.is_set()
+    with patch(f"{FILE_PATH}.monotonic", return_value=101):
+        key_store.refresh()
+    actual_result = key_store.get_key("second")
+
+    # Assert
+    assert exc_info.value.retry_after == 1
+    assert refresh_requested
+    assert actual_result is not None
+    assert key_store.stats()["keyIds"] == ["second"]
+
+
+def test_key_store_limits_refreshes_for_unknown_keys(
+    key_store: JWKSKeyStore, private_keys: list[rsa.RSAPrivateKey]
+) -> None:
+    """Test unknown key ids do not fetch the key set more than once per interval."""
+    # Arrange
+    key_store.source.return_value = _key_set(("first", private_keys[0]))
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        key_store.refresh()
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=100.5),
+        pytest.raises(KeyError),
+    ):
+        key_store.get_key("unknown")
+    key_store.source.assert_called_once()
+
+
+def test_key_store_refresh_failure(key_store: JWKSKeyStore) -> None:
+    """Test a key set that was never fetched is unavailable rather than an error."""
+    # Arrange
+    key_store.source.side_effect = ConnectionError
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=100),
+        pytest.raises(ConnectionError),
+    ):
+        key_store.refresh()
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=100.5),
+        pytest.raises(KeySetUnavailableError) as exc_info,
+    ):
+        key_store.get_key("first")
+    assert exc_info.value.retry_after == 1
+    assert key_store.stats()["refreshFailures"] == 1
+
+
+def test_key_store_keeps_keys_when_refresh_fails(
+    key_store: JWKSKeyStore, private_keys: list[rsa.RSAPrivateKey]
+) -> None:
+    """Test a failed refresh for an unknown key id keeps the keys already held."""
+    # Arrange
+    key_store.source.side_effect = [
+        _key_set(("first", private_keys[0])),
+        ValueError("Malformed key set"),
+    ]
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        key_store.refresh()
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=101),
+        pytest.raises(ValueError, match="Malformed"),
+    ):
+        key_store.refresh()
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", return_value=101.5),
+        pytest.raises(KeySetUnavailableError, match="could not be fetched"),
+    ):
+        key_store.get_key("second")
+    assert key_store.get_key("first") is not None
+    assert key_store.stats()["refreshFailures"] == 1
+
+
+def test_key_store_refreshes_in_background(
+    private_keys: list[rsa.RSAPrivateKey],
+) -> None:
+    """Test the key set is loaded and refreshed in the background once it is due."""
+    # Arrange
+    source = MagicMock(return_value=_key_set(("first", private_keys[0])))
+    key_store = JWKSKeyStore(source, refresh_interval=0, min_refresh_interval=0.01)
+
+    # Act
+    key_store.start()
+    try:
+        for _ in range(100):
+            if source.call_count > 2:
+                break
+            key_store._stop.wait(0.01)
+    finally:
+        key_store.stop()
+
+    # Assert
+    assert source.call_count > 2
+    assert key_store.get_key("first") is not None
+
+
+def test_key_store_unknown_key_wakes_background_refresh(
+    private_keys: list[rsa.RSAPrivateKey],
+) -> None:
+    """Test an unknown key id is loaded by the background thread ahead of schedule."""
+    # Arrange
+    source = MagicMock(return_value=_key_set(("first", private_keys[0])))
+    key_store = JWKSKeyStore(source, refresh_interval=3600, min_refresh_interval=0.01)
+    key_store.start()
+    try:
+        for _ in range(100):
+            if key_store.refreshes:
+                break
+            key_store._stop.wait(0.01)
+        source.return_value = _key_set(("second", private_keys[1]))
+        key_store._stop.wait(0.02)
+
+        # Act
+        with pytest.raises(KeySetUnavailableError):
+            key_store.get_key("second")
+        for _ in range(100):
+            if key_store.refreshes > 1:
+                break
+            key_store._stop.wait(0.01)
+    finally:
+        key_store.stop()
+
+    # Assert
+    assert key_store.get_key("second") is not None
+    assert source.call_count == 2
+
+
+def test_file_source(tmp_path: Path, private_keys: list[rsa.RSAPrivateKey]) -> None:
+    """Test the key set is read from a local file."""
+    # Arrange
+    key_set = _key_set(("first", private_keys[0]))
+    path = tmp_path / "jwks.json"
+    path.write_text(dumps(key_set))
+
+    # Act
+    actual_result = file_source(path)()
+
+    # Assert
+    assert actual_result == key_set
+
+
+@patch(f"{FILE_PATH}.requests")
+def test_url_source(mock_requests: MagicMock) -> None:
+    """Test the key set is fetched from a url."""
+    # Arrange
+    mock_requests.get.return_value.json.return_value = {"keys": []}
+
+    # Act
+    actual_result = url_source("https://auth.login.nhs.uk/.well-known/jwks.json")()
+
+    # Assert
+    assert actual_result == {"keys": []}
+    mock_requests.get.assert_called_once_with(
+        "https://auth.login.nhs.uk/.well-known/jwks.json", timeout=5
+    )
+    mock_requests.get.return_value.raise_for_status.assert_called_once()
@@ -0,0 +1,201 @@
+from logging import Formatter, Handler, LogRecord, StreamHandler, getLogger
+from logging.handlers import QueueHandler
+from os import environ
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+
+LOG_QUEUE_SIZE = int(environ.get("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_DROP_POLICY = environ.get("LOG_QUEUE_DROP_POLICY", "newest")
+LOG_BATCH_SIZE = int(environ.get("LOG_BATCH_SIZE", "256"))
+LOG_FLUSH_TIMEOUT = float(environ.get("LOG_FLUSH_TIMEOUT", "5"))
+LOG_FORMAT = "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+
+_SENTINEL = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Puts records on a bounded queue without ever blocking the caller.
+
+    When the queue is full the newest record is dropped, or with the "oldest"
+    drop policy the oldest queued record is dropped to make room for it. Either
+    way the record dropped is counted. Records are prepared as by QueueHandler,
+    so their message and exception text are formatted before they are queued
+    and the arguments and traceback they referenced are not kept alive.
+    """
+
+    def __init__(self, queue: Queue, drop_policy: str = LOG_QUEUE_DROP_POLICY) -> None:
+        """Initialises the handler with the queue to put records on."""
+        if drop_policy not in {"newest", "oldest"}:
+            msg = f"Unknown log queue drop policy: {drop_policy}"
+            raise ValueError(msg)
+        super().__init__(queue)
+        self.drop_oldest = drop_policy == "oldest"
+        self.dropped = 0
+        self._drop_lock = Lock()
+
+    def enqueue(self, record: LogRecord) -> None:
+        """Puts a record on the queue, dropping one if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self._drop_lock:
+                self.dropped += 1
+            if not self.drop_oldest:
+                return
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (Empty, Full):
+                return
+
+
+class BatchQueueListener:
+    """Takes records off a queue on a background thread and writes them in batches.
+
+    Stream handlers receive each batch as a single write followed by a single
+    flush, other handlers handle the records one at a time.
+    """
+
+    def __init__(
+        self, queue: Queue, handlers: list[Handler], batch_size: int = LOG_BATCH_SIZE
+    ) -> None:
+        """Initialises the listener without starting it."""
+        self.queue = queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Starts taking records off the queue."""
+        self._thread = Thread(target=self._monitor, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = LOG_FLUSH_TIMEOUT) -> None:
+        """Writes the records already queued and stops the listener.
+
+        Args:
+            timeout (float): Seconds to wait for the queued records to be written
+        """
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(_SENTINEL, timeout=timeout)
+        except Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _monitor(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not _SENTINEL and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+            stopping = batch[-1] is _SENTINEL
+            if stopping:
+                batch.pop()
+            self.write(batch)
+            if stopping:
+                return
+
+    def write(self, records: list[LogRecord]) -> None:
+        """Passes a batch of records to each handler, respecting its level.
+
+        Args:
+            records (list[LogRecord]): Records to write
+        """
+        for handler in self.handlers:
+            accepted = [
+                record
+                for record in records
+                if record.levelno >= handler.level and handler.filter(record)
+            ]
+            if not accepted:
+                continue
+            if not isinstance(handler, StreamHandler):
+                for record in accepted:
+                    handler.handle(record)
+                continue
+            lines = []
+            for record in accepted:
+                try:
+                    lines.append(handler.format(record) + handler.terminator)
+                except Exception:  # noqa: BLE001 - reported by the handler
+                    handler.handleError(record)
+            with handler.lock:
+                try:
+                    handler.stream.write("".join(lines))
+                    handler.flush()
+                except Exception:  # noqa: BLE001 - reported by the handler
+                    handler.handleError(accepted[-1])
+
+
+class LogPipeline:
+    """Routes records from the root logger through a queue to a background writer."""
+
+    def __init__(self, handlers: list[Handler], max_size: int = LOG_QUEUE_SIZE) -> None:
+        """Initialises the pipeline without installing it."""
+        queue: Queue = Queue(max_size)
+        self.handler = DroppingQueueHandler(queue)
+        self.listener = BatchQueueListener(queue, handlers)
+        self._replaced: list[Handler] = []
+
+    def start(self) -> None:
+        """Replaces the handlers of the root logger with the queue."""
+        root = getLogger()
+        self._replaced = root.handlers[:]
+        root.handlers = [self.handler]
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Flushes the queued records and restores the root logger's handlers."""
+        root = getLogger()
+        root.handlers = self._replaced
+        self.listener.stop()
+
+    def stats(self) -> dict:
+        """Statistics about the pipeline.
+
+        Returns:
+            dict: Queued and dropped record counts
+        """
+        return {
+            "queued": self.handler.queue.qsize(),
+            "maxSize": self.handler.queue.maxsize,
+            "dropped": self.handler.dropped,
+        }
+
+
+_pipelines: list[LogPipeline] = []
+
+
+def start_log_pipeline() -> None:
+    """Starts writing logs to stderr in the background of this process.
+
+    Called after a worker process is forked, as the listener thread does not
+    survive a fork.
+    """
+    if _pipelines:
+        return
+    handler = StreamHandler()
+    handler.setFormatter(Formatter(LOG_FORMAT))
+    pipeline = LogPipeline([handler])
+    pipeline.start()
+    _pipelines.append(pipeline)
+
+
+def stop_log_pipeline() -> None:
+    """Writes any queued logs and stops the pipeline."""
+    while _pipelines:
+        _pipelines.pop().stop()
+
+
+def log_pipeline_stats() -> dict:
+    """Statistics about the log pipeline of this process.
+
+    Returns:
+        dict: Queued and dropped record counts, empty if the pipeline is not running
+    """
+    return _pipelines[0].stats() if _pipelines else {}
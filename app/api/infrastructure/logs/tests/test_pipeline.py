@@ -0,0 +1,150 @@
+import sys
+from io import StringIO
+from logging import INFO, WARNING, Formatter, LogRecord, StreamHandler, getLogger
+from queue import Queue
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.api.infrastructure.logs.pipeline import (
+    BatchQueueListener,
+    DroppingQueueHandler,
+    LogPipeline,
+)
+
+
+def _record(message: str, level: int = WARNING) -> LogRecord:
+    return LogRecord("test", level, __file__, 1, message, None, None)
+
+
+def _stream_handler(stream: StringIO) -> StreamHandler:
+    handler = StreamHandler(stream)
+    handler.setFormatter(Formatter("%(levelname)s %(message)s"))
+    return handler
+
+
+def test_dropping_queue_handler_drops_newest() -> None:
+    """Test records logged to a full queue are dropped and counted."""
+    # Arrange
+    queue = Queue(2)
+    handler = DroppingQueueHandler(queue, drop_policy="newest")
+
+    # Act
+    for message in ("first", "second", "third"):
+        handler.handle(_record(message))
+
+    # Assert
+    assert [queue.get_nowait().msg for _ in range(2)] == ["first", "second"]
+    assert handler.dropped == 1
+
+
+def test_dropping_queue_handler_drops_oldest() -> None:
+    """Test the oldest record is dropped to make room when the queue is full."""
+    # Arrange
+    queue = Queue(2)
+    handler = DroppingQueueHandler(queue, drop_policy="oldest")
+
+    # Act
+    for message in ("first", "second", "third"):
+        handler.handle(_record(message))
+
+    # Assert
+    assert [queue.get_nowait().msg for _ in range(2)] == ["second", "third"]
+    assert handler.dropped == 1
+
+
+def test_dropping_queue_handler_unknown_drop_policy() -> None:
+    """Test an unknown drop policy is rejected."""
+    # Act & Assert
+    with pytest.raises(ValueError, match="Unknown log queue drop policy: random"):
+        DroppingQueueHandler(Queue(2), drop_policy="random")
+
+
+def test_dropping_queue_handler_formats_before_queueing() -> None:
+    """Test records are queued with their message and exception text formatted."""
+    # Arrange
+    queue = Queue(2)
+    handler = DroppingQueueHandler(queue)
+    try:
+        raise ValueError("Boom")  # noqa: EM101, TRY301
+    except ValueError:
+        exc_info = sys.exc_info()
+    record = LogRecord("test", WARNING, __file__, 1, "Hello %s", ("World",), exc_info)
+
+    # Act
+    handler.handle(record)
+
+    # Assert
+    actual_result = queue.get_nowait()
+    assert actual_result.args is None
+    assert actual_result.exc_info is None
+    assert actual_result.exc_text is None
+    assert actual_result.msg.startswith("Hello World\nTraceback")
+    assert actual_result.msg.endswith("ValueError: Boom")
+
+
+def test_batch_queue_listener_writes_batch_once() -> None:
+    """Test a batch is written to a stream with a single write and flush."""
+    # Arrange
+    stream = MagicMock()
+    listener = BatchQueueListener(Queue(), [_stream_handler(stream)])
+
+    # Act
+    listener.write([_record("first"), _record("second", INFO)])
+
+    # Assert
+    stream.write.assert_called_once_with("WARNING first\nINFO second\n")
+    stream.flush.assert_called_once_with()
+
+
+def test_batch_queue_listener_respects_handler_level() -> None:
+    """Test records below a handler's level are not written to it."""
+    # Arrange
+    stream = StringIO()
+    handler = _stream_handler(stream)
+    handler.setLevel(WARNING)
+    other_handler = MagicMock(level=0)
+    listener = BatchQueueListener(Queue(), [handler, other_handler])
+
+    # Act
+    listener.write([_record("first"), _record("second", INFO)])
+
+    # Assert
+    assert stream.getvalue() == "WARNING first\n"
+    assert other_handler.handle.call_count == 2
+
+
+def test_batch_queue_listener_stop_flushes_queue() -> None:
+    """Test stopping the listener writes every record already queued."""
+    # Arrange
+    stream = StringIO()
+    queue = Queue()
+    listener = BatchQueueListener(queue, [_stream_handler(stream)], batch_size=2)
+    for message in ("first", "second", "third"):
+        queue.put(_record(message))
+
+    # Act
+    listener.start()
+    listener.stop()
+
+    # Assert
+    assert stream.getvalue() == "WARNING first\nWARNING second\nWARNING third\n"
+
+
+def test_log_pipeline_routes_root_logger() -> None:
+    """Test the pipeline takes over the root logger until it is stopped."""
+    # Arrange
+    stream = StringIO()
+    root = getLogger()
+    original_handlers = root.handlers[:]
+    pipeline = LogPipeline([_stream_handler(stream)], max_size=10)
+
+    # Act
+    pipeline.start()
+    getLogger("app.api.test").warning("Hello %s", "World")
+    pipeline.stop()
+
+    # Assert
+    assert stream.getvalue() == "WARNING Hello World\n"
+    assert root.handlers == original_handlers
+    assert pipeline.stats() == {"queued": 0, "maxSize": 10, "dropped": 0}
@@ -0,0 +1,149 @@
+from os import environ
+from pathlib import Path
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.api.domain.stage_timings import StageTimings
+
+# Set in every gunicorn worker so each writes its samples to files the /metrics
+# endpoint of any worker can aggregate
+MULTIPROC_DIR = environ.get("PROMETHEUS_MULTIPROC_DIR")
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+)
+
+STAGE_SECONDS = Histogram(
+    "im1_pfs_auth_stage_duration_seconds",
+    "Time spent in each stage of handling a login",
+    ["stage", "supplier", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_SECONDS = Histogram(
+    "im1_pfs_auth_request_duration_seconds",
+    "Time taken to answer a login",
+    ["supplier", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+SUPPLIER_PHASE_SECONDS = Histogram(
+    "im1_pfs_auth_supplier_phase_seconds",
+    "Time spent in each network phase of a call to a supplier",
+    ["phase", "supplier", "connection"],
+    buckets=LATENCY_BUCKETS,
+)
+SUPPLIER_CALLS = Counter(
+    "im1_pfs_auth_supplier_calls",
+    "Calls made to a supplier, by whether a pooled connection was reused",
+    ["supplier", "connection"],
+)
+
+CACHE_LOOKUPS = Counter(
+    "im1_pfs_auth_cache_lookups",
+    "Lookups in the login response caches, by whether they were answered",
+    ["cache", "supplier", "result"],
+)
+SUPPLIER_RETRIES = Counter(
+    "im1_pfs_auth_supplier_retries",
+    "Supplier calls that failed in a way safe to retry, by whether they were retried",
+    ["base_url", "outcome"],
+)
+
+
+def record_retry(base_url: str, outcome: str) -> None:
+    """Record a supplier call that failed in a way that is safe to retry.
+
+    Args:
+        base_url (str): Supplier base url the call was sent to
+        outcome (str): "retried", or why the retry was given up on, one of
+            "max_attempts", "deadline" and "budget"
+    """
+    SUPPLIER_RETRIES.labels(base_url, outcome).inc()
+
+
+def record_cache_lookup(cache: str, supplier: str, *, hit: bool) -> None:
+    """Record a lookup in one of the login response caches.
+
+    Args:
+        cache (str): Name of the cache, such as "session"
+        supplier (str): Supplier the login is for
+        hit (bool): Whether the login was answered from the cache
+    """
+    CACHE_LOOKUPS.labels(cache, supplier, "hit" if hit else "miss").inc()
+
+
+def record_request(timings: StageTimings, status: int) -> None:
+    """Record the stage timings of an answered login.
+
+    The network phases of each call made to the supplier are recorded too,
+    labelled by whether the call reused a pooled connection.
+
+    Args:
+        timings (StageTimings): Time spent in each stage of the login
+        status (int): Status the login was answered with
+    """
+    supplier = timings.supplier or "none"
+    status_label = str(int(status))
+    for stage, seconds in timings.durations.items():
+        STAGE_SECONDS.labels(stage, supplier, status_label).observe(seconds)
+    REQUEST_SECONDS.labels(supplier, status_label).observe(timings.elapsed())
+    for call in timings.supplier_calls:
+        connection = "reused" if call["reused"] else "new"
+        SUPPLIER_CALLS.labels(supplier, connection).inc()
+        for phase, seconds in call.items():
+            if phase != "reused":
+                SUPPLIER_PHASE_SECONDS.labels(phase, supplier, connection).observe(
+                    seconds
+                )
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render the metrics in the Prometheus text format.
+
+    Under gunicorn the samples of every worker process are aggregated.
+
+    Returns:
+        tuple[bytes, str]: Metrics and their content type
+    """
+    registry = REGISTRY
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def clear_multiprocess_dir() -> None:
+    """Removes the samples left by a previous run of the server."""
+    if MULTIPROC_DIR:
+        for path in Path(MULTIPROC_DIR).glob("*.db"):
+            path.unlink()
+
+
+def mark_process_dead(pid: int) -> None:
+    """Removes the live samples of a worker process that has exited.
+
+    Args:
+        pid (int): Process id of the worker
+    """
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid, path=MULTIPROC_DIR)
@@ -0,0 +1,30 @@
+from os import environ
+
+from app.api.domain.stage_timings import StageTimings
+
+# Off by default, so stage timings are only disclosed where it is enabled
+SERVER_TIMING_ENABLED = environ.get("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+
+def server_timing_headers(timings: StageTimings) -> dict:
+    """Server-Timing header breaking down the time spent answering a login.
+
+    Each stage is given in milliseconds, with the supplier named on the supplier
+    stage, followed by the total time taken.
+
+    Args:
+        timings (StageTimings): Time spent in each stage of the login
+
+    Returns:
+        dict: Server-Timing header, empty if it is not enabled
+    """
+    if not SERVER_TIMING_ENABLED:
+        return {}
+    metrics = []
+    for stage, seconds in timings.durations.items():
+        metric = f"{stage};dur={seconds * 1000:.1f}"
+        if stage == "supplier" and timings.supplier:
+            metric += f';desc="{timings.supplier}"'
+        metrics.append(metric)
+    metrics.append(f"total;dur={timings.elapsed() * 1000:.1f}")
+    return {"Server-Timing": ", ".join(metrics)}
@@ -0,0 +1,143 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api.domain.stage_timings import StageTimings
+from app.api.infrastructure.metrics.prometheus import (
+    clear_multiprocess_dir,
+    record_cache_lookup,
+    record_request,
+    record_retry,
+    render_metrics,
+)
+
+FILE_PATH = "app.api.infrastructure.metrics.prometheus"
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_record_request() -> None:
+    """Test each stage is observed, labelled by supplier and status."""
+    # Arrange
+    timings = StageTimings(supplier="EMIS")
+    timings.add("supplier", 0.2)
+    timings.add("transform", 0.001)
+    stage_labels = {"stage": "supplier", "supplier": "EMIS", "status": "201"}
+    request_labels = {"supplier": "EMIS", "status": "201"}
+    stage_sum = _sample("im1_pfs_auth_stage_duration_seconds_sum", stage_labels)
+    request_count = _sample(
+        "im1_pfs_auth_request_duration_seconds_count", request_labels
+    )
+
+    # Act
+    record_request(timings, 201)
+
+    # Assert
+    assert _sample(
+        "im1_pfs_auth_stage_duration_seconds_sum", stage_labels
+    ) - stage_sum == pytest.approx(0.2)
+    assert (
+        _sample("im1_pfs_auth_request_duration_seconds_count", request_labels)
+        - request_count
+        == 1
+    )
+
+
+def test_record_request_before_routing() -> None:
+    """Test a request rejected before it is routed is labelled with no supplier."""
+    # Arrange
+    timings = StageTimings()
+    timings.add("jwt_decode", 0.001)
+    labels = {"stage": "jwt_decode", "supplier": "none", "status": "401"}
+    count = _sample("im1_pfs_auth_stage_duration_seconds_count", labels)
+
+    # Act
+    record_request(timings, 401)
+
+    # Assert
+    assert _sample("im1_pfs_auth_stage_duration_seconds_count", labels) - count == 1
+
+
+def test_record_request_supplier_calls() -> None:
+    """Test the network phases of each supplier call are observed."""
+    # Arrange
+    timings = StageTimings(supplier="TPP")
+    timings.supplier_calls.append({"reused": False, "connect": 0.01, "ttfb": 0.3})
+    timings.supplier_calls.append({"reused": True, "ttfb": 0.2})
+    phase_labels = {"phase": "ttfb", "supplier": "TPP", "connection": "reused"}
+    call_labels = {"supplier": "TPP", "connection": "new"}
+    phase_sum = _sample("im1_pfs_auth_supplier_phase_seconds_sum", phase_labels)
+    call_count = _sample("im1_pfs_auth_supplier_calls_total", call_labels)
+
+    # Act
+    record_request(timings, 201)
+
+    # Assert
+    assert _sample(
+        "im1_pfs_auth_supplier_phase_seconds_sum", phase_labels
+    ) - phase_sum == pytest.approx(0.2)
+    assert _sample("im1_pfs_auth_supplier_calls_total", call_labels) - call_count == 1
+
+
+def test_record_cache_lookup() -> None:
+    """Test cache lookups are counted by cache, supplier and result."""
+    # Arrange
+    labels = {"cache": "negative", "supplier": "EMIS", "result": "hit"}
+    count = _sample("im1_pfs_auth_cache_lookups_total", labels)
+
+    # Act
+    record_cache_lookup("negative", "EMIS", hit=True)
+
+    # Assert
+    assert _sample("im1_pfs_auth_cache_lookups_total", labels) - count == 1
+
+
+def test_record_retry() -> None:
+    """Test retryable supplier failures are counted by base url and outcome."""
+    # Arrange
+    labels = {"base_url": "https://emis.com", "outcome": "deadline"}
+    count = _sample("im1_pfs_auth_supplier_retries_total", labels)
+
+    # Act
+    record_retry("https://emis.com", "deadline")
+
+    # Assert
+    assert _sample("im1_pfs_auth_supplier_retries_total", labels) - count == 1
+
+
+def test_render_metrics() -> None:
+    """Test metrics are rendered in the Prometheus text format."""
+    # Act
+    content, content_type = render_metrics()
+
+    # Assert
+    assert content_type.startswith("text/plain")
+    assert b"# TYPE im1_pfs_auth_stage_duration_seconds histogram" in content
+
+
+def test_render_metrics_multiprocess(tmp_path: Path) -> None:
+    """Test the samples written by every worker process are aggregated."""
+    # Act
+    with patch(f"{FILE_PATH}.MULTIPROC_DIR", str(tmp_path)):
+        content, _ = render_metrics()
+
+    # Assert
+    assert content == b""
+
+
+def test_clear_multiprocess_dir(tmp_path: Path) -> None:
+    """Test samples left by a previous run are removed."""
+    # Arrange
+    (tmp_path / "histogram_1.db").write_bytes(b"")
+    (tmp_path / "other.txt").write_bytes(b"")
+
+    # Act
+    with patch(f"{FILE_PATH}.MULTIPROC_DIR", str(tmp_path)):
+        clear_multiprocess_dir()
+
+    # Assert
+    assert [path.name for path in tmp_path.iterdir()] == ["other.txt"]
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from app.api.domain.stage_timings import StageTimings
+from app.api.infrastructure.metrics.server_timing import server_timing_headers
+
+FILE_PATH = "app.api.infrastructure.metrics.server_timing"
+
+
+@patch(f"{FILE_PATH}.SERVER_TIMING_ENABLED", new=True)
+def test_server_timing_headers() -> None:
+    """Test each stage is given in milliseconds, naming the supplier."""
+    # Arrange
+    timings = StageTimings(started_at=100, supplier="EMIS")
+    timings.add("jwt_decode", 0.0012)
+    timings.add("supplier", 0.2)
+    timings.add("transform", 0.00025)
+
+    # Act
+    with patch("app.api.domain.stage_timings.perf_counter", return_value=100.25):
+        actual_result = server_timing_headers(timings)
+
+    # Assert
+    assert actual_result == {
+        "Server-Timing": (
+            'jwt_decode;dur=1.2, supplier;dur=200.0;desc="EMIS", '
+            "transform;dur=0.2, total;dur=250.0"
+        )
+    }
+
+
+@patch(f"{FILE_PATH}.SERVER_TIMING_ENABLED", new=True)
+def test_server_timing_headers_before_routing() -> None:
+    """Test a login rejected before it is routed has no supplier stage."""
+    # Arrange
+    timings = StageTimings(started_at=100)
+    timings.add("jwt_decode", 0.001)
+
+    # Act
+    with patch("app.api.domain.stage_timings.perf_counter", return_value=100.001):
+        actual_result = server_timing_headers(timings)
+
+    # Assert
+    assert actual_result == {"Server-Timing": "jwt_decode;dur=1.0, total;dur=1.0"}
+
+
+@patch(f"{FILE_PATH}.SERVER_TIMING_ENABLED", new=False)
+def test_server_timing_headers_disabled() -> None:
+    """Test no header is added unless it is enabled."""
+    # Act
+    actual_result = server_timing_headers(StageTimings())
+
+    # Assert
+    assert actual_result == {}
@@ -0,0 +1,73 @@
+from collections.abc import Callable
+from os import environ
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+
+from app.api.domain.forward_response_model import EncodedResponse
+
+CHECK_INTERVAL = float(environ.get("MOCK_FIXTURE_CHECK_INTERVAL", "1"))
+MAX_RESPONSES = int(environ.get("MOCK_FIXTURE_MAX_RESPONSES", "128"))
+
+
+class MockFixture:
+    """A supplier's mocked response, loaded once per worker.
+
+    The parsed payload and the responses encoded from it are kept until the
+    fixture file changes, which is checked at most every `check_interval`
+    seconds, so mocked requests need no disk access or parsing.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        parse: Callable[[bytes], object],
+        check_interval: float = CHECK_INTERVAL,
+        max_responses: int = MAX_RESPONSES,
+    ) -> None:
+        """Initialises the fixture without loading it."""
+        self.path = path
+        self.parse = parse
+        self.check_interval = check_interval
+        self.max_responses = max_responses
+        self._lock = Lock()
+        self._checked_at = float("-inf")
+        # Replaced as a whole so readers never mix a payload with another's responses
+        self._state: tuple[int, object, dict[str, EncodedResponse]] | None = None
+
+    def _current(self) -> tuple[int, object, dict[str, EncodedResponse]]:
+        state = self._state
+        if state is not None and monotonic() - self._checked_at < self.check_interval:
+            return state
+        with self._lock:
+            mtime_ns = self.path.stat().st_mtime_ns
+            if self._state is None or self._state[0] != mtime_ns:
+                self._state = (mtime_ns, self.parse(self.path.read_bytes()), {})
+            self._checked_at = monotonic()
+            return self._state
+
+    def load(self) -> object:
+        """Fetch the parsed mocked response.
+
+        Returns:
+            object: Parsed fixture, shared between requests so must not be modified
+        """
+        return self._current()[1]
+
+    def response(self, key: str, encode: Callable[[object], str]) -> EncodedResponse:
+        """Fetch the ready-made response encoded from the mocked response.
+
+        Args:
+            key (str): Request details the encoded response depends on
+            encode (Callable[[object], str]): Encodes the parsed fixture
+
+        Returns:
+            EncodedResponse: Response encoded once per key until the fixture changes
+        """
+        _, payload, responses = self._current()
+        response = responses.get(key)
+        if response is None:
+            response = EncodedResponse(body=encode(payload))
+            if len(responses) < self.max_responses:
+                responses[key] = response
+        return response
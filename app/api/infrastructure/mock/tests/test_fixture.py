@@ -0,0 +1,85 @@
+from os import utime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.api.domain.forward_response_model import EncodedResponse
+from app.api.infrastructure.mock.fixture import MockFixture
+
+FILE_PATH = "app.api.infrastructure.mock.fixture"
+
+
+@pytest.fixture(name="path")
+def setup_path(tmp_path: Path) -> Path:
+    path = tmp_path / "mocked_response.json"
+    path.write_bytes(b"first")
+    return path
+
+
+def _touch(path: Path, content: bytes) -> None:
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_bytes(content)
+    utime(path, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+
+
+def test_mock_fixture_loads_once(path: Path) -> None:
+    """Test the fixture is parsed once and reused."""
+    # Arrange
+    parse = MagicMock(side_effect=bytes.decode)
+    fixture = MockFixture(path, parse, check_interval=0)
+
+    # Act
+    actual_result = [fixture.load(), fixture.load()]
+
+    # Assert
+    assert actual_result == ["first", "first"]
+    parse.assert_called_once_with(b"first")
+
+
+def test_mock_fixture_reloads_when_file_changes(path: Path) -> None:
+    """Test the fixture and its encoded responses are replaced when the file changes."""
+    # Arrange
+    fixture = MockFixture(path, bytes.decode, check_interval=0)
+    first_response = fixture.response("some ods code", str.upper)
+    _touch(path, b"second")
+
+    # Act
+    actual_result = fixture.response("some ods code", str.upper)
+
+    # Assert
+    assert first_response == EncodedResponse(body="FIRST")
+    assert actual_result == EncodedResponse(body="SECOND")
+
+
+def test_mock_fixture_checks_file_once_per_interval(path: Path) -> None:
+    """Test the file is not checked again within the check interval."""
+    # Arrange
+    fixture = MockFixture(path, bytes.decode, check_interval=1)
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        fixture.load()
+    _touch(path, b"second")
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=100.5):
+        cached_result = fixture.load()
+    with patch(f"{FILE_PATH}.monotonic", return_value=101):
+        actual_result = fixture.load()
+
+    # Assert
+    assert cached_result == "first"
+    assert actual_result == "second"
+
+
+def test_mock_fixture_response_encoded_once_per_key(path: Path) -> None:
+    """Test each key's response is encoded once, up to the maximum kept."""
+    # Arrange
+    encode = MagicMock(side_effect=str.upper)
+    fixture = MockFixture(path, bytes.decode, max_responses=1)
+
+    # Act
+    for key in ("first key", "first key", "second key", "second key"):
+        fixture.response(key, encode)
+
+    # Assert
+    assert encode.call_count == 3
@@ -1,7 +1,7 @@
+from contextlib import AsyncExitStack, ExitStack
 from pathlib import Path
 
-import requests
-import xmltodict
+from httpx import Timeout
 
 from app.api.domain.base_client import BaseClient
 from app.api.domain.exception import (
@@ -10,21 +10,33 @@ from app.api.domain.exception import (
     InvalidValueError,
     NotFoundError,
 )
-from app.api.domain.forward_response_model import ForwardResponse
+from app.api.domain.forward_response_model import EncodedResponse, ForwardResponse
+from app.api.infrastructure.mock.fixture import MockFixture
 from app.api.infrastructure.tpp.models import (
     Application,
+    CreateSessionReply,
     Identifier,
-    Person,
-    ServiceAccess,
-    ServiceAccessDescription,
-    ServiceAccessStatus,
-    ServiceAccessStatusDescription,
     SessionRequestData,
     SessionRequestHeaders,
     SessionResponse,
 )
+from app.api.infrastructure.tpp.parser import CreateSessionReplyParser, parse_reply
+from app.api.infrastructure.tracing.tracer import set_status_code, supplier_span
+from app.api.infrastructure.transport.async_pool import (
+    FORM_CONTENT_TYPE,
+    form_encode,
+    get_async_client,
+)
+from app.api.infrastructure.transport.body import iter_body
+from app.api.infrastructure.transport.errors import raise_for_unavailable
+from app.api.infrastructure.transport.phases import measure_phases
+from app.api.infrastructure.transport.pool import get_session
 
 BASE_DIR = Path(__file__).parent
+RESPONSE_CHUNK_SIZE = 8192
+MOCK_FIXTURE = MockFixture(
+    BASE_DIR / "data" / "mocked_response.xml", lambda body: parse_reply([body])
+)
 
 
 class TPPClient(BaseClient):
@@ -62,160 +74,161 @@ class TPPClient(BaseClient):
         request_headers = SessionRequestHeaders()
         return request_headers.to_dict()
 
-    def forward_request(self) -> dict:
+    def forward_request(self) -> CreateSessionReply:
         """Function to forward requests to TPP client.
 
+        The response body is parsed as it is read rather than buffered first, and
+        is read within the request deadline.
+
         Returns:
-            dict: Response body from forwarded request
+            CreateSessionReply: Parsed response body from forwarded request
         """
         if self.request.use_mock:
             return self._mock_response()
-        response = requests.post(
-            url=self.request.forward_to,
-            headers=self.get_headers(),
-            data=self.get_data(),
-            timeout=30,
-        )
-        response_json = xmltodict.parse(response.text)
-        match response.status_code:
-            case 201:
-                return response_json
-            case 400:
-                raise InvalidValueError(response_json.get("Error", {}).get("message"))
-            case 401:
-                raise ForbiddenError(response_json.get("Error", {}).get("message"))
-            case 404:
-                raise NotFoundError(response_json.get("Error", {}).get("message"))
-            case _:
-                raise DownstreamError
+        timeout = self.request.deadline.timeouts()
+        timings = self.request.timings
+        headers = self.get_headers()
+        with (
+            supplier_span(
+                self.supplier,
+                self.request.forward_to,
+                headers,
+                self.request.request_id,
+                self.request.correlation_id,
+            ) as span,
+            measure_phases(timings),
+            ExitStack() as stack,
+        ):
+            with timings.stage("supplier"):
+                response = stack.enter_context(
+                    get_session(self.request.forward_to).post(
+                        url=self.request.forward_to,
+                        headers=headers,
+                        data=self.get_data(),
+                        timeout=timeout,
+                        stream=True,
+                    )
+                )
+            set_status_code(span, response.status_code)
+            raise_for_unavailable(response)
+            self._check_status(response.status_code)
+            with timings.stage("parse"):
+                reply = parse_reply(
+                    iter_body(response, self.request.deadline, RESPONSE_CHUNK_SIZE)
+                )
+        return self._handle_response(response.status_code, reply)
+
+    async def forward_request_async(self) -> CreateSessionReply:
+        """Function to asynchronously forward requests to TPP client.
 
-    def transform_response(self, response: dict) -> ForwardResponse:
+        The response body is parsed as it is read rather than buffered first.
+
+        Returns:
+            CreateSessionReply: Parsed response body from forwarded request
+        """
+        if self.request.use_mock:
+            return self._mock_response()
+        connect_timeout, read_timeout = self.request.deadline.timeouts()
+        timings = self.request.timings
+        headers = {**self.get_headers(), "Content-Type": FORM_CONTENT_TYPE}
+        with (
+            supplier_span(
+                self.supplier,
+                self.request.forward_to,
+                headers,
+                self.request.request_id,
+                self.request.correlation_id,
+            ) as span,
+            measure_phases(timings) as phases,
+        ):
+            async with AsyncExitStack() as stack:
+                with timings.stage("supplier"):
+                    response = await stack.enter_async_context(
+                        get_async_client(self.request.forward_to).stream(
+                            "POST",
+                            self.request.forward_to,
+                            headers=headers,
+                            content=form_encode(self.get_data()),
+                            timeout=Timeout(read_timeout, connect=connect_timeout),
+                            extensions={"trace": phases.trace},
+                        )
+                    )
+                set_status_code(span, response.status_code)
+                raise_for_unavailable(response)
+                self._check_status(response.status_code)
+                with timings.stage("parse"):
+                    parser = CreateSessionReplyParser()
+                    async for chunk in response.aiter_bytes(RESPONSE_CHUNK_SIZE):
+                        parser.feed(chunk)
+                    reply = parser.close()
+        return self._handle_response(response.status_code, reply)
+
+    def transform_response(self, response: CreateSessionReply) -> ForwardResponse:
         """Function transform TPP client response.
 
         Args:
-            response (dict): Response body from forwarded request
+            response (CreateSessionReply): Parsed response body from forwarded request
 
         Returns:
             ForwardResponse: Homogenised response with other clients
         """
-        response = response.get("CreateSessionReply", {})
-        user_link = response.get("User", {})
-        user_person = user_link.get("Person", {})
-
         return SessionResponse(
-            sessionId=response.get("@suid"),
+            sessionId=response.session_id,
             supplier=self.supplier,
             odsCode=self.request.patient_ods_code,
-            onlineUserId=user_link.get("@onlineUserId"),
-            user=Person(
-                firstName=user_person.get("PersonName", {}).get("@firstName"),
-                surname=user_person.get("PersonName", {}).get("@surname"),
-                title=user_person.get("PersonName", {}).get("@title"),
-                dateOfBirth=user_person.get("@dateOfBirth"),
-                patientId=user_person.get("@patientId"),
-                patientIdentifiers=self._parse_identifiers(
-                    user_person.get("NationalIdentifiers", [])
-                ),
-                permissions=self._parse_permissions(
-                    user_person.get("EffectiveServiceAccess", [])
-                ),
-            ),
-            patients=self._parse_patients(response),
+            onlineUserId=response.online_user_id,
+            user=response.user,
+            patients=response.patients,
         )
 
-    def _mock_response(self) -> dict:
-        """Function to return hard coded response.
+    def _check_status(self, status_code: int) -> None:
+        """Function to reject unexpected statuses before reading the response body.
 
-        Returns:
-            dict: Hard coded response rather than forwarding request to Emis client
+        Args:
+            status_code (int): Status code of the forwarded request
         """
-        with Path((BASE_DIR) / "data" / "mocked_response.xml", encoding="utf-8").open(
-            "r"
-        ) as f:
-            mocked_response = f.read()
-        return xmltodict.parse(mocked_response)
+        if status_code not in (201, 400, 401, 404):
+            raise DownstreamError
 
-    def _parse_patients(self, data: dict) -> list[Person]:
-        """Parsing raw data from Client into structural model.
+    def _handle_response(
+        self, status_code: int, reply: CreateSessionReply
+    ) -> CreateSessionReply:
+        """Function to handle the status of the TPP client response.
 
         Args:
-            data (dict): Raw data containing information about multiple patients
+            status_code (int): Status code of the forwarded request
+            reply (CreateSessionReply): Parsed response body from forwarded request
+
+        Returns:
+            CreateSessionReply: Parsed response body from forwarded request when successful
+        """  # noqa: E501
+        match status_code:
+            case 201:
+                return reply
+            case 400:
+                raise InvalidValueError(reply.error_message)
+            case 401:
+                raise ForbiddenError(reply.error_message)
+            case 404:
+                raise NotFoundError(reply.error_message)
+            case _:
+                raise DownstreamError
+
+    def mock_response(self) -> EncodedResponse:
+        """Function to return the homogenised hard coded response.
 
         Returns:
-            list[Patient]: Parsed information about multiple patients
+            EncodedResponse: Ready-made response, kept until the mocked response changes
         """
-        # Extra Patient data
-        patient_links = data.get("PatientAccess")
-        if isinstance(
-            patient_links, dict
-        ):  # if only one patient xmltodict will not register this an array
-            patient_links = [patient_links]
-
-        parsed_patients = []
-        for patient in patient_links:
-            person = patient["Person"]
-            raw_permissions = person.get("EffectiveServiceAccess", [])
-            parsed_patients.append(
-                Person(
-                    firstName=person.get("PersonName", {}).get("@firstName"),
-                    surname=person.get("PersonName", {}).get("@surname"),
-                    title=person.get("PersonName", {}).get("@title"),
-                    dateOfBirth=person.get("@dateOfBirth"),
-                    patientId=person.get("@patientId"),
-                    patientIdentifiers=self._parse_identifiers(
-                        person.get("NationalIdentifiers", [])
-                    ),
-                    permissions=self._parse_permissions(raw_permissions),
-                )
-            )
-        return parsed_patients
-
-    def _parse_permissions(self, raw_permissions: dict | list) -> list[ServiceAccess]:
-        if not raw_permissions:
-            return []
-        # xmltodict gives us {"ServiceAccess": {...}} for one element and
-        # {"ServiceAccess": [{...}, {...}]} for multiple — extract the inner value first
-        service_access = (
-            raw_permissions.get("ServiceAccess")
-            if isinstance(raw_permissions, dict)
-            else []
-        )
-        if not service_access:
-            return []
-        if isinstance(service_access, dict):
-            # Single <ServiceAccess> element — normalise to a list
-            service_access = [service_access]
-        return [
-            ServiceAccess(
-                description=ServiceAccessDescription(service["@description"]),
-                serviceIdentifier=int(service["@serviceIdentifier"]),
-                status=ServiceAccessStatus(service["@status"]),
-                statusDescription=ServiceAccessStatusDescription(
-                    service["@statusDesc"]
-                ),
-            )
-            for service in service_access
-        ]
-
-    def _parse_identifiers(self, raw_identifiers: dict | list) -> list[Identifier]:
-        if not raw_identifiers:
-            return []
-        # xmltodict gives us {"Identifier": {...}} for one element and
-        # {"Identifier": [{...}, {...}]} for multiple — extract the inner value first
-        identifiers = (
-            raw_identifiers.get("Identifier")
-            if isinstance(raw_identifiers, dict)
-            else []
+        return MOCK_FIXTURE.response(
+            self.request.patient_ods_code,
+            lambda response: self.transform_response(response).to_json(),
         )
-        if not identifiers:
-            return []
-        if isinstance(identifiers, dict):
-            # Single <Identifier> element — normalise to a list
-            identifiers = [identifiers]
-        return [
-            Identifier(
-                value=identifier.get("@value"),
-                type=identifier.get("@type"),
-            )
-            for identifier in identifiers
-        ]
+
+    def _mock_response(self) -> CreateSessionReply:
+        """Function to return hard coded response.
+
+        Returns:
+            CreateSessionReply: Hard coded response rather than forwarding request to TPP client
+        """  # noqa: E501
+        return MOCK_FIXTURE.load()
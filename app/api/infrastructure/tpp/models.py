@@ -135,3 +135,13 @@ class SessionResponse(ForwardResponse):
     online_user_id: str
     user: Person
     patients: list[Person]
+
+
+class CreateSessionReply(BaseModel):
+    """Base Model for the parts of a TPP CreateSessionReply or Error response used."""
+
+    session_id: str | None = None
+    online_user_id: str | None = None
+    user: Person | None = None
+    patients: list[Person] = []
+    error_message: str | None = None
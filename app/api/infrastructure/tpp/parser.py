@@ -0,0 +1,157 @@
+from collections.abc import Iterable
+from os import environ
+from xml.parsers.expat import XML_PARAM_ENTITY_PARSING_NEVER, ParserCreate
+
+from app.api.infrastructure.tpp.models import (
+    CreateSessionReply,
+    Identifier,
+    Person,
+    ServiceAccess,
+    ServiceAccessDescription,
+    ServiceAccessStatus,
+    ServiceAccessStatusDescription,
+)
+
+MAX_DEPTH = int(environ.get("TPP_REPLY_MAX_DEPTH", "16"))
+
+
+class UnsafeXMLError(ValueError):
+    """Exception for supplier XML that could exhaust resources when parsed."""
+
+
+class _PersonBuilder:
+    """Collects the parts of a <Person> element as they are parsed."""
+
+    def __init__(self, attrs: dict[str, str]) -> None:
+        self.attrs = attrs
+        self.name: dict[str, str] = {}
+        self.identifiers: list[Identifier] = []
+        self.permissions: list[ServiceAccess] = []
+
+    def build(self) -> Person:
+        return Person(
+            firstName=self.name.get("firstName"),
+            surname=self.name.get("surname"),
+            title=self.name.get("title"),
+            dateOfBirth=self.attrs.get("dateOfBirth"),
+            patientId=self.attrs.get("patientId"),
+            patientIdentifiers=self.identifiers,
+            permissions=self.permissions,
+        )
+
+
+class CreateSessionReplyParser:
+    """Incremental parser for TPP CreateSessionReply and Error responses.
+
+    Models are built as each element is parsed, so only the person currently
+    being parsed is held in memory besides the finished models. Document type
+    declarations are rejected, which rules out entity expansion, and elements
+    may not be nested more than `max_depth` deep.
+    """
+
+    def __init__(self, max_depth: int = MAX_DEPTH) -> None:
+        """Initialises the parser for a new response."""
+        self.max_depth = max_depth
+        self.reply = CreateSessionReply()
+        self._stack: list[str] = []
+        self._person: _PersonBuilder | None = None
+        self._message: list[str] | None = None
+        self._parser = ParserCreate()
+        self._parser.SetParamEntityParsing(XML_PARAM_ENTITY_PARSING_NEVER)
+        self._parser.StartDoctypeDeclHandler = self._reject_doctype
+        self._parser.EntityDeclHandler = self._reject_doctype
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._character_data
+
+    def feed(self, chunk: bytes) -> None:
+        """Parses the next chunk of the response body.
+
+        Args:
+            chunk (bytes): Part of the response body
+
+        Raises:
+            ExpatError: If the response is not well formed XML
+            UnsafeXMLError: If the response breaks the parsing limits
+        """
+        self._parser.Parse(chunk, False)  # noqa: FBT003
+
+    def close(self) -> CreateSessionReply:
+        """Finishes parsing the response body.
+
+        Returns:
+            CreateSessionReply: Parsed response
+        """
+        self._parser.Parse(b"", True)  # noqa: FBT003
+        return self.reply
+
+    def _reject_doctype(self, *_args: object) -> None:
+        msg = "Document type declarations are not allowed"
+        raise UnsafeXMLError(msg)
+
+    def _start_element(self, name: str, attrs: dict[str, str]) -> None:
+        if len(self._stack) >= self.max_depth:
+            msg = f"Elements nested more than {self.max_depth} deep"
+            raise UnsafeXMLError(msg)
+        parent = self._stack[-1] if self._stack else None
+        grandparent = self._stack[-2] if len(self._stack) > 1 else None
+        self._stack.append(name)
+        match (grandparent, parent, name):
+            case (None, None, "CreateSessionReply"):
+                self.reply.session_id = attrs.get("suid")
+            case (None, "CreateSessionReply", "User"):
+                self.reply.online_user_id = attrs.get("onlineUserId")
+            case ("CreateSessionReply", "User" | "PatientAccess", "Person"):
+                self._person = _PersonBuilder(attrs)
+            case (_, "Person", "PersonName") if self._person:
+                self._person.name = attrs
+            case ("Person", "NationalIdentifiers", "Identifier") if self._person:
+                self._person.identifiers.append(
+                    Identifier(value=attrs.get("value"), type=attrs.get("type"))
+                )
+            case ("Person", "EffectiveServiceAccess", "ServiceAccess") if self._person:
+                self._person.permissions.append(
+                    ServiceAccess(
+                        description=ServiceAccessDescription(attrs["description"]),
+                        serviceIdentifier=int(attrs["serviceIdentifier"]),
+                        status=ServiceAccessStatus(attrs["status"]),
+                        statusDescription=ServiceAccessStatusDescription(
+                            attrs["statusDesc"]
+                        ),
+                    )
+                )
+            case (None, "Error", "message"):
+                self._message = []
+
+    def _end_element(self, name: str) -> None:
+        self._stack.pop()
+        parent = self._stack[-1] if self._stack else None
+        if name == "Person" and self._person and parent in ("User", "PatientAccess"):
+            person = self._person.build()
+            self._person = None
+            if parent == "User":
+                self.reply.user = person
+            else:
+                self.reply.patients.append(person)
+        elif name == "message" and self._message is not None:
+            self.reply.error_message = "".join(self._message).strip() or None
+            self._message = None
+
+    def _character_data(self, data: str) -> None:
+        if self._message is not None:
+            self._message.append(data)
+
+
+def parse_reply(chunks: Iterable[bytes]) -> CreateSessionReply:
+    """Parses a TPP response body from an iterable of chunks.
+
+    Args:
+        chunks (Iterable[bytes]): Response body chunks
+
+    Returns:
+        CreateSessionReply: Parsed response
+    """
+    parser = CreateSessionReplyParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
@@ -1,18 +1,22 @@
+import asyncio
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
-import xmltodict
+from httpx import Timeout
 from pydantic import ValidationError
 
+from app.api.domain.deadline import Deadline
 from app.api.domain.exception import (
     ApiError,
     DownstreamError,
     ForbiddenError,
+    GatewayTimeoutError,
     InvalidValueError,
     NotFoundError,
 )
 from app.api.domain.forward_request_model import ForwardRequest
+from app.api.domain.forward_response_model import EncodedResponse
 from app.api.infrastructure.tpp.client import TPPClient
 from app.api.infrastructure.tpp.models import (
     Identifier,
@@ -23,11 +27,12 @@ from app.api.infrastructure.tpp.models import (
     ServiceAccessStatusDescription,
     SessionResponse,
 )
+from app.api.infrastructure.tpp.parser import parse_reply
 
-with Path("app/api/infrastructure/tpp/data/mocked_response.xml", encoding="utf-8").open(
-    "r"
-) as f:
-    MOCKED_RESPONSE = f.read()
+MOCKED_RESPONSE = Path(
+    "app/api/infrastructure/tpp/data/mocked_response.xml"
+).read_bytes()
+MOCKED_REPLY = parse_reply([MOCKED_RESPONSE])
 
 
 @pytest.fixture(name="client")
@@ -86,24 +91,119 @@ def test_tpp_forward_request_use_mock_on(client: TPPClient) -> None:
     actual_result = client.forward_request()
 
     # Assert
-    assert actual_result == xmltodict.parse(MOCKED_RESPONSE)
+    assert actual_result == MOCKED_REPLY
 
 
-@patch("app.api.infrastructure.tpp.client.requests")
+@patch("app.api.infrastructure.tpp.client.get_session")
 def test_tpp_forward_request_use_mock_off(
-    mock_request: MagicMock, client: TPPClient
+    mock_get_session: MagicMock, client: TPPClient
 ) -> None:
     """Test the TPPClient forward_request function when mock is turned off."""
     # Arrange
     mock_instance = MagicMock()
     mock_instance.status_code = 201
-    mock_instance.text = MOCKED_RESPONSE
-    mock_request.post.return_value = mock_instance
+    mock_instance.iter_content.return_value = [
+        MOCKED_RESPONSE[:100],
+        MOCKED_RESPONSE[100:],
+    ]
+    mock_get_session.return_value.post.return_value.__enter__.return_value = (
+        mock_instance
+    )
     # Act
     actual_result = client.forward_request()
 
     # Assert
-    assert actual_result == xmltodict.parse(MOCKED_RESPONSE)
+    assert actual_result == MOCKED_REPLY
+    mock_get_session.assert_called_once_with("https://tpp.com")
+    assert mock_get_session.return_value.post.call_args.kwargs["stream"] is True
+    assert set(client.request.timings.durations) == {"supplier", "parse"}
+
+
+def test_tpp_forward_request_async_use_mock_on(client: TPPClient) -> None:
+    """Test the TPPClient forward_request_async function when mock is turned on."""
+    # Arrange
+    client.request.use_mock = True
+    # Act
+    actual_result = asyncio.run(client.forward_request_async())
+
+    # Assert
+    assert actual_result == MOCKED_REPLY
+
+
+@patch("app.api.infrastructure.tpp.client.get_async_client")
+def test_tpp_forward_request_async_use_mock_off(
+    mock_get_async_client: MagicMock, client: TPPClient
+) -> None:
+    """Test the TPPClient forward_request_async function when mock is turned off."""
+    # Arrange
+    mock_instance = MagicMock()
+    mock_instance.status_code = 201
+    mock_instance.aiter_bytes.return_value.__aiter__.return_value = [
+        MOCKED_RESPONSE[:100],
+        MOCKED_RESPONSE[100:],
+    ]
+    mock_stream = mock_get_async_client.return_value.stream
+    mock_stream.return_value.__aenter__.return_value = mock_instance
+    client.request.deadline = MagicMock(timeouts=MagicMock(return_value=(5, 20)))
+    # Act
+    actual_result = asyncio.run(client.forward_request_async())
+
+    # Assert
+    assert actual_result == MOCKED_REPLY
+    mock_get_async_client.assert_called_once_with("https://tpp.com")
+    call = mock_stream.call_args
+    assert call.args == ("POST", "https://tpp.com")
+    assert call.kwargs["headers"] == {
+        "type": "CreateSession",
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+    assert call.kwargs["timeout"] == Timeout(20, connect=5)
+
+
+@patch("app.api.infrastructure.tpp.client.get_async_client")
+def test_tpp_forward_request_async_deadline_exceeded(
+    mock_get_async_client: MagicMock, client: TPPClient
+) -> None:
+    """Test the TPPClient forward_request_async function when the deadline has passed."""  # noqa: E501
+    # Arrange
+    client.request.deadline = Deadline(expires_at=0)
+    # Act & Assert
+    with pytest.raises(GatewayTimeoutError, match="deadline exceeded"):
+        asyncio.run(client.forward_request_async())
+    mock_get_async_client.assert_not_called()
+
+
+@patch("app.api.infrastructure.tpp.client.get_async_client")
+def test_tpp_forward_request_async_exception(
+    mock_get_async_client: MagicMock, client: TPPClient
+) -> None:
+    """Test the TPPClient forward_request_async function when there is an error."""
+    # Arrange
+    mock_instance = MagicMock()
+    mock_instance.status_code = 401
+    mock_instance.aiter_bytes.return_value.__aiter__.return_value = [
+        b"<Error><message>Unauthorised.</message></Error>"
+    ]
+    mock_get_async_client.return_value.stream.return_value.__aenter__.return_value = (
+        mock_instance
+    )
+    # Act & Assert
+    with pytest.raises(ForbiddenError, match="Unauthorised"):
+        asyncio.run(client.forward_request_async())
+
+
+@patch("app.api.infrastructure.tpp.client.get_session")
+def test_tpp_forward_request_times_failed_supplier_call(
+    mock_get_session: MagicMock, client: TPPClient
+) -> None:
+    """Test a supplier call that fails is still timed as the supplier stage."""
+    # Arrange
+    mock_get_session.return_value.post.side_effect = ConnectionError("refused")
+    # Act & Assert
+    with pytest.raises(ConnectionError):
+        client.forward_request()
+    assert "supplier" in client.request.timings.durations
+    assert "parse" not in client.request.timings.durations
 
 
 @pytest.mark.parametrize(
@@ -115,9 +215,9 @@ def test_tpp_forward_request_use_mock_off(
         (500, "", DownstreamError),
     ],
 )
-@patch("app.api.infrastructure.tpp.client.requests")
+@patch("app.api.infrastructure.tpp.client.get_session")
 def test_tpp_forward_request_use_mock_off_exception(
-    mock_request: MagicMock,
+    mock_get_session: MagicMock,
     client: TPPClient,
     status_code: int,
     error_msg: str,
@@ -127,10 +227,12 @@ def test_tpp_forward_request_use_mock_off_exception(
     # Arrange
     mock_instance = MagicMock()
     mock_instance.status_code = status_code
-    mock_instance.text = f"""<Error>
-        <message>{error_msg}</message>
-        </Error>"""
-    mock_request.post.return_value = mock_instance
+    mock_instance.iter_content.return_value = [
+        f"<Error><message>{error_msg}</message></Error>".encode()
+    ]
+    mock_get_session.return_value.post.return_value.__enter__.return_value = (
+        mock_instance
+    )
     # Act & Assert
     with pytest.raises(api_error, match=error_msg):
         client.forward_request()
@@ -139,7 +241,7 @@ def test_tpp_forward_request_use_mock_off_exception(
 def test_tpp_client_transform_response(client: TPPClient) -> None:
     """Test the TPPClient transform_response function."""
     # Act
-    actual_result = client.transform_response(xmltodict.parse(MOCKED_RESPONSE))
+    actual_result = client.transform_response(MOCKED_REPLY)
 
     # Assert
     assert actual_result == SessionResponse(
@@ -349,58 +451,56 @@ def test_tpp_client_transform_response(client: TPPClient) -> None:
 @pytest.mark.parametrize(
     "response",
     [
-        {},
-        {  # Missing PatientAccess
-            "suid": "some session",
-            "User": {
-                "Person": {
-                    "PersonName": {
-                        "firstName": "someone's first name",
-                        "surname": "someone's surname",
-                        "title": "someone's title",
-                    }
-                }
-            },
-        },
-        {  # Missing Proxy Demographic information
-            "SessionId": "some session",
-            "PatientAccess": [
-                {
-                    "PersonName": {
-                        "firstName": "someone's first name",
-                        "surname": "someone's surname",
-                        "title": "someone's title",
-                    }
-                }
-            ],
-        },
-        {  # Missing Session Id
-            "User": {
-                "Person": {
-                    "PersonName": {
-                        "firstName": "someone's first name",
-                        "surname": "someone's surname",
-                        "title": "someone's title",
-                    }
-                }
-            },
-            "PatientAccess": [
-                {
-                    "PersonName": {
-                        "firstName": "someone's first name",
-                        "surname": "someone's surname",
-                        "title": "someone's title",
-                    }
-                }
-            ],
-        },
+        b"<CreateSessionReply/>",
+        # Missing PatientAccess
+        b"""<CreateSessionReply suid="some session">
+            <User onlineUserId="some user">
+                <Person dateOfBirth="1990-11-05">
+                    <PersonName title="Mr" firstName="Sam" surname="Jones"/>
+                </Person>
+            </User>
+        </CreateSessionReply>""",
+        # Missing Proxy Demographic information
+        b"""<CreateSessionReply suid="some session">
+            <User onlineUserId="some user"><Person/></User>
+            <PatientAccess>
+                <Person patientId="some patient" dateOfBirth="1975-04-21">
+                    <PersonName title="Mrs" firstName="Clare" surname="Jones"/>
+                </Person>
+            </PatientAccess>
+        </CreateSessionReply>""",
+        # Missing Session Id
+        b"""<CreateSessionReply>
+            <User onlineUserId="some user">
+                <Person dateOfBirth="1990-11-05">
+                    <PersonName title="Mr" firstName="Sam" surname="Jones"/>
+                </Person>
+            </User>
+            <PatientAccess>
+                <Person patientId="some patient" dateOfBirth="1975-04-21">
+                    <PersonName title="Mrs" firstName="Clare" surname="Jones"/>
+                </Person>
+            </PatientAccess>
+        </CreateSessionReply>""",
     ],
 )
 def test_tpp_client_transform_response_raise_validation_error(
-    response: dict,
+    response: bytes,
     client: TPPClient,
 ) -> None:
     """Test the TPPClient transform_response function raises validation error."""
     # Act & Assert
     with pytest.raises(ValidationError):
-        client.transform_response(response)
+        client.transform_response(parse_reply([response]))
+
+
+def test_tpp_client_mock_response(client: TPPClient) -> None:
+    """Test the TPPClient mock_response function returns the encoded mocked response."""
+    # Act
+    actual_result = client.mock_response()
+
+    # Assert
+    assert actual_result == EncodedResponse(
+        body=client.transform_response(MOCKED_REPLY).to_json()
+    )
+    assert client.mock_response() is actual_result
@@ -0,0 +1,121 @@
+from xml.parsers.expat import ExpatError
+
+import pytest
+
+from app.api.infrastructure.tpp.models import CreateSessionReply, Identifier, Person
+from app.api.infrastructure.tpp.parser import (
+    CreateSessionReplyParser,
+    UnsafeXMLError,
+    parse_reply,
+)
+
+REPLY = b"""<CreateSessionReply suid="some session">
+  <User onlineUserId="some user">
+    <Person dateOfBirth="1990-11-05">
+      <PersonName title="Mr" firstName="Sam" surname="Jones"/>
+      <NationalIdentifiers>
+        <Identifier value="1111111111" type="NhsNumber"/>
+      </NationalIdentifiers>
+    </Person>
+  </User>
+  <PatientAccess>
+    <Person patientId="first patient" dateOfBirth="1975-04-21">
+      <PersonName title="Mrs" firstName="Clare" surname="Jones"/>
+    </Person>
+  </PatientAccess>
+  <PatientAccess>
+    <Person patientId="second patient" dateOfBirth="2010-01-01">
+      <PersonName title="Miss" firstName="Amy" surname="Jones"/>
+    </Person>
+  </PatientAccess>
+</CreateSessionReply>"""
+
+
+def test_parse_reply_in_chunks() -> None:
+    """Test a reply split into single bytes parses the same as a whole reply."""
+    # Act
+    actual_result = parse_reply(REPLY[i : i + 1] for i in range(len(REPLY)))
+
+    # Assert
+    assert actual_result == parse_reply([REPLY])
+    assert actual_result == CreateSessionReply(
+        session_id="some session",
+        online_user_id="some user",
+        user=Person(
+            firstName="Sam",
+            surname="Jones",
+            title="Mr",
+            dateOfBirth="1990-11-05",
+            patientId=None,
+            patientIdentifiers=[Identifier(value="1111111111", type="NhsNumber")],
+            permissions=[],
+        ),
+        patients=[
+            Person(
+                firstName="Clare",
+                surname="Jones",
+                title="Mrs",
+                dateOfBirth="1975-04-21",
+                patientId="first patient",
+                patientIdentifiers=[],
+                permissions=[],
+            ),
+            Person(
+                firstName="Amy",
+                surname="Jones",
+                title="Miss",
+                dateOfBirth="2010-01-01",
+                patientId="second patient",
+                patientIdentifiers=[],
+                permissions=[],
+            ),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    ("response", "expected_result"),
+    [
+        (b"<Error><message> Not Found. </message></Error>", "Not Found."),
+        (b"<Error><message/></Error>", None),
+        (b"<Error/>", None),
+    ],
+)
+def test_parse_reply_error(response: bytes, expected_result: str | None) -> None:
+    """Test the message of an Error response is parsed."""
+    # Act
+    actual_result = parse_reply([response])
+
+    # Assert
+    assert actual_result.error_message == expected_result
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        b'<!DOCTYPE r [<!ENTITY a "aaaa">]><Error><message>&a;</message></Error>',
+        b'<!DOCTYPE r SYSTEM "http://example.com/r.dtd"><Error/>',
+    ],
+)
+def test_parse_reply_rejects_doctype(response: bytes) -> None:
+    """Test document type declarations, and so entity expansion, are rejected."""
+    # Act & Assert
+    with pytest.raises(UnsafeXMLError, match="Document type declarations"):
+        parse_reply([response])
+
+
+def test_parser_rejects_deep_nesting() -> None:
+    """Test elements nested deeper than the limit are rejected."""
+    # Arrange
+    parser = CreateSessionReplyParser(max_depth=3)
+
+    # Act & Assert
+    with pytest.raises(UnsafeXMLError, match="nested more than 3 deep"):
+        parser.feed(b"<a><b><c><d>")
+
+
+def test_parse_reply_malformed() -> None:
+    """Test a truncated reply raises an error once parsing is finished."""
+    # Act & Assert
+    with pytest.raises(ExpatError):
+        parse_reply([REPLY[:-10]])
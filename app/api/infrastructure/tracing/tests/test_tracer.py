@@ -0,0 +1,261 @@
+from json import loads
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode, Tracer, set_span_in_context
+
+from app.api.infrastructure.tracing.tracer import (
+    JsonLinesFileExporter,
+    TailSamplingProcessor,
+    correlation_headers,
+    server_span,
+    set_status_code,
+    start_tracing,
+    supplier_span,
+    tracing_stats,
+)
+
+FILE_PATH = "app.api.infrastructure.tracing.tracer"
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+def _tracer(
+    exporter: InMemorySpanExporter, **kwargs: float
+) -> tuple[Tracer, TailSamplingProcessor]:
+    sampler = TailSamplingProcessor(SimpleSpanProcessor(exporter), **kwargs)
+    provider = TracerProvider()
+    provider.add_span_processor(sampler)
+    return provider.get_tracer("test"), sampler
+
+
+def test_tail_sampling_keeps_failed_trace() -> None:
+    """Test a trace with a failed span is kept, along with all of its spans."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _tracer(exporter, slow_threshold=60, sample_ratio=0)
+
+    # Act
+    with tracer.start_as_current_span("root"):
+        with tracer.start_as_current_span("supplier") as span:
+            span.set_status(StatusCode.ERROR)
+        with tracer.start_as_current_span("transform"):
+            pass
+
+    # Assert
+    assert [span.name for span in exporter.get_finished_spans()] == [
+        "supplier",
+        "transform",
+        "root",
+    ]
+    assert sampler.stats() == {"pending": 0, "kept": 1, "dropped": 0}
+
+
+@pytest.mark.parametrize(
+    ("status_code", "sample_ratio", "expected_kept"),
+    [(502, 0, 1), (404, 0, 0), (404, 1, 1)],
+)
+def test_tail_sampling_answered_traces(
+    status_code: int, sample_ratio: float, expected_kept: int
+) -> None:
+    """Test server errors are kept and client errors are sampled like successes."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _tracer(exporter, slow_threshold=60, sample_ratio=sample_ratio)
+
+    # Act
+    with tracer.start_as_current_span("root") as root:
+        with tracer.start_as_current_span("route_and_forward") as span:
+            span.set_status(StatusCode.ERROR)
+        set_status_code(root, status_code)
+
+    # Assert
+    assert len(exporter.get_finished_spans()) == expected_kept * 2
+    assert sampler.stats()["kept"] == expected_kept
+
+
+def test_tail_sampling_keeps_slow_trace() -> None:
+    """Test a trace slower than the threshold is kept."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, _ = _tracer(exporter, slow_threshold=1, sample_ratio=0)
+
+    # Act
+    with tracer.start_as_current_span("root", start_time=0, end_on_exit=False) as span:
+        span.end(end_time=1_500_000_000)
+
+    # Assert
+    assert [span.name for span in exporter.get_finished_spans()] == ["root"]
+
+
+@pytest.mark.parametrize(("sample_ratio", "expected_kept"), [(0, 0), (1, 1)])
+def test_tail_sampling_samples_fast_successes(
+    sample_ratio: float, expected_kept: int
+) -> None:
+    """Test fast successful traces are only kept at the sample ratio."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _tracer(exporter, slow_threshold=60, sample_ratio=sample_ratio)
+
+    # Act
+    with (
+        tracer.start_as_current_span("root"),
+        tracer.start_as_current_span("supplier"),
+    ):
+        pass
+
+    # Assert
+    assert len(exporter.get_finished_spans()) == expected_kept * 2
+    assert sampler.stats()["kept"] == expected_kept
+
+
+def test_tail_sampling_decides_at_local_root() -> None:
+    """Test a trace continued from a caller is decided when its local root ends."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _tracer(exporter, slow_threshold=60, sample_ratio=1)
+
+    # Act
+    with (
+        patch(f"{FILE_PATH}.tracer", tracer),
+        server_span("POST /authenticate", {"traceparent": TRACEPARENT}, {}),
+    ):
+        pass
+
+    # Assert
+    (span,) = exporter.get_finished_spans()
+    assert format(span.context.trace_id, "032x") == TRACEPARENT[3:35]
+    assert sampler.stats()["pending"] == 0
+
+
+def test_tail_sampling_bounds_pending_traces() -> None:
+    """Test the spans of traces that have not finished are bounded."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _tracer(exporter, max_pending=2)
+    roots = [tracer.start_span("root") for _ in range(3)]
+
+    # Act
+    for root in roots:
+        with tracer.start_as_current_span(
+            "supplier", context=set_span_in_context(root)
+        ):
+            pass
+
+    # Assert
+    assert sampler.stats() == {"pending": 2, "kept": 0, "dropped": 1}
+
+
+def test_supplier_span_propagates_trace() -> None:
+    """Test the trace context is added to the headers sent to the supplier."""
+    # Arrange
+    exporter = InMemorySpanExporter()
+    tracer, _ = _tracer(exporter, sample_ratio=1)
+    headers = {"X-API-Version": "1"}
+
+    # Act
+    with (
+        patch(f"{FILE_PATH}.tracer", tracer),
+        tracer.start_as_current_span("root"),
+        supplier_span("EMIS", "https://emis.com", headers) as span,
+    ):
+        set_status_code(span, 502)
+
+    # Assert
+    supplier, _ = exporter.get_finished_spans()
+    assert headers["traceparent"].startswith(
+        f"00-{supplier.context.trace_id:032x}-{supplier.context.span_id:016x}-"
+    )
+    assert supplier.attributes["http.response.status_code"] == 502
+    assert supplier.status.status_code is StatusCode.ERROR
+
+
+def test_supplier_span_forwards_request_ids() -> None:
+    """Test the request and correlation ids are added to the supplier headers."""
+    # Arrange
+    headers = {"X-API-Version": "1"}
+
+    # Act
+    with supplier_span(
+        "EMIS", "https://emis.com", headers, "request id", "correlation id"
+    ):
+        pass
+
+    # Assert
+    assert headers["NHSE-Request-ID"] == "request id"
+    assert headers["NHSE-Correlation-ID"] == "correlation id"
+
+
+def test_supplier_span_without_request_ids() -> None:
+    """Test no id headers are sent to the supplier when the request had none."""
+    # Arrange
+    headers = {"X-API-Version": "1"}
+
+    # Act
+    with supplier_span("EMIS", "https://emis.com", headers):
+        pass
+
+    # Assert
+    assert "NHSE-Request-ID" not in headers
+    assert "NHSE-Correlation-ID" not in headers
+
+
+def test_json_lines_file_exporter(tmp_path: Path) -> None:
+    """Test spans are written to the file one per line."""
+    # Arrange
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonLinesFileExporter(path)
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+
+    # Act
+    for name in ("first", "second"):
+        with tracer.start_as_current_span(name):
+            pass
+    provider.shutdown()
+
+    # Assert
+    lines = path.read_text().splitlines()
+    assert [loads(line)["name"] for line in lines] == ["first", "second"]
+
+
+@pytest.mark.parametrize(
+    ("request_id", "correlation_id", "expected_headers"),
+    [
+        ("some request id", None, {"NHSE-Request-ID": "some request id"}),
+        (
+            "some request id",
+            "some correlation id",
+            {
+                "NHSE-Request-ID": "some request id",
+                "NHSE-Correlation-ID": "some correlation id",
+            },
+        ),
+        (None, None, {}),
+    ],
+)
+def test_correlation_headers(
+    request_id: str | None, correlation_id: str | None, expected_headers: dict
+) -> None:
+    """Test the ids a request was made with are mirrored back."""
+    # Act
+    actual_result = correlation_headers(request_id, correlation_id)
+
+    # Assert
+    assert actual_result == expected_headers
+
+
+@patch(f"{FILE_PATH}.TRACING_ENABLED", new=False)
+def test_start_tracing_disabled() -> None:
+    """Test tracing is not started unless it is enabled."""
+    # Act
+    start_tracing()
+
+    # Assert
+    assert tracing_stats() == {}
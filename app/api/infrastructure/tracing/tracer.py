@@ -0,0 +1,288 @@
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from os import environ
+from pathlib import Path
+from random import random
+from threading import Lock
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import Span, SpanKind, StatusCode
+
+TRACING_ENABLED = environ.get("TRACING_ENABLED", "false").lower() == "true"
+TRACE_EXPORT_FILE = environ.get("TRACE_EXPORT_FILE", "traces.jsonl")
+TRACE_SLOW_THRESHOLD = float(environ.get("TRACE_SLOW_THRESHOLD", "1"))
+TRACE_SAMPLE_RATIO = float(environ.get("TRACE_SAMPLE_RATIO", "0.01"))
+TRACE_MAX_PENDING = int(environ.get("TRACE_MAX_PENDING", "1000"))
+
+tracer = trace.get_tracer("app.api")
+
+
+class JsonLinesFileExporter(SpanExporter):
+    """Exports spans to a local file, one JSON document per line.
+
+    Stands in for a collector when running locally and in tests.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialises the exporter, appending to the file."""
+        self._file = Path(path).open("a", encoding="utf-8")  # noqa: SIM115
+        self._lock = Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Writes a batch of spans to the file.
+
+        Args:
+            spans (Sequence[ReadableSpan]): Spans to export
+
+        Returns:
+            SpanExportResult: Whether the spans were written
+        """
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        """Closes the file."""
+        with self._lock:
+            self._file.close()
+
+
+class TailSamplingProcessor(SpanProcessor):
+    """Decides whether to keep a trace once its local root span has ended.
+
+    Every trace answered with a server error, with a failed span or with a root
+    span slower than `slow_threshold` seconds is kept, other traces are kept
+    with a probability of `sample_ratio`. A trace answered with a client error
+    is sampled like a success, even though the error failed its inner spans,
+    so rejected logins do not crowd out the traces worth keeping. Spans are
+    held until the decision is made, for at most `max_pending` traces at a time.
+    """
+
+    def __init__(
+        self,
+        next_processor: SpanProcessor,
+        slow_threshold: float = TRACE_SLOW_THRESHOLD,
+        sample_ratio: float = TRACE_SAMPLE_RATIO,
+        max_pending: int = TRACE_MAX_PENDING,
+    ) -> None:
+        """Initialises the processor with the processor kept spans are passed to."""
+        self.next_processor = next_processor
+        self.slow_threshold = slow_threshold
+        self.sample_ratio = sample_ratio
+        self.max_pending = max_pending
+        self.kept = 0
+        self.dropped = 0
+        self._lock = Lock()
+        self._pending: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        """Spans are only considered once they have ended."""
+
+    def on_end(self, span: ReadableSpan) -> None:
+        """Holds an ended span until the decision on its trace is made.
+
+        Args:
+            span (ReadableSpan): Span that has ended
+        """
+        trace_id = span.context.trace_id
+        with self._lock:
+            spans = self._pending.setdefault(trace_id, [])
+            spans.append(span)
+            if span.parent is not None and not span.parent.is_remote:
+                while len(self._pending) > self.max_pending:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                return
+            del self._pending[trace_id]
+            keep = self._keep(span, spans)
+            if keep:
+                self.kept += 1
+            else:
+                self.dropped += 1
+        if keep:
+            for pending_span in spans:
+                self.next_processor.on_end(pending_span)
+
+    def _keep(self, root: ReadableSpan, spans: list[ReadableSpan]) -> bool:
+        if (root.end_time - root.start_time) / 1e9 >= self.slow_threshold:
+            return True
+        status_code = (root.attributes or {}).get("http.response.status_code", 0)
+        if status_code >= 500:
+            return True
+        if status_code < 400 and any(
+            span.status.status_code is StatusCode.ERROR for span in spans
+        ):
+            return True
+        return random() < self.sample_ratio  # noqa: S311
+
+    def shutdown(self) -> None:
+        """Shuts down the processor kept spans are passed to."""
+        self.next_processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Flushes the spans already kept.
+
+        Args:
+            timeout_millis (int): Milliseconds to wait for the spans to be flushed
+
+        Returns:
+            bool: Whether the spans were flushed in time
+        """
+        return self.next_processor.force_flush(timeout_millis)
+
+    def stats(self) -> dict:
+        """Statistics about the sampling decisions.
+
+        Returns:
+            dict: Pending traces and the traces kept and dropped
+        """
+        return {
+            "pending": len(self._pending),
+            "kept": self.kept,
+            "dropped": self.dropped,
+        }
+
+
+_providers: list[TracerProvider] = []
+_samplers: list[TailSamplingProcessor] = []
+
+
+def start_tracing() -> None:
+    """Starts exporting sampled traces from this process, if tracing is enabled.
+
+    Called after a worker process is forked, as the export thread does not
+    survive a fork.
+    """
+    if not TRACING_ENABLED or _providers:
+        return
+    sampler = TailSamplingProcessor(
+        BatchSpanProcessor(JsonLinesFileExporter(TRACE_EXPORT_FILE))
+    )
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "im1-pfs-auth"})
+    )
+    provider.add_span_processor(sampler)
+    trace.set_tracer_provider(provider)
+    _providers.append(provider)
+    _samplers.append(sampler)
+
+
+def stop_tracing() -> None:
+    """Exports the traces already kept and stops tracing."""
+    while _providers:
+        _providers.pop().shutdown()
+    _samplers.clear()
+
+
+def tracing_stats() -> dict:
+    """Statistics about tracing in this process.
+
+    Returns:
+        dict: Sampling statistics, empty if tracing is not running
+    """
+    return _samplers[0].stats() if _samplers else {}
+
+
+def correlation_headers(request_id: str | None, correlation_id: str | None) -> dict:
+    """Headers mirroring the ids a request was made with back in its response.
+
+    Args:
+        request_id (str | None): NHSE-Request-ID of the request
+        correlation_id (str | None): NHSE-Correlation-ID of the request
+
+    Returns:
+        dict: Headers for the ids the request was made with
+    """
+    headers = {}
+    if request_id:
+        headers["NHSE-Request-ID"] = request_id
+    if correlation_id:
+        headers["NHSE-Correlation-ID"] = correlation_id
+    return headers
+
+
+@contextmanager
+def server_span(
+    name: str, headers: Mapping[str, str], attributes: dict
+) -> Iterator[Span]:
+    """Trace the handling of an incoming request.
+
+    The trace continues the one in the request's traceparent header, if any.
+
+    Args:
+        name (str): Name of the span, such as "POST /authenticate"
+        headers (Mapping[str, str]): Request headers
+        attributes (dict): Attributes of the request, such as its ids
+
+    Yields:
+        Span: Span for the request
+    """
+    with tracer.start_as_current_span(
+        name,
+        context=propagate.extract(headers),
+        kind=SpanKind.SERVER,
+        attributes={key: value for key, value in attributes.items() if value},
+    ) as span:
+        yield span
+
+
+@contextmanager
+def supplier_span(
+    supplier: str,
+    url: str,
+    headers: dict,
+    request_id: str | None = None,
+    correlation_id: str | None = None,
+) -> Iterator[Span]:
+    """Trace a call to a supplier, propagating the trace and the request ids to it.
+
+    The NHSE-Request-ID and NHSE-Correlation-ID the request was made with are
+    forwarded, so a login can be followed into the supplier's own logs.
+
+    Args:
+        supplier (str): Supplier name
+        url (str): Url called
+        headers (dict): Request headers, the trace context and ids are added to them
+        request_id (str | None): NHSE-Request-ID of the request
+        correlation_id (str | None): NHSE-Correlation-ID of the request
+
+    Yields:
+        Span: Span for the call
+    """
+    with tracer.start_as_current_span(
+        f"{supplier} POST",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "supplier": supplier,
+            "http.request.method": "POST",
+            "url.full": url,
+        },
+    ) as span:
+        headers.update(correlation_headers(request_id, correlation_id))
+        propagate.inject(headers)
+        yield span
+
+
+def set_status_code(span: Span, status_code: int) -> None:
+    """Records the status a request was answered with on its span.
+
+    Server errors mark the span, and so its trace, as failed.
+
+    Args:
+        span (Span): Span for the request
+        status_code (int): Status of the response
+    """
+    span.set_attribute("http.response.status_code", int(status_code))
+    if status_code >= 500:
+        span.set_status(StatusCode.ERROR)
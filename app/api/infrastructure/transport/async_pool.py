@@ -0,0 +1,87 @@
+from http.cookiejar import DefaultCookiePolicy
+from os import environ
+from urllib.parse import urlencode
+
+from httpx import AsyncClient, Limits
+
+from app.api.infrastructure.transport.pool import POOL_IDLE_TIMEOUT, POOL_MAXSIZE
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+ASYNC_POOL_MAXSIZE = int(environ.get("SUPPLIER_ASYNC_POOL_MAXSIZE", "100"))
+
+_clients: dict[str, AsyncClient] = {}
+
+
+def _create_client() -> AsyncClient:
+    """Creates an async client with a keep-alive connection pool.
+
+    Returns:
+        AsyncClient: Client shared by all tasks on the event loop
+    """
+    client = AsyncClient(
+        limits=Limits(
+            max_connections=ASYNC_POOL_MAXSIZE,
+            max_keepalive_connections=POOL_MAXSIZE,
+            keepalive_expiry=POOL_IDLE_TIMEOUT,
+        ),
+    )
+    # Clients are shared between users, so supplier cookies must never be kept
+    client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return client
+
+
+def get_async_client(base_url: str) -> AsyncClient:
+    """Fetch the long-lived async client for a supplier base url.
+
+    Clients are bound to the running event loop, so this must only be called
+    from within it.
+
+    Args:
+        base_url (str): Supplier base url
+
+    Returns:
+        AsyncClient: Client with a keep-alive connection pool for the supplier
+    """
+    client = _clients.get(base_url)
+    if client is None:
+        client = _clients[base_url] = _create_client()
+    return client
+
+
+def async_pool_stats() -> dict:
+    """Statistics for each supplier async connection pool.
+
+    Returns:
+        dict: Pool statistics keyed by supplier base url
+    """
+    stats = {}
+    for base_url, client in list(_clients.items()):
+        connections = client._transport._pool.connections  # noqa: SLF001
+        stats[base_url] = {
+            "maxSize": ASYNC_POOL_MAXSIZE,
+            "maxKeepalive": POOL_MAXSIZE,
+            "idleTimeout": POOL_IDLE_TIMEOUT,
+            "connectionsOpen": len(connections),
+            "connectionsIdle": sum(connection.is_idle() for connection in connections),
+        }
+    return stats
+
+
+async def close_async_clients() -> None:
+    """Close every supplier async client and the connections they hold."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def form_encode(data: dict) -> str:
+    """Form encodes request data the same way requests does for the sync clients.
+
+    Args:
+        data (dict): Data dictionary
+
+    Returns:
+        str: Form encoded data
+    """
+    return urlencode(data, doseq=True)
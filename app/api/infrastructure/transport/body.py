@@ -0,0 +1,72 @@
+from collections.abc import Iterator
+
+from requests import RequestException, Response
+
+from app.api.domain.deadline import Deadline
+
+
+def iter_body(
+    response: Response, deadline: Deadline, chunk_size: int
+) -> Iterator[bytes]:
+    """Reads a streamed response body in chunks, within the request deadline.
+
+    The read timeout given to requests applies to each read of the socket, so a
+    supplier trickling bytes could otherwise hold the request past its deadline.
+    Before each read the socket timeout is cut to the time left, and the
+    deadline is checked again once the chunk has arrived.
+
+    Args:
+        response (Response): Response sent with `stream=True`
+        deadline (Deadline): Deadline of the request
+        chunk_size (int): Bytes to read at a time
+
+    Raises:
+        TimeoutError: If the deadline passes before the body has been read
+
+    Yields:
+        bytes: Chunks of the body
+    """
+    chunks = iter(response.iter_content(chunk_size))
+    while True:
+        _set_read_timeout(response, deadline.check())
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        except RequestException as exc:
+            if deadline.remaining() <= 0:
+                msg = "Request deadline exceeded reading the supplier response"
+                raise TimeoutError(msg) from exc
+            raise
+        deadline.check()
+        yield chunk
+
+
+def read_body(response: Response, deadline: Deadline, chunk_size: int) -> bytes:
+    """Reads a whole streamed response body within the request deadline.
+
+    Args:
+        response (Response): Response sent with `stream=True`
+        deadline (Deadline): Deadline of the request
+        chunk_size (int): Bytes to read at a time
+
+    Raises:
+        TimeoutError: If the deadline passes before the body has been read
+
+    Returns:
+        bytes: Body
+    """
+    return b"".join(iter_body(response, deadline, chunk_size))
+
+
+def _set_read_timeout(response: Response, timeout: float) -> None:
+    """Cuts the timeout of the socket the body is read from.
+
+    Args:
+        response (Response): Response being read
+        timeout (float): Seconds each read may wait for
+    """
+    connection = getattr(response.raw, "connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        sock.settimeout(timeout)
@@ -0,0 +1,75 @@
+from ipaddress import ip_address
+from os import environ, register_at_fork
+from socket import SOCK_STREAM, getaddrinfo
+from time import monotonic
+
+DNS_CACHE_TTL = float(environ.get("SUPPLIER_DNS_CACHE_TTL", "60"))
+
+_addresses: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def resolve(host: str, port: int) -> list[str]:
+    """Resolves a supplier host to its addresses, caching them for DNS_CACHE_TTL.
+
+    Args:
+        host (str): Supplier host name
+        port (int): Supplier port
+
+    Raises:
+        socket.gaierror: If the host cannot be resolved
+
+    Returns:
+        list[str]: IP addresses to try connecting to, in order
+    """
+    if _is_ip_address(host):
+        return [host]
+    cached = _addresses.get((host, port))
+    now = monotonic()
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    addresses = list(
+        dict.fromkeys(info[4][0] for info in getaddrinfo(host, port, type=SOCK_STREAM))
+    )
+    _addresses[(host, port)] = (now + DNS_CACHE_TTL, addresses)
+    return addresses
+
+
+def demote(host: str, port: int, address: str) -> None:
+    """Moves an address that could not be connected to behind the host's others.
+
+    Args:
+        host (str): Supplier host name
+        port (int): Supplier port
+        address (str): IP address that could not be connected to
+    """
+    cached = _addresses.get((host, port))
+    if cached is not None and address in cached[1]:
+        others = [other for other in cached[1] if other != address]
+        _addresses[(host, port)] = (cached[0], [*others, address])
+
+
+def forget(host: str, port: int) -> None:
+    """Removes a cached address so the next connection resolves the host again.
+
+    Args:
+        host (str): Supplier host name
+        port (int): Supplier port
+    """
+    _addresses.pop((host, port), None)
+
+
+def clear_dns_cache() -> None:
+    """Removes every cached address."""
+    _addresses.clear()
+
+
+# Addresses resolved before a fork may be stale by the time the child connects
+register_at_fork(after_in_child=_addresses.clear)
@@ -0,0 +1,80 @@
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Protocol
+
+import httpx
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from app.api.domain.exception import DownstreamUnavailableError
+
+
+class SupplierResponse(Protocol):
+    """Response attributes shared by requests and httpx responses."""
+
+    status_code: int
+    headers: Mapping[str, str]
+
+
+def is_connect_error(exc: BaseException) -> bool:
+    """Whether a supplier request failed before it reached the supplier.
+
+    Only these failures are safe to retry, as the supplier cannot have started a
+    session for the request.
+
+    Args:
+        exc (BaseException): Exception raised while sending the request
+
+    Returns:
+        bool: True if the connection to the supplier could not be established
+    """
+    if isinstance(
+        exc, httpx.ConnectError | httpx.ConnectTimeout | requests.ConnectTimeout
+    ):
+        return True
+    if isinstance(exc, requests.ConnectionError) and exc.args:
+        # requests wraps urllib3's MaxRetryError, whose reason is the cause
+        return isinstance(getattr(exc.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value (str | None): Retry-After header value
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or invalid
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+def raise_for_unavailable(response: SupplierResponse) -> None:
+    """Raises if the supplier is unavailable and has said when to retry.
+
+    Args:
+        response (SupplierResponse): Supplier response
+
+    Raises:
+        DownstreamUnavailableError: If the response is a 503 with Retry-After
+    """
+    if response.status_code != HTTPStatus.SERVICE_UNAVAILABLE:
+        return
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        msg = "Downstream service unavailable"
+        raise DownstreamUnavailableError(msg, retry_after=retry_after)
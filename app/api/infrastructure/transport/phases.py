@@ -0,0 +1,116 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from app.api.domain.stage_timings import StageTimings
+
+# httpcore trace events, without their connection/http11/http2 prefix, that
+# time each network phase of an asynchronous call
+TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "start_tls": "tls",
+    "receive_response_headers": "ttfb",
+    "receive_response_body": "download",
+}
+
+_current: ContextVar["NetworkPhases | None"] = ContextVar(
+    "network_phases", default=None
+)
+
+
+class NetworkPhases:
+    """Time spent in each network phase of a call to a supplier.
+
+    The phases are dns, connect, tls, ttfb, from the request being sent to the
+    response headers arriving, and download, reading the response body. A call
+    made on a reused connection has no dns, connect or tls phases.
+    """
+
+    def __init__(self) -> None:
+        """Initialises the phases of a call made on a reused connection."""
+        self.durations: dict[str, float] = {}
+        self.reused = True
+        self._headers_at: float | None = None
+        self._started_at: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Adds time spent in a phase.
+
+        Opening a connection marks the call as not reusing one.
+
+        Args:
+            phase (str): Name of the phase, such as "connect"
+            seconds (float): Seconds spent in the phase
+        """
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+        if phase in ("dns", "connect"):
+            self.reused = False
+
+    def headers_received(self) -> None:
+        """Marks the response headers as received, starting the download phase."""
+        self._headers_at = perf_counter()
+
+    async def trace(self, event_name: str, _info: dict) -> None:
+        """Receives the trace events of an asynchronous call.
+
+        Passed to httpx as the "trace" request extension. Name resolution is
+        part of httpcore's connect_tcp event, so it is timed as the connect phase.
+
+        Args:
+            event_name (str): Event name, such as "connection.connect_tcp.started"
+            _info (dict): Event details
+        """
+        name, event = event_name.rsplit(".", 2)[-2:]
+        phase = TRACE_PHASES.get(name)
+        if phase is None:
+            return
+        if event == "started":
+            self._started_at[phase] = perf_counter()
+        elif phase in self._started_at:
+            self.add(phase, perf_counter() - self._started_at.pop(phase))
+
+    def finish(self) -> None:
+        """Ends the download phase, if it was not timed by a trace event."""
+        if self._headers_at is not None and "download" not in self.durations:
+            self.add("download", perf_counter() - self._headers_at)
+
+    def to_dict(self) -> dict:
+        """Phase durations and whether the connection was reused.
+
+        Returns:
+            dict: Seconds spent in each phase and the connection reuse flag
+        """
+        return {"reused": self.reused, **self.durations}
+
+
+def current_phases() -> NetworkPhases | None:
+    """Phases of the call being made, for the connection to record its timings.
+
+    Returns:
+        NetworkPhases | None: Phases of the call, or None if it is not measured
+    """
+    return _current.get()
+
+
+@contextmanager
+def measure_phases(timings: StageTimings) -> Iterator[NetworkPhases]:
+    """Measures the network phases of a call to a supplier.
+
+    The phases are added to the request's timings when the call ends, whether
+    or not it succeeded, so every retried attempt is recorded.
+
+    Args:
+        timings (StageTimings): Timings of the request the call is made for
+
+    Yields:
+        NetworkPhases: Phases of the call
+    """
+    phases = NetworkPhases()
+    token = _current.set(phases)
+    try:
+        yield phases
+    finally:
+        _current.reset(token)
+        phases.finish()
+        timings.supplier_calls.append(phases.to_dict())
@@ -0,0 +1,287 @@
+import socket
+from http.cookiejar import DefaultCookiePolicy
+from os import environ, register_at_fork
+from threading import Lock
+from time import monotonic, perf_counter
+
+from requests import Request, Session
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError
+from urllib3.response import HTTPResponse
+
+from app.api.domain.deadline import SUPPLIER_CONNECT_TIMEOUT
+from app.api.infrastructure.transport.dns import demote, forget, resolve
+from app.api.infrastructure.transport.phases import current_phases
+
+POOL_MAXSIZE = int(environ.get("SUPPLIER_POOL_MAXSIZE", "10"))
+POOL_IDLE_TIMEOUT = float(environ.get("SUPPLIER_POOL_IDLE_TIMEOUT", "30"))
+PREWARM_CONNECTIONS = int(environ.get("SUPPLIER_PREWARM_CONNECTIONS", "2"))
+# Kept below the idle timeout, so warm connections are replaced before a login
+# arriving after a quiet period finds them all evicted
+PREWARM_INTERVAL = float(
+    environ.get("SUPPLIER_PREWARM_INTERVAL", str(POOL_IDLE_TIMEOUT / 2))
+)
+TCP_KEEPALIVE_IDLE = int(environ.get("SUPPLIER_TCP_KEEPALIVE_IDLE", "15"))
+TCP_KEEPALIVE_INTERVAL = int(environ.get("SUPPLIER_TCP_KEEPALIVE_INTERVAL", "5"))
+TCP_KEEPALIVE_COUNT = int(environ.get("SUPPLIER_TCP_KEEPALIVE_COUNT", "3"))
+
+_sessions: dict[str, Session] = {}
+_sessions_lock = Lock()
+
+
+def _keepalive_socket_options() -> list[tuple[int, int, int]]:
+    """Socket options that probe idle connections so they are not silently dropped.
+
+    Returns:
+        list[tuple[int, int, int]]: Socket options for supplier connections
+    """
+    options = [
+        *HTTPConnection.default_socket_options,
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    for name, value in (
+        ("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+        ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL),
+        ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT),
+    ):
+        # Not every platform lets the keep-alive timings be tuned per socket
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class CachedDNSMixin:
+    """Connects to the supplier addresses held in the DNS cache.
+
+    Each address the host resolved to is tried in turn, as urllib3 does when it
+    resolves the host itself, and one that cannot be connected to is moved
+    behind the others. Only the address connected to is replaced, the host name
+    is still used for the Host header, SNI and certificate verification. When no
+    address can be connected to the cached addresses are dropped, so the next
+    connection resolves the host again.
+    """
+
+    def _new_conn(self):  # noqa: ANN202
+        host = self._dns_host
+        started_at = perf_counter()
+        try:
+            addresses = resolve(host, self.port)
+        except socket.gaierror as exc:
+            raise NameResolutionError(host, self, exc) from exc
+        resolved_at = perf_counter()
+        try:
+            sock = self._connect_to_any(host, addresses)
+        finally:
+            self._dns_host = host
+        self.connected_at = perf_counter()
+        phases = current_phases()
+        if phases is not None:
+            phases.add("dns", resolved_at - started_at)
+            phases.add("connect", self.connected_at - resolved_at)
+        return sock
+
+    def _connect_to_any(self, host: str, addresses: list[str]) -> socket.socket:
+        # A refused or unreachable address raises NewConnectionError, which is a
+        # ConnectTimeoutError, as does an address that timed out
+        for address in addresses[:-1]:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (ConnectTimeoutError, OSError):
+                demote(host, self.port, address)
+        self._dns_host = addresses[-1]
+        try:
+            return super()._new_conn()
+        except (ConnectTimeoutError, OSError):
+            forget(host, self.port)
+            raise
+
+
+class PhaseTimingMixin:
+    """Records the time to first byte of a call whose network phases are measured.
+
+    The time to first byte runs from the request having been sent until the
+    response headers are received.
+    """
+
+    def getresponse(self) -> HTTPResponse:
+        """Waits for the response headers, timing the wait if the call is measured."""
+        phases = current_phases()
+        if phases is None:
+            return super().getresponse()
+        started_at = perf_counter()
+        response = super().getresponse()
+        phases.add("ttfb", perf_counter() - started_at)
+        phases.headers_received()
+        return response
+
+
+class SupplierHTTPConnection(PhaseTimingMixin, CachedDNSMixin, HTTPConnection):
+    """HTTP connection using the DNS cache."""
+
+
+class SupplierHTTPSConnection(PhaseTimingMixin, CachedDNSMixin, HTTPSConnection):
+    """HTTPS connection using the DNS cache, timing its TLS handshake."""
+
+    def connect(self) -> None:
+        """Connects to the supplier and completes the TLS handshake."""
+        super().connect()
+        phases = current_phases()
+        if phases is not None:
+            phases.add("tls", perf_counter() - self.connected_at)
+
+
+class IdleEvictionMixin:
+    """Closes pooled connections that have been idle for longer than the idle timeout.
+
+    Connections the supplier has already dropped are detected by urllib3 when they
+    are checked out of the pool, this additionally retires connections before the
+    supplier's own keep-alive timeout is likely to close them mid-request. TCP
+    keep-alive probes do not count as use, as they do not reset the supplier's
+    keep-alive timeout, so prewarmed connections are evicted like any other and
+    `prewarm` is called every PREWARM_INTERVAL to replace them.
+    """
+
+    idle_timeout = POOL_IDLE_TIMEOUT
+    idle_evictions = 0
+
+    def _get_conn(self, timeout: float | None = None):  # noqa: ANN202
+        conn = super()._get_conn(timeout)
+        last_used = getattr(conn, "last_used", None)
+        if last_used is not None and monotonic() - last_used > self.idle_timeout:
+            conn.close()
+            conn.last_used = None
+            self.idle_evictions += 1
+        return conn
+
+    def _put_conn(self, conn, *, used: bool = True) -> None:  # noqa: ANN001
+        if conn is not None and used:
+            conn.last_used = monotonic()
+        super()._put_conn(conn)
+
+
+class SupplierHTTPConnectionPool(IdleEvictionMixin, HTTPConnectionPool):
+    """HTTP connection pool with idle eviction."""
+
+    ConnectionCls = SupplierHTTPConnection
+
+
+class SupplierHTTPSConnectionPool(IdleEvictionMixin, HTTPSConnectionPool):
+    """HTTPS connection pool with idle eviction."""
+
+    ConnectionCls = SupplierHTTPSConnection
+
+
+class SupplierAdapter(HTTPAdapter):
+    """Transport adapter that uses the idle evicting connection pools."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        """Initialises the pool manager with the supplier connection pools."""
+        kwargs.setdefault("socket_options", _keepalive_socket_options())
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": SupplierHTTPConnectionPool,
+            "https": SupplierHTTPSConnectionPool,
+        }
+
+
+def _create_session() -> Session:
+    """Creates a session with a keep-alive connection pool.
+
+    Returns:
+        Session: Session shared by all threads in the worker
+    """
+    session = Session()
+    # Sessions are shared between users, so supplier cookies must never be kept
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = SupplierAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(base_url: str) -> Session:
+    """Fetch the long-lived session for a supplier base url.
+
+    Args:
+        base_url (str): Supplier base url
+
+    Returns:
+        Session: Session with a keep-alive connection pool for the supplier
+    """
+    session = _sessions.get(base_url)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(base_url)
+            if session is None:
+                session = _sessions[base_url] = _create_session()
+    return session
+
+
+def prewarm(base_url: str, connections: int = PREWARM_CONNECTIONS) -> int:
+    """Opens connections to a supplier ahead of the first requests.
+
+    The connections are opened through the same pool requests will use, so the
+    first requests skip DNS resolution, the TCP connect and the TLS handshake.
+    Connections already open are left as they are, and keep their idle time, so
+    calling this again only replaces connections evicted for being idle.
+
+    Args:
+        base_url (str): Supplier base url
+        connections (int): Number of connections to open
+
+    Returns:
+        int: Number of connections now open in the pool
+    """
+    session = get_session(base_url)
+    request = session.prepare_request(Request("POST", base_url))
+    settings = session.merge_environment_settings(request.url, {}, None, None, None)
+    pool = session.get_adapter(base_url).get_connection_with_tls_context(
+        request, settings["verify"], settings["proxies"], settings["cert"]
+    )
+    conns = []
+    try:
+        for _ in range(min(connections, POOL_MAXSIZE)):
+            conn = pool._get_conn()  # noqa: SLF001
+            conns.append((conn, not conn.is_connected))
+            if not conn.is_connected:
+                conn.timeout = SUPPLIER_CONNECT_TIMEOUT
+                conn.connect()
+    finally:
+        for conn, opened in conns:
+            pool._put_conn(conn, used=opened)  # noqa: SLF001
+    return len(conns)
+
+
+def pool_stats() -> dict:
+    """Statistics for each supplier connection pool.
+
+    Returns:
+        dict: Pool statistics keyed by supplier base url
+    """
+    stats = {}
+    for base_url, session in list(_sessions.items()):
+        poolmanager = session.get_adapter(base_url).poolmanager
+        pools = [poolmanager.pools[key] for key in poolmanager.pools.keys()]  # noqa: SIM118
+        stats[base_url] = {
+            "maxSize": POOL_MAXSIZE,
+            "idleTimeout": POOL_IDLE_TIMEOUT,
+            "connectionsOpened": sum(pool.num_connections for pool in pools),
+            "requests": sum(pool.num_requests for pool in pools),
+            "idleEvictions": sum(pool.idle_evictions for pool in pools),
+        }
+    return stats
+
+
+def close_sessions() -> None:
+    """Close every supplier session and the connections they hold."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# Connections opened before a fork must not be shared with the child process
+register_at_fork(after_in_child=_sessions.clear)
@@ -0,0 +1,85 @@
+import asyncio
+
+from requests import Request
+
+from app.api.infrastructure.transport.async_pool import (
+    async_pool_stats,
+    close_async_clients,
+    form_encode,
+    get_async_client,
+)
+
+
+def test_get_async_client_reuses_client_per_base_url() -> None:
+    """Test get_async_client returns one long-lived client per base url."""
+
+    async def run() -> None:
+        # Act
+        emis_client = get_async_client("https://emis.com")
+        tpp_client = get_async_client("https://tpp.com")
+
+        # Assert
+        assert get_async_client("https://emis.com") is emis_client
+        assert tpp_client is not emis_client
+        await close_async_clients()
+        assert emis_client.is_closed
+        assert get_async_client("https://emis.com") is not emis_client
+        await close_async_clients()
+
+    asyncio.run(run())
+
+
+def test_get_async_client_does_not_keep_cookies() -> None:
+    """Test the shared client never stores supplier cookies."""
+
+    async def run() -> None:
+        # Act
+        client = get_async_client("https://emis.com")
+
+        # Assert
+        assert client.cookies.jar._policy.is_not_allowed("emis.com")
+        await close_async_clients()
+
+    asyncio.run(run())
+
+
+def test_async_pool_stats() -> None:
+    """Test each supplier async pool reports its limits and connections."""
+
+    async def run() -> dict:
+        get_async_client("https://emis.com")
+        try:
+            return async_pool_stats()
+        finally:
+            await close_async_clients()
+
+    # Act
+    actual_result = asyncio.run(run())
+
+    # Assert
+    assert actual_result == {
+        "https://emis.com": {
+            "maxSize": 100,
+            "maxKeepalive": 10,
+            "idleTimeout": 30,
+            "connectionsOpen": 0,
+            "connectionsIdle": 0,
+        }
+    }
+
+
+def test_form_encode_matches_requests() -> None:
+    """Test form_encode encodes data the same way as the sync clients."""
+    # Arrange
+    data = {
+        "PatientIdentifier": {"IdentifierValue": "1", "IdentifierType": "NhsNumber"},
+        "PatientNationalPracticeCode": "A12345",
+    }
+
+    # Act
+    actual_result = form_encode(data)
+
+    # Assert
+    assert (
+        actual_result == Request("POST", "https://emis.com", data=data).prepare().body
+    )
@@ -0,0 +1,78 @@
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+
+from app.api.domain.deadline import Deadline
+from app.api.infrastructure.transport.body import iter_body, read_body
+
+FILE_PATH = "app.api.domain.deadline"
+
+
+def test_read_body() -> None:
+    """Test the body is read in chunks, cutting the socket timeout before each."""
+    # Arrange
+    response = MagicMock()
+    response.iter_content.return_value = [b"Happy ", b"Days!"]
+    sock = response.raw.connection.sock
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", side_effect=[100, 101, 102, 103, 104]):
+        actual_result = read_body(response, Deadline(expires_at=110), 4)
+
+    # Assert
+    assert actual_result == b"Happy Days!"
+    response.iter_content.assert_called_once_with(4)
+    assert [call.args[0] for call in sock.settimeout.call_args_list] == [10, 8, 6]
+
+
+def test_iter_body_trickling_supplier() -> None:
+    """Test a supplier trickling the body cannot hold the request past its deadline."""
+    # Arrange
+    response = MagicMock()
+    response.iter_content.return_value = iter([b"Happy ", b"Days!"])
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", side_effect=[100, 111]),
+        pytest.raises(TimeoutError, match="deadline exceeded"),
+    ):
+        list(iter_body(response, Deadline(expires_at=110), 4))
+
+
+def fail_reading(error: Exception) -> Iterator[bytes]:
+    raise error
+    yield b""
+
+
+def test_iter_body_read_timeout_at_deadline() -> None:
+    """Test a read timing out at the deadline is raised as a timeout."""
+    # Arrange
+    response = MagicMock()
+    response.iter_content.return_value = fail_reading(
+        RequestsConnectionError("Read timed out")
+    )
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", side_effect=[100, 110]),
+        pytest.raises(TimeoutError, match="deadline exceeded"),
+    ):
+        list(iter_body(response, Deadline(expires_at=110), 4))
+
+
+def test_iter_body_read_error() -> None:
+    """Test a read failing before the deadline is raised unchanged."""
+    # Arrange
+    response = MagicMock()
+    response.iter_content.return_value = fail_reading(
+        RequestsConnectionError("Connection reset")
+    )
+
+    # Act & Assert
+    with (
+        patch(f"{FILE_PATH}.monotonic", side_effect=[100, 101]),
+        pytest.raises(RequestsConnectionError, match="Connection reset"),
+    ):
+        list(iter_body(response, Deadline(expires_at=110), 4))
@@ -0,0 +1,97 @@
+from socket import AF_INET, SOCK_STREAM
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.api.infrastructure.transport.dns import (
+    DNS_CACHE_TTL,
+    clear_dns_cache,
+    demote,
+    forget,
+    resolve,
+)
+
+FILE_PATH = "app.api.infrastructure.transport.dns"
+
+ADDRESS_INFO = [
+    (AF_INET, SOCK_STREAM, 6, "", ("10.0.0.1", 443)),
+    (AF_INET, SOCK_STREAM, 6, "", ("10.0.0.2", 443)),
+    (AF_INET, SOCK_STREAM, 6, "", ("10.0.0.1", 443)),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    clear_dns_cache()
+    yield
+    clear_dns_cache()
+
+
+@patch(f"{FILE_PATH}.getaddrinfo", return_value=ADDRESS_INFO)
+def test_resolve_caches_address(mock_getaddrinfo: MagicMock) -> None:
+    """Test the resolved addresses are reused until the cache TTL passes."""
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        first_result = resolve("emis.com", 443)
+    with patch(f"{FILE_PATH}.monotonic", return_value=100 + DNS_CACHE_TTL - 1):
+        second_result = resolve("emis.com", 443)
+
+    # Assert
+    assert first_result == second_result == ["10.0.0.1", "10.0.0.2"]
+    mock_getaddrinfo.assert_called_once_with("emis.com", 443, type=SOCK_STREAM)
+
+
+@patch(f"{FILE_PATH}.getaddrinfo", return_value=ADDRESS_INFO)
+def test_resolve_expires_address(mock_getaddrinfo: MagicMock) -> None:
+    """Test the host is resolved again once the cache TTL has passed."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        resolve("emis.com", 443)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=100 + DNS_CACHE_TTL + 1):
+        resolve("emis.com", 443)
+
+    # Assert
+    assert mock_getaddrinfo.call_count == 2
+
+
+@patch(f"{FILE_PATH}.getaddrinfo", return_value=ADDRESS_INFO)
+def test_forget_address(mock_getaddrinfo: MagicMock) -> None:
+    """Test a forgotten address is resolved again."""
+    # Arrange
+    resolve("emis.com", 443)
+
+    # Act
+    forget("emis.com", 443)
+    resolve("emis.com", 443)
+
+    # Assert
+    assert mock_getaddrinfo.call_count == 2
+
+
+@patch(f"{FILE_PATH}.getaddrinfo", return_value=ADDRESS_INFO)
+def test_demote_address(mock_getaddrinfo: MagicMock) -> None:
+    """Test an address that could not be connected to is tried last."""
+    # Arrange
+    resolve("emis.com", 443)
+
+    # Act
+    demote("emis.com", 443, "10.0.0.1")
+    actual_result = resolve("emis.com", 443)
+
+    # Assert
+    assert actual_result == ["10.0.0.2", "10.0.0.1"]
+    mock_getaddrinfo.assert_called_once()
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "::1"])
+@patch(f"{FILE_PATH}.getaddrinfo")
+def test_resolve_ip_address(mock_getaddrinfo: MagicMock, host: str) -> None:
+    """Test IP addresses are used as they are."""
+    # Act
+    actual_result = resolve(host, 443)
+
+    # Assert
+    assert actual_result == [host]
+    mock_getaddrinfo.assert_not_called()
@@ -0,0 +1,100 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from app.api.domain.exception import DownstreamUnavailableError
+from app.api.infrastructure.transport.errors import (
+    is_connect_error,
+    parse_retry_after,
+    raise_for_unavailable,
+)
+
+FILE_PATH = "app.api.infrastructure.transport.errors"
+
+
+@pytest.mark.parametrize(
+    ("exception", "expected_result"),
+    [
+        (httpx.ConnectError("refused"), True),
+        (httpx.ConnectTimeout("timed out"), True),
+        (httpx.ReadTimeout("timed out"), False),
+        (httpx.RemoteProtocolError("reset"), False),
+        (requests.ConnectTimeout(), True),
+        (
+            requests.ConnectionError(
+                MaxRetryError(None, "/", NewConnectionError(None, "Connection refused"))
+            ),
+            True,
+        ),
+        (
+            requests.ConnectionError(
+                ProtocolError("Connection aborted.", ConnectionResetError())
+            ),
+            False,
+        ),
+        (requests.ReadTimeout(), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_connect_error(exception: Exception, *, expected_result: bool) -> None:
+    """Test only failures to connect to the supplier are connect errors."""
+    # Act
+    actual_result = is_connect_error(exception)
+
+    # Assert
+    assert actual_result is expected_result
+
+
+@pytest.mark.parametrize(
+    ("value", "expected_result"),
+    [
+        (None, None),
+        ("120", 120),
+        (" 3 ", 3),
+        ("Wed, 21 Oct 2015 07:28:05 GMT", 5),
+        ("Wed, 21 Oct 2015 07:27:00 GMT", 0),
+        ("soon", None),
+        ("-1", None),
+    ],
+)
+@patch(f"{FILE_PATH}.datetime")
+def test_parse_retry_after(
+    mock_datetime: MagicMock, value: str | None, expected_result: float | None
+) -> None:
+    """Test Retry-After is parsed from seconds or an HTTP date."""
+    # Arrange
+    mock_datetime.now.return_value = datetime(2015, 10, 21, 7, 28, tzinfo=UTC)
+
+    # Act
+    actual_result = parse_retry_after(value)
+
+    # Assert
+    assert actual_result == expected_result
+
+
+@pytest.mark.parametrize(
+    ("status_code", "headers", "expected_error"),
+    [
+        (503, {"Retry-After": "2"}, DownstreamUnavailableError),
+        (503, {}, None),
+        (500, {"Retry-After": "2"}, None),
+    ],
+)
+def test_raise_for_unavailable(
+    status_code: int, headers: dict, expected_error: type | None
+) -> None:
+    """Test only a 503 with Retry-After raises DownstreamUnavailableError."""
+    # Arrange
+    response = httpx.Response(status_code, headers=headers)
+
+    # Act & Assert
+    if expected_error is None:
+        raise_for_unavailable(response)
+    else:
+        with pytest.raises(expected_error) as exc_info:
+            raise_for_unavailable(response)
+        assert exc_info.value.retry_after == 2
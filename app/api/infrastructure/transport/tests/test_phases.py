@@ -0,0 +1,102 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.api.domain.stage_timings import StageTimings
+from app.api.infrastructure.transport.phases import (
+    NetworkPhases,
+    current_phases,
+    measure_phases,
+)
+
+FILE_PATH = "app.api.infrastructure.transport.phases"
+
+
+def test_network_phases_new_connection() -> None:
+    """Test a call opening a connection is not marked as reusing one."""
+    # Arrange
+    phases = NetworkPhases()
+
+    # Act
+    phases.add("dns", 0.001)
+    phases.add("connect", 0.01)
+    phases.add("ttfb", 0.2)
+
+    # Assert
+    assert phases.to_dict() == {
+        "reused": False,
+        "dns": 0.001,
+        "connect": 0.01,
+        "ttfb": 0.2,
+    }
+
+
+def test_network_phases_trace() -> None:
+    """Test the phases of an asynchronous call are timed from its trace events."""
+    # Arrange
+    phases = NetworkPhases()
+    events = [
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "connection.start_tls.started",
+        "connection.start_tls.complete",
+        "http11.send_request_headers.started",
+        "http11.send_request_headers.complete",
+        "http11.receive_response_headers.started",
+        "http11.receive_response_headers.complete",
+        "http11.receive_response_body.started",
+        "http11.receive_response_body.complete",
+    ]
+
+    async def trace() -> None:
+        for event in events:
+            await phases.trace(event, {})
+
+    # Act
+    with patch(f"{FILE_PATH}.perf_counter", side_effect=[0, 1, 1, 3, 3, 7, 7, 8]):
+        asyncio.run(trace())
+    phases.finish()
+
+    # Assert
+    assert phases.to_dict() == {
+        "reused": False,
+        "connect": 1,
+        "tls": 2,
+        "ttfb": 4,
+        "download": 1,
+    }
+
+
+def test_network_phases_finish_times_download() -> None:
+    """Test the download runs from the headers being received to the call ending."""
+    # Arrange
+    phases = NetworkPhases()
+
+    # Act
+    with patch(f"{FILE_PATH}.perf_counter", side_effect=[10, 10.5]):
+        phases.headers_received()
+        phases.finish()
+
+    # Assert
+    assert phases.to_dict() == {"reused": True, "download": 0.5}
+
+
+def test_measure_phases() -> None:
+    """Test the phases of a failed call are still added to the request's timings."""
+    # Arrange
+    timings = StageTimings()
+
+    def fail() -> None:
+        with measure_phases(timings) as phases:
+            assert current_phases() is phases
+            phases.add("connect", 0.01)
+            raise TimeoutError
+
+    # Act
+    with pytest.raises(TimeoutError):
+        fail()
+
+    # Assert
+    assert current_phases() is None
+    assert timings.supplier_calls == [{"reused": False, "connect": 0.01}]
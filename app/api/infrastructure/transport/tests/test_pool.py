@@ -0,0 +1,331 @@
+import socket
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest.mock import MagicMock, patch
+
+import pytest
+from urllib3.exceptions import NewConnectionError
+
+from app.api.domain.stage_timings import StageTimings
+from app.api.infrastructure.transport import pool
+from app.api.infrastructure.transport.phases import measure_phases
+from app.api.infrastructure.transport.pool import (
+    SupplierAdapter,
+    SupplierHTTPConnectionPool,
+    SupplierHTTPSConnection,
+    SupplierHTTPSConnectionPool,
+    close_sessions,
+    get_session,
+    pool_stats,
+    prewarm,
+)
+
+FILE_PATH = "app.api.infrastructure.transport.pool"
+
+
+class _SupplierHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(201)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions() -> None:
+    close_sessions()
+    yield
+    close_sessions()
+
+
+@pytest.fixture
+def supplier_url() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SupplierHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_session_reuses_session_per_base_url() -> None:
+    """Test get_session returns one long-lived session per base url."""
+    # Act
+    emis_session = get_session("https://emis.com")
+    tpp_session = get_session("https://tpp.com")
+
+    # Assert
+    assert get_session("https://emis.com") is emis_session
+    assert tpp_session is not emis_session
+
+
+def test_get_session_uses_supplier_adapter() -> None:
+    """Test the session mounts the idle evicting connection pools."""
+    # Act
+    session = get_session("https://emis.com")
+
+    # Assert
+    adapter = session.get_adapter("https://emis.com")
+    assert isinstance(adapter, SupplierAdapter)
+    assert adapter.poolmanager.pool_classes_by_scheme == {
+        "http": SupplierHTTPConnectionPool,
+        "https": SupplierHTTPSConnectionPool,
+    }
+
+
+def test_get_session_keeps_idle_connections_alive() -> None:
+    """Test supplier connections are opened with TCP keep-alive enabled."""
+    # Act
+    session = get_session("https://emis.com")
+
+    # Assert
+    poolmanager = session.get_adapter("https://emis.com").poolmanager
+    socket_options = poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in socket_options
+
+
+def test_get_session_does_not_keep_cookies() -> None:
+    """Test the shared session never stores supplier cookies."""
+    # Arrange
+    session = get_session("https://emis.com")
+
+    # Act
+    actual_result = session.cookies._policy.is_not_allowed("emis.com")
+
+    # Assert
+    assert actual_result
+
+
+def test_pool_evicts_idle_connection() -> None:
+    """Test a connection idle for longer than the idle timeout is closed on reuse."""
+    # Arrange
+    connection_pool = SupplierHTTPConnectionPool("emis.com", maxsize=1)
+    connection_pool.pool.get()  # Remove the empty placeholder slot
+    conn = MagicMock()
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        connection_pool._put_conn(conn)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=100 + pool.POOL_IDLE_TIMEOUT + 1):
+        actual_result = connection_pool._get_conn()
+
+    # Assert
+    assert actual_result is conn
+    conn.close.assert_called_once()
+    assert connection_pool.idle_evictions == 1
+
+
+def test_pool_keeps_recently_used_connection() -> None:
+    """Test a recently used connection is reused without being closed."""
+    # Arrange
+    connection_pool = SupplierHTTPConnectionPool("emis.com", maxsize=1)
+    connection_pool.pool.get()  # Remove the empty placeholder slot
+    conn = MagicMock()
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        connection_pool._put_conn(conn)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=101):
+        actual_result = connection_pool._get_conn()
+
+    # Assert
+    assert actual_result is conn
+    conn.close.assert_not_called()
+    assert connection_pool.idle_evictions == 0
+
+
+def test_pool_stats() -> None:
+    """Test pool_stats reports statistics for each supplier pool."""
+    # Arrange
+    session = get_session("https://emis.com")
+    poolmanager = session.get_adapter("https://emis.com").poolmanager
+    connection_pool = poolmanager.connection_from_url("https://emis.com")
+    connection_pool.num_connections = 2
+    connection_pool.num_requests = 5
+    connection_pool.idle_evictions = 1
+
+    # Act
+    actual_result = pool_stats()
+
+    # Assert
+    assert actual_result == {
+        "https://emis.com": {
+            "maxSize": pool.POOL_MAXSIZE,
+            "idleTimeout": pool.POOL_IDLE_TIMEOUT,
+            "connectionsOpened": 2,
+            "requests": 5,
+            "idleEvictions": 1,
+        }
+    }
+
+
+@patch(f"{FILE_PATH}.resolve", return_value=["10.0.0.1"])
+@patch("urllib3.connection.connection.create_connection")
+def test_connection_uses_cached_address(
+    mock_create_connection: MagicMock, mock_resolve: MagicMock
+) -> None:
+    """Test connections use the cached address but keep the supplier host name."""
+    # Arrange
+    conn = SupplierHTTPSConnection("emis.com", 443)
+
+    # Act
+    conn._new_conn()
+
+    # Assert
+    mock_resolve.assert_called_once_with("emis.com", 443)
+    assert mock_create_connection.call_args.args[0] == ("10.0.0.1", 443)
+    assert conn.host == "emis.com"
+
+
+@patch(f"{FILE_PATH}.demote")
+@patch(f"{FILE_PATH}.resolve", return_value=["10.0.0.1", "10.0.0.2"])
+@patch("urllib3.connection.connection.create_connection")
+def test_connection_fails_over_to_next_address(
+    mock_create_connection: MagicMock,
+    _mock_resolve: MagicMock,
+    mock_demote: MagicMock,
+) -> None:
+    """Test a refused address is tried last and the next address connected to."""
+    # Arrange
+    sock = MagicMock()
+    mock_create_connection.side_effect = [ConnectionRefusedError, sock]
+    conn = SupplierHTTPSConnection("emis.com", 443)
+
+    # Act
+    actual_result = conn._new_conn()
+
+    # Assert
+    assert actual_result is sock
+    assert [call.args[0] for call in mock_create_connection.call_args_list] == [
+        ("10.0.0.1", 443),
+        ("10.0.0.2", 443),
+    ]
+    mock_demote.assert_called_once_with("emis.com", 443, "10.0.0.1")
+    assert conn.host == "emis.com"
+
+
+@patch(f"{FILE_PATH}.forget")
+@patch(f"{FILE_PATH}.resolve", return_value=["10.0.0.1", "10.0.0.2"])
+@patch(
+    "urllib3.connection.connection.create_connection",
+    side_effect=ConnectionRefusedError,
+)
+def test_connection_forgets_addresses_on_failure(
+    mock_create_connection: MagicMock,
+    _mock_resolve: MagicMock,
+    mock_forget: MagicMock,
+) -> None:
+    """Test the cached addresses are dropped when none can be connected to."""
+    # Arrange
+    conn = SupplierHTTPSConnection("emis.com", 443)
+
+    # Act & Assert
+    with pytest.raises(NewConnectionError):
+        conn._new_conn()
+    assert mock_create_connection.call_count == 2
+    mock_forget.assert_called_once_with("emis.com", 443)
+    assert conn.host == "emis.com"
+
+
+@patch(f"{FILE_PATH}.SupplierHTTPSConnection.connect")
+def test_prewarm(mock_connect: MagicMock) -> None:
+    """Test prewarm opens connections in the pool used for supplier requests."""
+    # Act
+    actual_result = prewarm("https://emis.com", 2)
+
+    # Assert
+    assert actual_result == 2
+    assert mock_connect.call_count == 2
+    assert pool_stats()["https://emis.com"]["connectionsOpened"] == 2
+
+
+@patch(
+    f"{FILE_PATH}.SupplierHTTPSConnection.is_connected",
+    new=property(lambda conn: conn.sock is not None),
+)
+@patch.object(
+    SupplierHTTPSConnection,
+    "connect",
+    autospec=True,
+    side_effect=lambda conn: setattr(conn, "sock", MagicMock()),
+)
+def test_prewarm_replaces_idle_connections(mock_connect: MagicMock) -> None:
+    """Test prewarming again only replaces connections evicted for being idle."""
+    # Arrange
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        prewarm("https://emis.com", 2)
+    with patch(f"{FILE_PATH}.monotonic", return_value=101):
+        prewarm("https://emis.com", 2)
+    assert mock_connect.call_count == 2
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=100 + pool.POOL_IDLE_TIMEOUT + 1):
+        prewarm("https://emis.com", 2)
+
+    # Assert
+    assert mock_connect.call_count == 4
+    assert pool_stats()["https://emis.com"]["idleEvictions"] == 2
+
+
+def test_prewarm_keeps_idle_time_of_open_connections() -> None:
+    """Test prewarming does not count as using connections that are already open."""
+    # Arrange
+    connection_pool = SupplierHTTPConnectionPool("emis.com", maxsize=1)
+    connection_pool.pool.get()  # Remove the empty placeholder slot
+    conn = MagicMock(is_connected=True)
+    with patch(f"{FILE_PATH}.monotonic", return_value=100):
+        connection_pool._put_conn(conn)
+
+    # Act
+    with patch(f"{FILE_PATH}.monotonic", return_value=110):
+        connection_pool._put_conn(connection_pool._get_conn(), used=False)
+
+    # Assert
+    assert conn.last_used == 100
+
+
+def test_session_records_network_phases(supplier_url: str) -> None:
+    """Test the phases of each call are recorded, and whether it reused a connection."""
+    # Arrange
+    timings = StageTimings()
+    session = get_session(supplier_url)
+
+    # Act
+    for _ in range(2):
+        with measure_phases(timings):
+            session.post(supplier_url, data={"a": "b"}, timeout=5)
+
+    # Assert
+    first_call, second_call = timings.supplier_calls
+    assert first_call.keys() == {"reused", "dns", "connect", "ttfb", "download"}
+    assert first_call["reused"] is False
+    assert second_call.keys() == {"reused", "ttfb", "download"}
+    assert second_call["reused"] is True
+
+
+@patch(f"{FILE_PATH}.resolve", return_value=["10.0.0.1"])
+@patch("urllib3.connection.connection.create_connection")
+@patch("urllib3.connection.HTTPSConnection.connect")
+def test_https_connection_records_tls_handshake(
+    mock_connect: MagicMock,
+    _mock_create_connection: MagicMock,
+    _mock_resolve: MagicMock,
+) -> None:
+    """Test the TLS handshake is timed from the TCP connection being opened."""
+    # Arrange
+    timings = StageTimings()
+    conn = SupplierHTTPSConnection("emis.com", 443)
+    mock_connect.side_effect = conn._new_conn
+
+    # Act
+    with measure_phases(timings):
+        conn.connect()
+
+    # Assert
+    assert timings.supplier_calls[0].keys() == {"reused", "dns", "connect", "tls"}
@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 from flask.testing import FlaskClient
@@ -11,6 +11,7 @@ from app.api.domain.exception import (
     DownstreamError,
     InvalidValueError,
     MissingValueError,
+    ServiceUnavailableError,
 )
 
 FILE_PATH = "app.api.app"
@@ -21,12 +22,95 @@ def client() -> FlaskClient:
     return app.test_client()
 
 
+@pytest.mark.parametrize("path", ["/_status", "/_ping", "/health"])
+@patch(f"{FILE_PATH}.tracing_stats", return_value={"kept": 1})
+@patch(f"{FILE_PATH}.log_pipeline_stats", return_value={"dropped": 1})
+@patch(f"{FILE_PATH}.idempotency_stats", return_value={"coalesced": 3})
+@patch(f"{FILE_PATH}.negative_cache_stats", return_value={"hits": 2})
+@patch(f"{FILE_PATH}.session_cache_stats", return_value={"size": 1})
+@patch(f"{FILE_PATH}.jwks_stats", return_value={"refreshes": 1})
+@patch(f"{FILE_PATH}.jwt_cache_stats", return_value={"hits": 1})
+@patch(f"{FILE_PATH}.retry_stats", return_value={"https://emis.com": {}})
+@patch(f"{FILE_PATH}.bulkhead_stats", return_value={"https://emis.com": {}})
+@patch(f"{FILE_PATH}.routing_stats", return_value={"reloads": 1})
+@patch(f"{FILE_PATH}.circuit_breaker_stats", return_value={"https://emis.com": {}})
+@patch(f"{FILE_PATH}.pool_stats", return_value={"https://emis.com": {}})
+def test_health_success(
+    _mock_pool_stats: MagicMock,
+    _mock_circuit_breaker_stats: MagicMock,
+    _mock_routing_stats: MagicMock,
+    _mock_bulkhead_stats: MagicMock,
+    _mock_retry_stats: MagicMock,
+    _mock_jwt_cache_stats: MagicMock,
+    _mock_jwks_stats: MagicMock,
+    _mock_session_cache_stats: MagicMock,
+    _mock_negative_cache_stats: MagicMock,
+    _mock_idempotency_stats: MagicMock,
+    _mock_log_pipeline_stats: MagicMock,
+    _mock_tracing_stats: MagicMock,
+    path: str,
+    client: FlaskClient,
+) -> None:
+    """Test the health check endpoints."""
+    # Act
+    actual_result = client.get(path)
+
+    # Assert
+    assert actual_result.status_code == 200
+    assert actual_result.get_json() == {
+        "status": "online",
+        "message": "IM1 PFS Auth API is running",
+        "pools": {"https://emis.com": {}},
+        "routing": {"reloads": 1},
+        "circuitBreakers": {"https://emis.com": {}},
+        "bulkheads": {"https://emis.com": {}},
+        "retries": {"https://emis.com": {}},
+        "jwtCache": {"hits": 1},
+        "jwks": {"refreshes": 1},
+        "sessionCache": {"size": 1},
+        "negativeCache": {"hits": 2},
+        "idempotency": {"coalesced": 3},
+        "logs": {"dropped": 1},
+        "tracing": {"kept": 1},
+    }
+
+
+@patch(
+    f"{FILE_PATH}.render_metrics",
+    return_value=(b"# metrics", "text/plain; version=0.0.4; charset=utf-8"),
+)
+def test_metrics(_mock_render_metrics: MagicMock, client: FlaskClient) -> None:
+    """Test the metrics endpoint returns metrics in the Prometheus text format."""
+    # Act
+    actual_result = client.get("/metrics")
+
+    # Assert
+    assert actual_result.status_code == HTTPStatus.OK
+    assert actual_result.data == b"# metrics"
+    assert actual_result.headers["Content-Type"] == (
+        "text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
+@patch(
+    f"{FILE_PATH}.server_timing_headers",
+    return_value={"Server-Timing": "supplier;dur=200.0, total;dur=250.0"},
+)
+@patch(f"{FILE_PATH}.log_slow_request")
+@patch(f"{FILE_PATH}.record_request")
+@patch(f"{FILE_PATH}.StageTimings")
+@patch(f"{FILE_PATH}.Deadline")
 @patch(f"{FILE_PATH}.ForwardRequest")
 @patch(f"{FILE_PATH}.route_and_forward")
 def test_authenticate_post(
     mock_route_and_forward: MagicMock,
     mock_forward_request: MagicMock,
+    mock_deadline: MagicMock,
+    mock_stage_timings: MagicMock,
+    mock_record_request: MagicMock,
+    mock_log_slow_request: MagicMock,
+    mock_server_timing_headers: MagicMock,
     _mock_get_nhs_number_from_jwt_token: MagicMock,
     client: FlaskClient,
 ) -> None:
@@ -38,7 +122,7 @@ def test_authenticate_post(
     use_mock = True
     mocked_forward_request_response = {"body": "Hello World!"}
     mock_instance = MagicMock()
-    mock_instance.model_dump_json.return_value = mocked_forward_request_response
+    mock_instance.to_json.return_value = mocked_forward_request_response
     mock_route_and_forward.return_value = mock_instance
     # Act
     actual_result = client.post(
@@ -49,12 +133,22 @@ def test_authenticate_post(
             "NHSE-ODS-Code": ods_code,
             "NHSE-Use-Mock": use_mock,
             "NHSE-ID-Token": "some token",
+            "NHSE-Request-Timeout": "10",
+            "NHSE-Request-ID": "11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA",
         },
     )
 
     # Assert
     assert actual_result.status_code == 201
+    assert actual_result.headers["NHSE-Request-ID"] == (
+        "11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA"
+    )
+    assert "NHSE-Correlation-ID" not in actual_result.headers
+    assert actual_result.headers["Server-Timing"] == (
+        "supplier;dur=200.0, total;dur=250.0"
+    )
     assert actual_result.get_json() == mocked_forward_request_response
+    mock_deadline.from_header.assert_called_once_with("10")
     mock_forward_request.assert_called_once_with(
         application_id=application_id,
         forward_to=forward_url,
@@ -62,8 +156,19 @@ def test_authenticate_post(
         patient_ods_code=ods_code,
         proxy_nhs_number="proxy",
         use_mock=use_mock,
+        request_id="11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA",
+        correlation_id=None,
+        deadline=mock_deadline.from_header.return_value,
+        timings=mock_stage_timings.return_value,
     )
     mock_route_and_forward.assert_called_once_with(mock_forward_request.return_value)
+    mock_record_request.assert_called_once_with(
+        mock_stage_timings.return_value, HTTPStatus.CREATED
+    )
+    mock_log_slow_request.assert_called_once_with(
+        ANY, "POST /authenticate", mock_stage_timings.return_value, HTTPStatus.CREATED
+    )
+    mock_server_timing_headers.assert_called_once_with(mock_stage_timings.return_value)
 
 
 @pytest.mark.parametrize(
@@ -193,6 +298,43 @@ def test_authenticate_post_api_exception(
     mock_route_and_forward.assert_not_called()
 
 
+@patch("app.api.infrastructure.metrics.server_timing.SERVER_TIMING_ENABLED", new=True)
+@patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
+@patch(f"{FILE_PATH}.ForwardRequest")
+@patch(f"{FILE_PATH}.route_and_forward")
+def test_authenticate_post_service_unavailable(
+    mock_route_and_forward: MagicMock,
+    _mock_forward_request: MagicMock,
+    _mock_get_nhs_number_from_jwt_token: MagicMock,
+    client: FlaskClient,
+) -> None:
+    """Test the POST /authenticate endpoint returns Retry-After when unavailable.
+
+    The correlation id the request was made with is mirrored back, along with
+    the time taken to fail.
+    """
+    # Arrange
+    mock_route_and_forward.side_effect = ServiceUnavailableError(
+        "Testing", retry_after=12
+    )
+
+    # Act
+    actual_result = client.post(
+        "/authenticate",
+        headers={"NHSE-Correlation-ID": "11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA"},
+    )
+
+    # Assert
+    assert actual_result.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert actual_result.headers["Retry-After"] == "12"
+    assert actual_result.headers["NHSE-Correlation-ID"] == (
+        "11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA"
+    )
+    assert "total;dur=" in actual_result.headers["Server-Timing"]
+    assert actual_result.headers["Content-Type"] == "application/json"
+    assert actual_result.data == ServiceUnavailableError.content
+
+
 @patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
 @patch(f"{FILE_PATH}.ForwardRequest")
 @patch(f"{FILE_PATH}.route_and_forward")
@@ -0,0 +1,304 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient, Response
+
+from app.api.asgi import app
+from app.api.domain.exception import (
+    DownstreamError,
+    MissingValueError,
+    ServiceUnavailableError,
+)
+
+FILE_PATH = "app.api.asgi"
+
+
+def send_request(method: str, path: str, headers: dict | None = None) -> Response:
+    async def send() -> Response:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://testserver"
+        ) as client:
+            return await client.request(method, path, headers=headers)
+
+    return asyncio.run(send())
+
+
+@pytest.mark.parametrize("path", ["/_status", "/_ping", "/health"])
+@patch(f"{FILE_PATH}.tracing_stats", return_value={"kept": 1})
+@patch(f"{FILE_PATH}.log_pipeline_stats", return_value={"dropped": 1})
+@patch(f"{FILE_PATH}.idempotency_stats", return_value={"coalesced": 3})
+@patch(f"{FILE_PATH}.negative_cache_stats", return_value={"hits": 2})
+@patch(f"{FILE_PATH}.session_cache_stats", return_value={"size": 1})
+@patch(f"{FILE_PATH}.jwks_stats", return_value={"refreshes": 1})
+@patch(f"{FILE_PATH}.jwt_cache_stats", return_value={"hits": 1})
+@patch(f"{FILE_PATH}.retry_stats", return_value={"https://emis.com": {}})
+@patch(f"{FILE_PATH}.bulkhead_stats", return_value={"https://emis.com": {}})
+@patch(f"{FILE_PATH}.routing_stats", return_value={"reloads": 1})
+@patch(f"{FILE_PATH}.circuit_breaker_stats", return_value={"https://emis.com": {}})
+@patch(f"{FILE_PATH}.async_pool_stats", return_value={"https://emis.com": {}})
+def test_health_success(
+    _mock_async_pool_stats: MagicMock,
+    _mock_circuit_breaker_stats: MagicMock,
+    _mock_routing_stats: MagicMock,
+    _mock_bulkhead_stats: MagicMock,
+    _mock_retry_stats: MagicMock,
+    _mock_jwt_cache_stats: MagicMock,
+    _mock_jwks_stats: MagicMock,
+    _mock_session_cache_stats: MagicMock,
+    _mock_negative_cache_stats: MagicMock,
+    _mock_idempotency_stats: MagicMock,
+    _mock_log_pipeline_stats: MagicMock,
+    _mock_tracing_stats: MagicMock,
+    path: str,
+) -> None:
+    """Test the health check endpoints."""
+    # Act
+    actual_result = send_request("GET", path)
+
+    # Assert
+    assert actual_result.status_code == 200
+    assert actual_result.json() == {
+        "status": "online",
+        "message": "IM1 PFS Auth API is running",
+        "pools": {"https://emis.com": {}},
+        "routing": {"reloads": 1},
+        "circuitBreakers": {"https://emis.com": {}},
+        "bulkheads": {"https://emis.com": {}},
+        "retries": {"https://emis.com": {}},
+        "jwtCache": {"hits": 1},
+        "jwks": {"refreshes": 1},
+        "sessionCache": {"size": 1},
+        "negativeCache": {"hits": 2},
+        "idempotency": {"coalesced": 3},
+        "logs": {"dropped": 1},
+        "tracing": {"kept": 1},
+    }
+
+
+@patch(
+    f"{FILE_PATH}.render_metrics",
+    return_value=(b"# metrics", "text/plain; version=0.0.4; charset=utf-8"),
+)
+def test_metrics(_mock_render_metrics: MagicMock) -> None:
+    """Test the metrics endpoint returns metrics in the Prometheus text format."""
+    # Act
+    actual_result = send_request("GET", "/metrics")
+
+    # Assert
+    assert actual_result.status_code == HTTPStatus.OK
+    assert actual_result.content == b"# metrics"
+    assert actual_result.headers["content-type"] == (
+        "text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def test_unknown_path_not_found() -> None:
+    """Test an unknown path returns not found."""
+    # Act
+    actual_result = send_request("GET", "/unknown")
+
+    # Assert
+    assert actual_result.status_code == HTTPStatus.NOT_FOUND
+    assert actual_result.content == b""
+    assert actual_result.headers["content-type"] == "text/plain; charset=utf-8"
+
+
+@patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
+@patch(
+    f"{FILE_PATH}.server_timing_headers",
+    return_value={"Server-Timing": "supplier;dur=200.0, total;dur=250.0"},
+)
+@patch(f"{FILE_PATH}.log_slow_request")
+@patch(f"{FILE_PATH}.record_request")
+@patch(f"{FILE_PATH}.StageTimings")
+@patch(f"{FILE_PATH}.Deadline")
+@patch(f"{FILE_PATH}.ForwardRequest")
+@patch(f"{FILE_PATH}.route_and_forward_async", new_callable=AsyncMock)
+def test_authenticate_post(
+    mock_route_and_forward_async: AsyncMock,
+    mock_forward_request: MagicMock,
+    mock_deadline: MagicMock,
+    mock_stage_timings: MagicMock,
+    mock_record_request: MagicMock,
+    mock_log_slow_request: MagicMock,
+    mock_server_timing_headers: MagicMock,
+    mock_get_nhs_number_from_jwt_token: MagicMock,
+) -> None:
+    """Test the asynchronous POST /authenticate endpoint."""
+    # Arrange
+    mock_instance = MagicMock()
+    mock_instance.to_json.return_value = '{"body": "Hello World!"}'
+    mock_route_and_forward_async.return_value = mock_instance
+    # Act
+    actual_result = send_request(
+        "POST",
+        "/authenticate",
+        headers={
+            "NHSE-Application-ID": "some application id",
+            "NHSE-Forward-To": "some url",
+            "NHSE-ODS-Code": "some ods code",
+            "NHSE-Use-Mock": "True",
+            "NHSE-ID-Token": "some token",
+            "NHSE-Request-Timeout": "10",
+            "NHSE-Request-ID": "11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA",
+        },
+    )
+
+    # Assert
+    assert actual_result.status_code == 201
+    assert actual_result.headers["NHSE-Request-ID"] == (
+        "11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA"
+    )
+    assert "NHSE-Correlation-ID" not in actual_result.headers
+    assert actual_result.headers["Server-Timing"] == (
+        "supplier;dur=200.0, total;dur=250.0"
+    )
+    assert actual_result.json() == {"body": "Hello World!"}
+    mock_get_nhs_number_from_jwt_token.assert_called_once_with("some token")
+    mock_deadline.from_header.assert_called_once_with("10")
+    mock_forward_request.assert_called_once_with(
+        application_id="some application id",
+        forward_to="some url",
+        patient_nhs_number="patient",
+        patient_ods_code="some ods code",
+        proxy_nhs_number="proxy",
+        use_mock=True,
+        request_id="11C46F5F-CDEF-4865-94B2-0EE0EDCC26DA",
+        correlation_id=None,
+        deadline=mock_deadline.from_header.return_value,
+        timings=mock_stage_timings.return_value,
+    )
+    mock_route_and_forward_async.assert_awaited_once_with(
+        mock_forward_request.return_value
+    )
+    mock_record_request.assert_called_once_with(
+        mock_stage_timings.return_value, HTTPStatus.CREATED
+    )
+    mock_log_slow_request.assert_called_once_with(
+        ANY, "POST /authenticate", mock_stage_timings.return_value, HTTPStatus.CREATED
+    )
+    mock_server_timing_headers.assert_called_once_with(mock_stage_timings.return_value)
+
+
+@pytest.mark.parametrize(
+    ("exception", "expected_error"),
+    [
+        (MissingValueError("Testing"), MissingValueError),
+        (DownstreamError("Testing"), DownstreamError),
+    ],
+)
+@patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
+@patch(f"{FILE_PATH}.ForwardRequest")
+@patch(f"{FILE_PATH}.route_and_forward_async", new_callable=AsyncMock)
+def test_authenticate_post_api_exception(
+    mock_route_and_forward_async: AsyncMock,
+    _mock_forward_request: MagicMock,
+    _mock_get_nhs_number_from_jwt_token: MagicMock,
+    exception: Exception,
+    expected_error: type,
+) -> None:
+    """Test the asynchronous POST /authenticate endpoint with an api exception."""
+    # Arrange
+    mock_route_and_forward_async.side_effect = exception
+
+    # Act
+    actual_result = send_request("POST", "/authenticate")
+
+    # Assert
+    assert actual_result.status_code == expected_error.status_code
+    assert actual_result.content == expected_error.content
+
+
+@patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
+@patch(f"{FILE_PATH}.ForwardRequest")
+@patch(f"{FILE_PATH}.route_and_forward_async", new_callable=AsyncMock)
+def test_authenticate_post_exception(
+    mock_route_and_forward_async: AsyncMock,
+    _mock_forward_request: MagicMock,
+    _mock_get_nhs_number_from_jwt_token: MagicMock,
+) -> None:
+    """Test the asynchronous POST /authenticate endpoint with unknown exception."""
+    # Arrange
+    mock_route_and_forward_async.side_effect = Exception("Testing")
+
+    # Act
+    actual_result = send_request("POST", "/authenticate")
+
+    # Assert
+    assert actual_result.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert actual_result.json()["issue"][0]["details"]["coding"][0]["code"] == (
+        "SERVER_ERROR"
+    )
+
+
+@patch(f"{FILE_PATH}.get_nhs_number_from_jwt_token", return_value=("patient", "proxy"))
+@patch(f"{FILE_PATH}.ForwardRequest")
+@patch(f"{FILE_PATH}.route_and_forward_async", new_callable=AsyncMock)
+def test_authenticate_post_service_unavailable(
+    mock_route_and_forward_async: AsyncMock,
+    _mock_forward_request: MagicMock,
+    _mock_get_nhs_number_from_jwt_token: MagicMock,
+) -> None:
+    """Test the asynchronous POST /authenticate endpoint returns Retry-After."""
+    # Arrange
+    mock_route_and_forward_async.side_effect = ServiceUnavailableError(
+        "Testing", retry_after=12
+    )
+
+    # Act
+    actual_result = send_request("POST", "/authenticate")
+
+    # Assert
+    assert actual_result.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert actual_result.headers["Retry-After"] == "12"
+
+
+@patch(f"{FILE_PATH}.stop_tracing")
+@patch(f"{FILE_PATH}.start_tracing")
+@patch(f"{FILE_PATH}.stop_log_pipeline")
+@patch(f"{FILE_PATH}.start_log_pipeline")
+@patch(f"{FILE_PATH}.start_key_refresh")
+@patch(f"{FILE_PATH}.install_routing_reload_handler")
+@patch(f"{FILE_PATH}.close_async_clients", new_callable=AsyncMock)
+def test_lifespan_closes_async_clients(
+    mock_close_async_clients: AsyncMock,
+    mock_install_routing_reload_handler: MagicMock,
+    mock_start_key_refresh: MagicMock,
+    mock_start_log_pipeline: MagicMock,
+    mock_stop_log_pipeline: MagicMock,
+    mock_start_tracing: MagicMock,
+    mock_stop_tracing: MagicMock,
+) -> None:
+    """Test logging, tracing, routing reloads, signing keys and clients follow the server lifespan."""  # noqa: E501
+    # Arrange
+    events = iter(
+        [
+            {"type": "lifespan.startup"},
+            {"type": "lifespan.shutdown"},
+        ]
+    )
+    sent = []
+
+    async def receive() -> dict:
+        return next(events)
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    # Act
+    asyncio.run(app({"type": "lifespan"}, receive, send))
+
+    # Assert
+    assert sent == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+    mock_close_async_clients.assert_awaited_once()
+    mock_start_log_pipeline.assert_called_once_with()
+    mock_stop_log_pipeline.assert_called_once_with()
+    mock_start_tracing.assert_called_once_with()
+    mock_stop_tracing.assert_called_once_with()
+    mock_install_routing_reload_handler.assert_called_once_with()
+    mock_start_key_refresh.assert_called_once_with()
@@ -0,0 +1,78 @@
+from os import environ
+from pathlib import Path
+from threading import Thread
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gunicorn.arbiter import Arbiter
+    from gunicorn.workers.base import Worker
+
+# Set before any worker imports prometheus_client, so every worker writes its
+# metric samples to files that the /metrics endpoint of any worker aggregates
+environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/im1-pfs-auth-metrics")  # noqa: S108
+Path(environ["PROMETHEUS_MULTIPROC_DIR"]).mkdir(parents=True, exist_ok=True)
+
+
+def on_starting(_server: "Arbiter") -> None:
+    """Removes the metric samples left by a previous run of the server."""
+    from app.api.infrastructure.metrics.prometheus import (  # noqa: PLC0415
+        clear_multiprocess_dir,
+    )
+
+    clear_multiprocess_dir()
+
+
+def post_fork(_server: "Arbiter", _worker: "Worker") -> None:
+    """Starts logging, tracing, loading signing keys and prewarming in each worker.
+
+    Connections are opened on a background thread so an unreachable supplier does
+    not hold up the worker booting, and the thread keeps replacing those evicted
+    for being idle.
+    """
+    from app.api.application.forward_request import (  # noqa: PLC0415
+        keep_suppliers_warm,
+    )
+    from app.api.application.jwt import start_key_refresh  # noqa: PLC0415
+    from app.api.infrastructure.logs.pipeline import (  # noqa: PLC0415
+        start_log_pipeline,
+    )
+    from app.api.infrastructure.tracing.tracer import start_tracing  # noqa: PLC0415
+
+    start_log_pipeline()
+    start_tracing()
+    start_key_refresh()
+    Thread(target=keep_suppliers_warm, name="prewarm-suppliers", daemon=True).start()
+
+
+def post_worker_init(_worker: "Worker") -> None:
+    """Reloads the supplier routing table when the worker receives SIGHUP.
+
+    Installed once the worker has set up its own signal handlers, which reset
+    SIGHUP. Send SIGHUP to the workers rather than the master, as the master
+    restarts its workers on SIGHUP.
+    """
+    from app.api.application.forward_request import (  # noqa: PLC0415
+        install_routing_reload_handler,
+    )
+
+    install_routing_reload_handler()
+
+
+def worker_exit(_server: "Arbiter", _worker: "Worker") -> None:
+    """Flushes the traces kept and the logs queued before a worker exits."""
+    from app.api.infrastructure.logs.pipeline import (  # noqa: PLC0415
+        stop_log_pipeline,
+    )
+    from app.api.infrastructure.tracing.tracer import stop_tracing  # noqa: PLC0415
+
+    stop_tracing()
+    stop_log_pipeline()
+
+
+def child_exit(_server: "Arbiter", worker: "Worker") -> None:
+    """Removes the live metric samples of a worker that has exited."""
+    from app.api.infrastructure.metrics.prometheus import (  # noqa: PLC0415
+        mark_process_dead,
+    )
+
+    mark_process_dead(worker.pid)
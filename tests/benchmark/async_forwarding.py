@@ -0,0 +1,195 @@
+"""Compares the sync and async forwarding engines against a slow stand-in supplier.
+
+The sync engine is limited to a fixed number of worker threads, as it is when
+served by gunicorn, whereas the async engine waits on every supplier call
+concurrently from a single event loop, up to SUPPLIER_ASYNC_POOL_MAXSIZE
+connections per supplier.
+
+Usage:
+    uv run python -m tests.benchmark.async_forwarding --requests 500 --latency 0.2
+"""
+
+import asyncio
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Event, Thread
+from time import perf_counter
+from unittest.mock import MagicMock, patch
+
+from app.api.application import forward_request as forward_request_module
+from app.api.application.bulkhead import Bulkhead
+from app.api.application.circuit_breaker import CircuitBreaker
+from app.api.application.retry import RetryPolicy
+from app.api.application.routing import Route, RoutingTable
+from app.api.domain.forward_request_model import ForwardRequest
+from app.api.infrastructure.transport.async_pool import close_async_clients
+
+MOCKED_RESPONSE = (
+    Path(__file__).parents[2]
+    / "app"
+    / "api"
+    / "infrastructure"
+    / "emis"
+    / "data"
+    / "mocked_response.json"
+).read_bytes()
+
+
+async def handle_supplier_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float
+) -> None:
+    """Responds to keep-alive requests with the EMIS mock after a fixed latency."""
+    while headers := await reader.readuntil(b"\r\n\r\n"):
+        content_length = 0
+        for line in headers.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.lower() == b"content-length":
+                content_length = int(value)
+        await reader.readexactly(content_length)
+        await asyncio.sleep(latency)
+        writer.write(
+            b"HTTP/1.1 201 Created\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: "
+            + str(len(MOCKED_RESPONSE)).encode()
+            + b"\r\n\r\n"
+            + MOCKED_RESPONSE
+        )
+        await writer.drain()
+
+
+def start_supplier(latency: float) -> str:
+    """Starts the stand-in supplier on a background thread.
+
+    Returns:
+        str: Base url of the stand-in supplier
+    """
+    started = Event()
+    address = []
+
+    async def serve() -> None:
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            try:
+                await handle_supplier_connection(reader, writer, latency)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=4096)
+        address.append(server.sockets[0].getsockname()[1])
+        started.set()
+        await server.serve_forever()
+
+    Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    started.wait()
+    return f"http://127.0.0.1:{address[0]}"
+
+
+def build_request(supplier_url: str) -> ForwardRequest:
+    """Builds a forward request to the stand-in supplier.
+
+    Constructed without validation as the stand-in supplier is not served on https.
+    """
+    return ForwardRequest.model_construct(
+        application_id="benchmark",
+        forward_to=supplier_url,
+        patient_nhs_number="1234567890",
+        patient_ods_code="A12345",
+        proxy_nhs_number="0987654321",
+        use_mock=False,
+    )
+
+
+def run_sync(supplier_url: str, requests: int, workers: int) -> float:
+    """Forwards requests with the sync engine from a fixed pool of worker threads.
+
+    Returns:
+        float: Seconds taken to forward every request
+    """
+    forward_request = build_request(supplier_url)
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for response in executor.map(
+            lambda _: forward_request_module.route_and_forward(forward_request),
+            range(requests),
+        ):
+            response.to_json()
+    return perf_counter() - start
+
+
+def run_async(supplier_url: str, requests: int) -> float:
+    """Forwards every request concurrently with the async engine.
+
+    Returns:
+        float: Seconds taken to forward every request
+    """
+    forward_request = build_request(supplier_url)
+
+    async def forward() -> None:
+        response = await forward_request_module.route_and_forward_async(forward_request)
+        response.to_json()
+
+    async def run() -> float:
+        start = perf_counter()
+        await asyncio.gather(*(forward() for _ in range(requests)))
+        elapsed = perf_counter() - start
+        await close_async_clients()
+        return elapsed
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    """Runs the benchmark and prints the throughput of each engine."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    supplier_url = start_supplier(args.latency)
+    # The bulkhead is sized so neither engine is throttled by it
+    bulkhead = Bulkhead(
+        "benchmark",
+        max_concurrent=args.requests,
+        max_queue=0,
+        queue_timeout=0,
+    )
+    with (
+        patch.object(
+            forward_request_module,
+            "_routing_tables",
+            [
+                MagicMock(
+                    spec=RoutingTable, resolve=lambda _: Route("EMIS", supplier_url)
+                )
+            ],
+        ),
+        patch.dict(
+            forward_request_module.CIRCUIT_BREAKERS,
+            {supplier_url: CircuitBreaker(supplier_url)},
+        ),
+        patch.dict(forward_request_module.BULKHEADS, {supplier_url: bulkhead}),
+        patch.dict(
+            forward_request_module.RETRY_POLICIES,
+            {supplier_url: RetryPolicy(supplier_url)},
+        ),
+    ):
+        results = {
+            f"sync ({args.workers} worker threads)": run_sync(
+                supplier_url, args.requests, args.workers
+            ),
+            "async (1 event loop)": run_async(supplier_url, args.requests),
+        }
+
+    print(f"{args.requests} logins, supplier latency {args.latency}s")  # noqa: T201
+    for name, elapsed in results.items():
+        print(  # noqa: T201
+            f"{name:<28} {elapsed:7.2f}s {args.requests / elapsed:9.1f} logins/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
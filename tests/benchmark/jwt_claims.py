@@ -0,0 +1,81 @@
+"""Compares extracting the claims of a composite NHS login token with PyJWT.
+
+When signatures are not verified, the NHS numbers are read from the claims of
+the outer token and of the proxy token nested in its act.sub claim. PyJWT
+parses and validates the header of both tokens as well as their payloads,
+whereas extract_claims only decodes the payloads.
+
+Usage:
+    uv run python -m tests.benchmark.jwt_claims --iterations 100000
+"""
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from time import perf_counter
+
+from jwt import decode, encode
+
+from app.api.application.jwt_claims import extract_claims
+
+
+def composite_token() -> str:
+    """Builds an unsigned composite token like the ones NHS login issues."""
+    proxy_token = encode(
+        {
+            "identity_proofing_level": "P9",
+            "nhs_number": "9000000009",
+            "vot": "P9.Cp.Cd",
+            "exp": 1893456000,
+        },
+        key=None,
+        algorithm="none",
+    )
+    return encode(
+        {"nhs_number": "9000000017", "act": {"sub": proxy_token}, "exp": 1893456000},
+        key=None,
+        algorithm="none",
+    )
+
+
+def pyjwt_claims(token: str) -> tuple[dict, dict]:
+    """Decodes both tokens with PyJWT, as the unverified path used to."""
+    options = {"verify_signature": False}
+    claims = decode(token, options=options)
+    return claims, decode(claims["act"]["sub"], options=options)
+
+
+def payload_claims(token: str) -> tuple[dict, dict]:
+    """Decodes only the payloads of both tokens."""
+    claims = extract_claims(token)
+    return claims, extract_claims(claims["act"]["sub"])
+
+
+def time_per_call(
+    extract: Callable[[str], tuple], token: str, iterations: int
+) -> float:
+    """Times an extractor, returning the mean microseconds per token."""
+    start = perf_counter()
+    for _ in range(iterations):
+        extract(token)
+    return (perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time taken by each extractor."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    token = composite_token()
+    if pyjwt_claims(token) != payload_claims(token):
+        msg = "Extractors disagree on the claims of the token"
+        raise AssertionError(msg)
+
+    print(f"{args.iterations} composite tokens")  # noqa: T201
+    for name, extract in (("pyjwt", pyjwt_claims), ("payload", payload_claims)):
+        elapsed = time_per_call(extract, token, args.iterations)
+        print(f"{name:>8}: {elapsed:.2f}us per token")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()